@@ -0,0 +1,78 @@
+"""
+Time spent routing a /dom invocation to its command, before the command runs: the compiled registry against the
+routing it replaced (if/elif on the words, a new command object per call and inspect.signature(...).bind for arity).
+
+    uv run python -m benchmarks.command_routing [iterations]
+"""
+
+import sys
+from inspect import signature
+from timeit import timeit
+
+from loguru import logger
+
+from src.commands.registry import registry
+
+# invocations as typed, spread over groups, leaf commands, prefixes and arity errors
+INVOCATIONS = [
+    "game list",
+    "game add Season",
+    "game nickname Season The Big One",
+    "player Season Ermor @john",
+    "check Season",
+    "turn",
+    "help game",
+    "game status Season",
+]
+
+# the command classes behind each name, as the old factory held them
+NAMES = ["game add", "game nickname", "game list", "game status", "player", "player bulk", "check", "turn", "help"]
+CLASSES = {name: type(registry.get(name).command) for name in NAMES}
+
+
+def route_before(command: str) -> tuple[object, bool]:
+    command_list = command.split()
+    main_command = command_list[0].lower()
+    if main_command == "game" and len(command_list) == 1:
+        main_command, command_list = "help", ["help", "game"]
+    if main_command == "game":
+        name = f"game {command_list[1].lower()}"
+        args = command_list[2:]
+    elif main_command in {"player", "check", "turn", "help"}:
+        name = main_command
+        args = command_list[1:]
+        if name == "player" and any("=" in arg for arg in args):
+            name = "player bulk"
+    else:
+        return None, False
+    command_obj = CLASSES[name]()
+    try:
+        signature(command_obj.execute).bind(*args)
+    except TypeError:
+        return command_obj, False
+    return command_obj, True
+
+
+def route_after(command: str) -> tuple[object, bool]:
+    spec, args = registry.route(command.split())
+    if spec.name == "player" and any("=" in arg for arg in args):
+        spec = registry.get("player bulk")
+    return spec.command, spec.accepts(len(args))
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    for command in INVOCATIONS:
+        assert type(route_before(command)[0]) is type(route_after(command)[0]), command
+
+    logger.info(f"{len(INVOCATIONS)} invocations x {iterations:,}, microseconds per routed call")
+    per_call: dict[str, float] = {}
+    for label, route in (("before", route_before), ("after", route_after)):
+        seconds = timeit(lambda route=route: [route(command) for command in INVOCATIONS], number=iterations)
+        per_call[label] = seconds / (iterations * len(INVOCATIONS)) * 1e6
+        logger.info(f"{label:<8} {per_call[label]:8.2f} us")
+    logger.info(f"speedup  {per_call['before'] / per_call['after']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
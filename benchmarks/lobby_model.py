@@ -0,0 +1,118 @@
+"""
+Cost of the lobby representation on the hot path, for one game: building it from a scrape, copying it out of the
+scrape cache and rendering its nations block. Compares the pydantic models it replaced with the slotted dataclasses.
+
+    uv run python -m benchmarks.lobby_model [nations] [iterations]
+"""
+
+import sys
+import tracemalloc
+from collections.abc import Callable
+from timeit import timeit
+
+from loguru import logger
+from pydantic import BaseModel
+
+from src.controllers.formatting import get_emoji
+from src.models.app.lobby_details import LobbyDetails
+from src.models.app.player_status import PlayerStatus
+from src.models.db.fields import TURN_STATUSES
+
+
+class PydanticPlayerStatus(BaseModel):
+    name: str
+    turn_status: str
+    turn_emoji: str | None = None
+    nickname: str | None = None
+
+
+class PydanticLobbyDetails(BaseModel):
+    server_info: str
+    player_status: list[PydanticPlayerStatus]
+    turn: str
+    time_left: str | None = None
+    is_primary: bool = False
+
+
+def rows(nations: int) -> list[tuple[str, str]]:
+    # as the status page parser returns them: fresh strings on every scrape
+    return [(f"Nation {n}, Realm of {n}", str(TURN_STATUSES[n % 3])) for n in range(nations)]
+
+
+def build_before(scraped: list[tuple[str, str]]) -> PydanticLobbyDetails:
+    return PydanticLobbyDetails(
+        server_info="game, turn 12",
+        player_status=[PydanticPlayerStatus(name=name, turn_status=status) for name, status in scraped],
+        turn="12",
+    )
+
+
+def use_before(details: PydanticLobbyDetails) -> int:
+    copy = details.model_copy(deep=True)
+    # the renderer split every name on each card
+    lines = [f"{get_emoji(p.turn_status)} - *{p.name.split(',')[0].strip()}*" for p in copy.player_status]
+    return len(lines)
+
+
+def build_after(scraped: list[tuple[str, str]]) -> LobbyDetails:
+    return LobbyDetails(
+        server_info="game, turn 12",
+        player_status=[PlayerStatus(name=name, turn_status=status) for name, status in scraped],
+        turn="12",
+    )
+
+
+def use_after(details: LobbyDetails) -> int:
+    copy = details.copy()
+    lines = [f"{get_emoji(p.turn_status)} - *{p.short_name}*" for p in copy.player_status]
+    return len(lines)
+
+
+def retained[T](build: Callable[[list[tuple[str, str]]], T], scraped: list[tuple[str, str]]) -> tuple[int, int]:
+    """Allocations (blocks, bytes) still held by one built game, as the scrape cache would hold it."""
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+    details = build(scraped)
+    stats = tracemalloc.take_snapshot().compare_to(start, "filename")
+    tracemalloc.stop()
+    del details
+    return sum(stat.count_diff for stat in stats), sum(stat.size_diff for stat in stats)
+
+
+def peak[T](
+    build: Callable[[list[tuple[str, str]]], T], use: Callable[[T], int], scraped: list[tuple[str, str]]
+) -> int:
+    """Peak bytes allocated while building, copying and rendering one game."""
+    tracemalloc.start()
+    use(build(scraped))
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak_bytes
+
+
+def measure[T](
+    label: str, build: Callable[[list[tuple[str, str]]], T], use: Callable[[T], int], nations: int, iterations: int
+) -> float:
+    use(build(rows(nations)))  # warm up: pydantic compiles its validators on first use
+    seconds = timeit(lambda: use(build(rows(nations))), number=iterations)
+    per_game = seconds / iterations * 1e6
+    blocks, held = retained(build, rows(nations))
+    logger.info(
+        f"{label:<9} {per_game:8.1f} us/game   held {blocks:>5,} blocks {held:>8,} bytes   "
+        f"peak {peak(build, use, rows(nations)):>8,} bytes"
+    )
+    return per_game
+
+
+def main() -> None:
+    nations = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    logger.info(f"{nations} nations: build from a scrape, copy out of the cache, render, x {iterations:,}")
+    pydantic = measure("pydantic", build_before, use_before, nations, iterations)
+    slotted = measure("slotted", build_after, use_after, nations, iterations)
+    logger.info(f"speedup   {pydantic / slotted:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
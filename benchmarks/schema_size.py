@@ -0,0 +1,113 @@
+"""
+Row and index size of the game and player tables before and after the compact schema: binary ids and coded
+turn statuses (migration 4).
+
+    uv run python -m benchmarks.schema_size [games] [nations_per_game]
+
+Measured on sqlite through its dbstat table, which needs no server. On MySQL, seed the same way and compare
+DATA_LENGTH and INDEX_LENGTH in information_schema.TABLES after ANALYZE TABLE.
+"""
+
+import sqlite3
+import sys
+from asyncio import run
+from random import choice
+from uuid import uuid4
+
+from loguru import logger
+from tortoise import Tortoise
+from tortoise.utils import get_schema_sql
+
+from src.models.db.fields import TURN_STATUSES
+
+# the schema as of migration 3: ids as CHAR(36) text, statuses as the scraped strings
+BEFORE = """
+CREATE TABLE "game" (
+    "id" CHAR(36) NOT NULL PRIMARY KEY, "created_at" TIMESTAMP NOT NULL, "updated_at" TIMESTAMP NOT NULL,
+    "name" VARCHAR(255) NOT NULL, "primary_game" INT NOT NULL, "nickname" TEXT NOT NULL, "active" INT NOT NULL,
+    "turn" INT NOT NULL, "time_left" TEXT
+);
+CREATE INDEX "idx_game_name_created" ON "game" ("name", "created_at");
+CREATE INDEX "idx_game_active_primary" ON "game" ("active", "primary_game");
+CREATE TABLE "player" (
+    "id" CHAR(36) NOT NULL PRIMARY KEY, "created_at" TIMESTAMP NOT NULL, "updated_at" TIMESTAMP NOT NULL,
+    "nation" VARCHAR(128) NOT NULL, "short_name" VARCHAR(64) COLLATE NOCASE NOT NULL, "player_name" TEXT,
+    "turn_status" TEXT NOT NULL, "game_id" CHAR(36) NOT NULL REFERENCES "game" ("id") ON DELETE CASCADE
+);
+CREATE INDEX "idx_player_game_nation" ON "player" ("game_id", "nation");
+CREATE INDEX "idx_player_game_short_name" ON "player" ("game_id", "short_name");
+"""
+
+NOW = "2026-01-01 00:00:00.000000+00:00"
+
+
+async def current_schema() -> str:
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["src.models.db"]})
+    try:
+        return get_schema_sql(Tortoise.get_connection("default"), safe=False)
+    finally:
+        await Tortoise.close_connections()
+
+
+def seed(db: sqlite3.Connection, games: int, nations: int, *, compact: bool) -> None:
+    def key(value: str) -> str | bytes:
+        return uuid4().bytes if compact else value
+
+    statuses = TURN_STATUSES[1:]
+    for n in range(games):
+        game_id = key(str(uuid4()))
+        db.execute(
+            "INSERT INTO game (id, created_at, updated_at, name, primary_game, nickname, active, turn, time_left)"
+            " VALUES (?, ?, ?, ?, ?, '', ?, ?, ?)",
+            (game_id, NOW, NOW, f"game_{n:05}", n == 0, n % 5 == 0, n % 90, "1 day and 3 hours left"),
+        )
+        db.executemany(
+            "INSERT INTO player (id, created_at, updated_at, nation, short_name, player_name, turn_status, game_id)"
+            " VALUES (?, ?, ?, ?, ?, NULL, ?, ?)",
+            [
+                (
+                    key(str(uuid4())),
+                    NOW,
+                    NOW,
+                    f"Nation {nation}, The Long Era Name",
+                    f"Nation {nation}",
+                    statuses.index(status) + 1 if compact else status,
+                    game_id,
+                )
+                for nation in range(nations)
+                for status in [choice(statuses)]
+            ],
+        )
+    db.commit()
+
+
+def sizes(db: sqlite3.Connection) -> dict[str, int]:
+    return dict(db.execute("SELECT name, SUM(pgsize) FROM dbstat WHERE name != 'sqlite_schema' GROUP BY name"))
+
+
+def measure(schema: str, games: int, nations: int, *, compact: bool) -> dict[str, int]:
+    db = sqlite3.connect(":memory:")
+    db.executescript(schema)
+    seed(db, games, nations, compact=compact)
+    db.execute("VACUUM")
+    return sizes(db)
+
+
+def main() -> None:
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    nations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    before = measure(BEFORE, games, nations, compact=False)
+    after = measure(run(current_schema()), games, nations, compact=True)
+
+    logger.info(f"{games} games x {nations} nations, bytes on disk (sqlite dbstat)")
+    for name in sorted(before.keys() | after.keys()):
+        old, new = before.get(name, 0), after.get(name, 0)
+        change = f"{(new - old) / old:+.0%}" if old else "new"
+        logger.info(f"{name:<40} {old:>12,} {new:>12,}  {change}")
+    old, new = sum(before.values()), sum(after.values())
+    logger.info(f"{'total':<40} {old:>12,} {new:>12,}  {(new - old) / old:+.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,23 @@
 
 from os import environ
 
+import pytest
+
 environ.setdefault("SLACK_BOT_TOKEN", "xoxb-test")
 environ.setdefault("SLACK_APP_TOKEN", "xapp-test")
 environ.setdefault("DB_URI", "sqlite://:memory:")
+
+
+class FakeClock:
+    """A monotonic clock that only moves when a test sets or advances `now`."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
@@ -0,0 +1,26 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    # LONGTEXT can't be indexed without a prefix length; the lookup columns become bounded VARCHARs so the
+    # composite indexes below cover them. Values longer than the new limits make the MODIFY fail rather than
+    # silently truncate, so check max(char_length(...)) first on an old database.
+    return """
+        ALTER TABLE `game` MODIFY COLUMN `name` VARCHAR(255) NOT NULL;
+        ALTER TABLE `player` MODIFY COLUMN `nation` VARCHAR(128) NOT NULL;
+        ALTER TABLE `player` MODIFY COLUMN `short_name` VARCHAR(64) NOT NULL;
+        ALTER TABLE `game` ADD INDEX `idx_game_name_created` (`name`, `created_at`);
+        ALTER TABLE `game` ADD INDEX `idx_game_active_primary` (`active`, `primary_game`);
+        ALTER TABLE `player` ADD INDEX `idx_player_game_nation` (`game_id`, `nation`);
+        ALTER TABLE `player` ADD INDEX `idx_player_game_short_name` (`game_id`, `short_name`);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `player` DROP INDEX `idx_player_game_short_name`;
+        ALTER TABLE `player` DROP INDEX `idx_player_game_nation`;
+        ALTER TABLE `game` DROP INDEX `idx_game_active_primary`;
+        ALTER TABLE `game` DROP INDEX `idx_game_name_created`;
+        ALTER TABLE `player` MODIFY COLUMN `short_name` LONGTEXT NOT NULL;
+        ALTER TABLE `player` MODIFY COLUMN `nation` LONGTEXT NOT NULL;
+        ALTER TABLE `game` MODIFY COLUMN `name` LONGTEXT NOT NULL;"""
@@ -0,0 +1,56 @@
+from tortoise import BaseDBAsyncClient
+
+# keep in step with src/models/db/fields.py TURN_STATUSES: code = position, 0 for anything unrecognised
+_STATUS_TO_CODE = """CASE `turn_status`
+            WHEN 'Turn unfinished' THEN 1 WHEN 'Turn played' THEN 2 WHEN '-' THEN 3
+            WHEN 'Eliminated' THEN 4 WHEN 'AI' THEN 5 ELSE 0 END"""
+_CODE_TO_STATUS = """ELT(`turn_status` + 1, 'Unknown', 'Turn unfinished', 'Turn played', '-', 'Eliminated', 'AI')"""
+
+
+def _uuid_text(column: str) -> str:
+    return f"LOWER(INSERT(INSERT(INSERT(INSERT(HEX(`{column}`), 9, 0, '-'), 14, 0, '-'), 19, 0, '-'), 24, 0, '-'))"
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    # ids are copied into new BINARY(16) columns and swapped in, so existing rows keep their identity;
+    # the foreign key and the indexes holding game_id are rebuilt around the swap
+    return f"""
+        ALTER TABLE `player` DROP FOREIGN KEY `fk_player_game_e1f48209`;
+        ALTER TABLE `player` DROP INDEX `idx_player_game_nation`, DROP INDEX `idx_player_game_short_name`;
+        ALTER TABLE `game` ADD COLUMN `id_bin` BINARY(16);
+        UPDATE `game` SET `id_bin` = UNHEX(REPLACE(`id`, '-', ''));
+        ALTER TABLE `player` ADD COLUMN `id_bin` BINARY(16), ADD COLUMN `game_id_bin` BINARY(16),
+            ADD COLUMN `turn_status_code` TINYINT UNSIGNED NOT NULL DEFAULT 1;
+        UPDATE `player` SET `id_bin` = UNHEX(REPLACE(`id`, '-', '')),
+            `game_id_bin` = UNHEX(REPLACE(`game_id`, '-', '')),
+            `turn_status_code` = {_STATUS_TO_CODE};
+        ALTER TABLE `game` DROP PRIMARY KEY, DROP COLUMN `id`,
+            CHANGE `id_bin` `id` BINARY(16) NOT NULL FIRST, ADD PRIMARY KEY (`id`);
+        ALTER TABLE `player` DROP PRIMARY KEY, DROP COLUMN `id`, DROP COLUMN `game_id`, DROP COLUMN `turn_status`,
+            CHANGE `id_bin` `id` BINARY(16) NOT NULL FIRST, ADD PRIMARY KEY (`id`),
+            CHANGE `game_id_bin` `game_id` BINARY(16) NOT NULL,
+            CHANGE `turn_status_code` `turn_status` TINYINT UNSIGNED NOT NULL DEFAULT 1;
+        ALTER TABLE `player` ADD INDEX `idx_player_game_nation` (`game_id`, `nation`),
+            ADD INDEX `idx_player_game_short_name` (`game_id`, `short_name`),
+            ADD CONSTRAINT `fk_player_game_e1f48209` FOREIGN KEY (`game_id`) REFERENCES `game` (`id`) ON DELETE CASCADE;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return f"""
+        ALTER TABLE `player` DROP FOREIGN KEY `fk_player_game_e1f48209`;
+        ALTER TABLE `player` DROP INDEX `idx_player_game_nation`, DROP INDEX `idx_player_game_short_name`;
+        ALTER TABLE `game` ADD COLUMN `id_text` CHAR(36);
+        UPDATE `game` SET `id_text` = {_uuid_text("id")};
+        ALTER TABLE `player` ADD COLUMN `id_text` CHAR(36), ADD COLUMN `game_id_text` CHAR(36),
+            ADD COLUMN `turn_status_text` LONGTEXT;
+        UPDATE `player` SET `id_text` = {_uuid_text("id")}, `game_id_text` = {_uuid_text("game_id")},
+            `turn_status_text` = {_CODE_TO_STATUS};
+        ALTER TABLE `game` DROP PRIMARY KEY, DROP COLUMN `id`,
+            CHANGE `id_text` `id` CHAR(36) NOT NULL FIRST, ADD PRIMARY KEY (`id`);
+        ALTER TABLE `player` DROP PRIMARY KEY, DROP COLUMN `id`, DROP COLUMN `game_id`, DROP COLUMN `turn_status`,
+            CHANGE `id_text` `id` CHAR(36) NOT NULL FIRST, ADD PRIMARY KEY (`id`),
+            CHANGE `game_id_text` `game_id` CHAR(36) NOT NULL,
+            CHANGE `turn_status_text` `turn_status` LONGTEXT NOT NULL;
+        ALTER TABLE `player` ADD INDEX `idx_player_game_nation` (`game_id`, `nation`),
+            ADD INDEX `idx_player_game_short_name` (`game_id`, `short_name`),
+            ADD CONSTRAINT `fk_player_game_e1f48209` FOREIGN KEY (`game_id`) REFERENCES `game` (`id`) ON DELETE CASCADE;"""
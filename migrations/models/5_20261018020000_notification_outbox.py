@@ -0,0 +1,24 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS `notification` (
+    `id` BINARY(16) NOT NULL  PRIMARY KEY,
+    `created_at` DATETIME(6) NOT NULL  DEFAULT CURRENT_TIMESTAMP(6),
+    `updated_at` DATETIME(6) NOT NULL  DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    `turn` INT NOT NULL,
+    `channel` VARCHAR(80) NOT NULL,
+    `attempts` INT NOT NULL  DEFAULT 0,
+    `next_attempt_at` DATETIME(6) NOT NULL,
+    `sent_at` DATETIME(6),
+    `last_error` LONGTEXT,
+    `game_id` BINARY(16) NOT NULL,
+    CONSTRAINT `fk_notifica_game_8b1c5e0d` FOREIGN KEY (`game_id`) REFERENCES `game` (`id`) ON DELETE CASCADE,
+    KEY `idx_notification_pending` (`sent_at`, `next_attempt_at`)
+) CHARACTER SET utf8mb4;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS `notification`;"""
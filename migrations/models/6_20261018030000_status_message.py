@@ -0,0 +1,15 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `game` ADD `status_ts` VARCHAR(32);
+        ALTER TABLE `game` ADD `status_channel` VARCHAR(80);
+        ALTER TABLE `game` ADD `status_turn` INT;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `game` DROP COLUMN `status_turn`;
+        ALTER TABLE `game` DROP COLUMN `status_channel`;
+        ALTER TABLE `game` DROP COLUMN `status_ts`;"""
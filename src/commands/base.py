@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
 from typing import Any
 
+# Slack block kit blocks, as built by src.controllers.formatting; slack_sdk serializes them once, on the way out
+type Blocks = list[dict[str, Any]]
+
 
 class Command(ABC):
     @abstractmethod
-    async def execute(self, *args: Any, **kwargs: Any) -> str | list[Any]:  # noqa: ANN401
+    async def execute(self, *args: Any, **kwargs: Any) -> Blocks:  # noqa: ANN401
         pass
@@ -1,137 +1,257 @@
-from json import dumps
-from typing import TYPE_CHECKING
+from asyncio import Semaphore, gather
+from bisect import bisect_left
+from typing import Any, NamedTuple
 
 from tortoise.transactions import in_transaction
 
-from src.controllers.formatting import create_error_block, create_info_block, create_success_block
+from src.controllers.formatting import (
+    create_context_block,
+    create_error_block,
+    create_info_block,
+    create_success_block,
+)
 from src.controllers.lobby_details import fetch_lobby_details_from_web
+from src.controllers.read_model import cached_render, read_model
+from src.models.app.lobby_details import LobbyDetails
 from src.models.db import Game
 from src.models.db.players import Player
+from src.utils.constants import GAME_LIST_PAGE_SIZE, POLL_CONCURRENCY
 
-from .base import Command
-
-if TYPE_CHECKING:
-    from src.models.app.lobby_details import LobbyDetails
+from .base import Blocks, Command
 
 
 class AddGameCommand(Command):
-    async def execute(self, game_name: str) -> str:
+    async def execute(self, game_name: str, *more_games: str) -> Blocks:
+        if more_games:
+            return await self._add_many([game_name, *more_games])
+
         # match on name alone: remove is a soft delete, so an inactive row must be reused rather than duplicated
         existing_game: Game | None = await Game.filter(name=game_name).order_by("-created_at").first()
         if existing_game and existing_game.active:
-            return dumps(
-                create_error_block(f"Game '{game_name}' already exists", "Use `/dom game list` to see all games")
-            )
+            return create_error_block(f"Game '{game_name}' already exists", "Use `/dom game list` to see all games")
 
         game_details: LobbyDetails | None = await fetch_lobby_details_from_web(game_name=game_name)
         if game_details is None:
-            return dumps(
-                create_error_block(
-                    f"Failed to fetch game details for '{game_name}'",
-                    "Check that the game name is correct and exists on the Dominions server",
-                )
+            return create_error_block(
+                f"Failed to fetch game details for '{game_name}'",
+                "Check that the game name is correct and exists on the Dominions server",
             )
 
-        async with in_transaction():
-            if existing_game:
-                # reactivate and re-seed, so add/remove/add doesn't leave two rows with the same name
-                await Game.filter(id=existing_game.id).update(
-                    active=True, turn=game_details.turn, time_left=game_details.time_left
-                )
-                await Player.filter(game=existing_game).delete()
-                current_game = existing_game
+        await self._seed([(game_name, existing_game, game_details)])
+
+        return create_success_block(
+            "Game Added Successfully",
+            f"• Game: *{game_name}*\n"
+            f"• Players: {len(game_details.player_status)} nations tracked\n"
+            f"• Turn: {game_details.turn}\n"
+            "• Next update: within a minute",
+        )
+
+    async def _add_many(self, game_names: list[str]) -> Blocks:
+        """Add several games: one lookup, scrapes in parallel, one transaction. Returns a card with a line per game."""
+        game_names = list(dict.fromkeys(game_names))
+        # oldest first, so the newest row for each name is the one left in the dict
+        newest: dict[str, Game] = {}
+        for game in await Game.filter(name__in=game_names).order_by("created_at"):
+            newest[game.name] = game
+
+        lines: dict[str, str] = {}
+        to_scrape = []
+        for name in game_names:
+            if name in newest and newest[name].active:
+                lines[name] = f":information_source: *{name}*: already tracked"
             else:
-                current_game = await Game.create(
-                    name=game_name, turn=game_details.turn, time_left=game_details.time_left
-                )
-
-            for player in game_details.player_status:
-                await Player.create(
-                    nation=player.name.strip(),
-                    short_name=player.name.split(",")[0].strip(),
-                    turn_status=player.turn_status,
-                    game=current_game,  # Set the game reference directly
-                )
-
-        return dumps(
-            create_success_block(
-                "Game Added Successfully",
-                f"• Game: *{game_name}*\n"
-                f"• Players: {len(game_details.player_status)} nations tracked\n"
-                f"• Turn: {game_details.turn}\n"
-                f"• Next update: ~15 minutes",
-            )
+                to_scrape.append(name)
+
+        semaphore = Semaphore(POLL_CONCURRENCY)
+
+        async def scrape(name: str) -> LobbyDetails | None:
+            async with semaphore:
+                return await fetch_lobby_details_from_web(game_name=name)
+
+        scraped = await gather(*(scrape(name) for name in to_scrape))
+
+        to_seed = []
+        for name, details in zip(to_scrape, scraped, strict=True):
+            if details is None:
+                lines[name] = f":x: *{name}*: could not be fetched from the Dominions server"
+                continue
+            to_seed.append((name, newest.get(name), details))
+            lines[name] = f":white_check_mark: *{name}*: {len(details.player_status)} nations, turn {details.turn}"
+
+        await self._seed(to_seed)
+
+        added = len(to_seed)
+        blocks = (create_success_block if added else create_info_block)(
+            f"Added {added} of {len(game_names)} games", "\n".join(lines[name] for name in game_names)
         )
+        if added:
+            blocks += create_context_block("Next update: within a minute")
+        return blocks
+
+    @staticmethod
+    async def _seed(games: list[tuple[str, Game | None, LobbyDetails]]) -> None:
+        """Create or reactivate each game and write every roster, all in one transaction."""
+        if not games:
+            return
+
+        seeded: list[tuple[Game, LobbyDetails]] = []
+        new_games: list[Game] = []
+        async with in_transaction():
+            for name, existing_game, details in games:
+                if existing_game:
+                    # reactivate and re-seed, so add/remove/add doesn't leave two rows with the same name
+                    await Game.filter(id=existing_game.id).update(
+                        active=True, turn=details.turn, time_left=details.time_left
+                    )
+                    game = existing_game
+                else:
+                    game = Game(name=name, turn=details.turn, time_left=details.time_left)
+                    new_games.append(game)
+                seeded.append((game, details))
+
+            await Player.filter(game_id__in=[game.id for _, game, _ in games if game]).delete()
+            await Game.bulk_create(new_games)
+            # one INSERT for every roster rather than a round trip per nation
+            await Player.bulk_create(
+                [
+                    Player(
+                        nation=player.name.strip(),
+                        short_name=player.short_name,
+                        turn_status=player.turn_status,
+                        game_id=game.id,
+                    )
+                    for game, details in seeded
+                    for player in details.player_status
+                ]
+            )
+
+        for game, _ in seeded:
+            await read_model.refresh_game(game.id)
 
 
 class RemoveGameCommand(Command):
-    async def execute(self, game_name: str) -> str:
+    async def execute(self, game_name: str) -> Blocks:
         game = await Game.filter(name=game_name, active=True).first()
         if not game:
-            return dumps(
-                create_error_block(f"Game '{game_name}' not found", "Use `/dom game list` to see active games")
-            )
+            return create_error_block(f"Game '{game_name}' not found", "Use `/dom game list` to see active games")
 
         # by id, not name: names aren't unique, and primary must be cleared or /dom turn keeps serving it
         await Game.filter(id=game.id).update(active=False, primary_game=False)
-        return dumps(
-            create_success_block("Game Removed", f"*{game_name}* has been deactivated and will no longer be tracked")
-        )
+        read_model.remove_game(game.id)
+        return create_success_block("Game Removed", f"*{game_name}* has been deactivated and will no longer be tracked")
 
 
 class NicknameGameCommand(Command):
-    async def execute(self, game_name: str, nickname: str, *rest: str) -> str:
+    async def execute(self, game_name: str, nickname: str, *rest: str) -> Blocks:
         game = await Game.filter(name=game_name, active=True).first()
         if not game:
-            return dumps(
-                create_error_block(f"Game '{game_name}' not found", "Use `/dom game list` to see active games")
-            )
+            return create_error_block(f"Game '{game_name}' not found", "Use `/dom game list` to see active games")
 
         # accept multi-word nicknames — the command text is split on whitespace upstream
         joined = " ".join((nickname, *rest))
         await Game.filter(id=game.id).update(nickname=joined)
-        return dumps(create_success_block("Nickname Set", f"*{game_name}* will now display as *{joined}*"))
+        await read_model.refresh_game(game.id)
+        return create_success_block("Nickname Set", f"*{game_name}* will now display as *{joined}*")
 
 
-class ListGamesCommand(Command):
-    async def execute(self) -> str:
-        all_games: list[Game] = await Game.filter(active=True)
-        if not all_games:
-            return dumps(
-                create_info_block("No Active Games", "Use `/dom game add [game_name]` to start tracking a game")
-            )
+class GameRow(NamedTuple):
+    """What the game list shows of a game, and no more."""
 
-        blocks = [{"type": "header", "text": {"type": "plain_text", "text": "Active Games"}}, {"type": "divider"}]
+    name: str
+    nickname: str
+    turn: int
+    time_left: str | None
+    primary_game: bool
 
-        for game in all_games:
-            display_name = game.nickname or game.name
-            primary_badge = " :star:" if game.primary_game else ""
-            turn_info = f"Turn {game.turn}" if game.turn else "Turn: Unknown"
-            time_info = game.time_left or "Time remaining: Unknown"
 
-            game_text = f"*{display_name}*{primary_badge}\n• Game ID: `{game.name}`\n• {turn_info}\n• {time_info}"
+# the sorted rows as of a read model version: every page of one listing is cut from the same snapshot
+_snapshot: tuple[int, list[GameRow]] = (-1, [])
 
-            blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": game_text}})
 
-        blocks.append({"type": "divider"})
-        blocks.append(
-            {
-                "type": "context",
-                "elements": [{"type": "mrkdwn", "text": f"Total: {len(all_games)} game(s) | :star: = Primary game"}],
-            }
+async def _game_rows() -> list[GameRow]:
+    global _snapshot  # noqa: PLW0603
+    if not read_model.loaded:
+        rows = await Game.filter(active=True).values_list(*GameRow._fields)
+        return sorted((GameRow(*row) for row in rows), key=lambda game: game.name.casefold())
+    if _snapshot[0] != read_model.version:
+        games = sorted(read_model.active_games(), key=lambda game: game.name.casefold())
+        _snapshot = (
+            read_model.version,
+            [GameRow(game.name, game.nickname, game.turn, game.time_left, game.primary_game) for game in games],
         )
+    return _snapshot[1]
 
-        return dumps(blocks)
+
+def _game_field(game: GameRow) -> dict[str, str]:
+    primary_badge = " :star:" if game.primary_game else ""
+    turn_info = f"Turn {game.turn}" if game.turn else "Turn ?"
+    return {
+        "type": "mrkdwn",
+        "text": f"*{game.nickname or game.name}*{primary_badge}\n`{game.name}` · {turn_info}\n{game.time_left or '-'}",
+    }
+
+
+class ListGamesCommand(Command):
+    """
+    `/dom game list`, a page at a time. A page is a cursor (the name its first game sorts at) so it stays put when
+    games are added or removed ahead of it; games go ten to a section as fields, Slack's limit for one section.
+    """
+
+    async def execute(self) -> Blocks:
+        return await self.page("")
+
+    async def page(self, cursor: str) -> Blocks:
+        return await cached_render(("game list", cursor), lambda: self._render(cursor))
+
+    @staticmethod
+    async def _render(cursor: str) -> Blocks:
+        rows = await _game_rows()
+        if not rows:
+            return create_info_block("No Active Games", "Use `/dom game add [game_name]` to start tracking a game")
+
+        start = bisect_left(rows, cursor.casefold(), key=lambda game: game.name.casefold())
+        # a cursor past the end (its games were removed) shows the last page rather than nothing
+        start = min(start, (len(rows) - 1) // GAME_LIST_PAGE_SIZE * GAME_LIST_PAGE_SIZE)
+        page = rows[start : start + GAME_LIST_PAGE_SIZE]
+
+        blocks: Blocks = [{"type": "header", "text": {"type": "plain_text", "text": "Active Games"}}]
+        blocks += [
+            {"type": "section", "fields": [_game_field(game) for game in page[offset : offset + 10]]}
+            for offset in range(0, len(page), 10)
+        ]
+
+        buttons = []
+        if start > 0:
+            previous = rows[max(0, start - GAME_LIST_PAGE_SIZE)].name
+            buttons.append(_page_button("game_list_previous", ":arrow_backward: Previous", previous))
+        if start + GAME_LIST_PAGE_SIZE < len(rows):
+            buttons.append(
+                _page_button("game_list_next", "Next :arrow_forward:", rows[start + GAME_LIST_PAGE_SIZE].name)
+            )
+        if buttons:
+            blocks.append({"type": "actions", "elements": buttons})
+
+        shown = f"{start + 1}-{start + len(page)} of {len(rows)}" if len(rows) > len(page) else f"{len(rows)}"
+        blocks += create_context_block(f"Total: {shown} game(s) | :star: = Primary game")
+        return blocks
+
+
+def _page_button(action_id: str, text: str, cursor: str) -> dict[str, Any]:
+    return {
+        "type": "button",
+        "text": {"type": "plain_text", "text": text, "emoji": True},
+        "value": cursor,
+        "action_id": action_id,
+    }
 
 
 class SetPrimaryGameCommand(Command):
-    async def execute(self, game_name: str) -> str:
+    async def execute(self, game_name: str) -> Blocks:
         existing_game = await Game.filter(name=game_name, active=True).first()
         if not existing_game:
-            return dumps(
-                create_error_block(
-                    f"Game '{game_name}' not found or inactive", "Use `/dom game list` to see active games"
-                )
+            return create_error_block(
+                f"Game '{game_name}' not found or inactive", "Use `/dom game list` to see active games"
             )
 
         # Use transaction to ensure atomic update
@@ -140,32 +260,33 @@ class SetPrimaryGameCommand(Command):
             await Game.all().update(primary_game=False)
             # Set this game as primary
             await Game.filter(id=existing_game.id).update(primary_game=True)
+        read_model.set_primary(existing_game.id)
 
-        return dumps(
-            create_success_block(
-                "Primary Game Set", f"*{game_name}* is now the primary game\n• Use `/dom turn` to see status quickly"
-            )
+        return create_success_block(
+            "Primary Game Set", f"*{game_name}* is now the primary game\n• Use `/dom turn` to see status quickly"
         )
 
 
 class SetGameStatusCommand(Command):
-    async def execute(self, game_name: str, status: str) -> str:
+    async def execute(self, game_name: str, status: str) -> Blocks:
         status = status.lower()
         if status not in ["active", "inactive"]:
-            return dumps(
-                create_error_block(
-                    "Invalid status value",
-                    "Status must be either `active` or `inactive`\n"
-                    "• Usage: `/dom game status [game_name] [active|inactive]`",
-                )
+            return create_error_block(
+                "Invalid status value",
+                "Status must be either `active` or `inactive`\n"
+                "• Usage: `/dom game status [game_name] [active|inactive]`",
             )
 
         game = await Game.filter(name=game_name).order_by("-created_at").first()
         if not game:
-            return dumps(create_error_block(f"Game '{game_name}' not found", "Use `/dom game list` to see all games"))
+            return create_error_block(f"Game '{game_name}' not found", "Use `/dom game list` to see all games")
 
         game.active = status == "active"
+        if not game.active:
+            # as with remove: an inactive game must not stay primary
+            game.primary_game = False
         await game.save()
+        await read_model.refresh_game(game.id)
 
         status_emoji = ":white_check_mark:" if status == "active" else ":no_entry_sign:"
-        return dumps(create_success_block("Game Status Updated", f"{status_emoji} *{game_name}* is now *{status}*"))
+        return create_success_block("Game Status Updated", f"{status_emoji} *{game_name}* is now *{status}*")
@@ -1,13 +1,15 @@
-from json import loads
-from unittest.mock import AsyncMock, patch
+from typing import Any
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from tortoise import Tortoise
 
-from src.commands.game_commands import AddGameCommand, RemoveGameCommand, SetPrimaryGameCommand
+from src.commands.game_commands import AddGameCommand, ListGamesCommand, RemoveGameCommand, SetPrimaryGameCommand
+from src.controllers.read_model import read_model
 from src.models.app.lobby_details import LobbyDetails
 from src.models.app.player_status import PlayerStatus
 from src.models.db import Game, Player
+from src.utils.constants import GAME_LIST_PAGE_SIZE
 
 
 @pytest.fixture
@@ -53,7 +55,7 @@ async def test_adding_an_already_active_game_is_rejected() -> None:
         await AddGameCommand().execute("MyGame")
         result = await AddGameCommand().execute("MyGame")
 
-    assert "already exists" in str(loads(result))
+    assert "already exists" in str(result)
     assert await Game.filter(name="MyGame").count() == 1
 
 
@@ -62,7 +64,7 @@ async def test_failed_scrape_creates_nothing() -> None:
     with _patch_fetch(None):
         result = await AddGameCommand().execute("Ghost")
 
-    assert "Failed to fetch" in str(loads(result))
+    assert "Failed to fetch" in str(result)
     assert await Game.filter(name="Ghost").count() == 0
 
 
@@ -90,3 +92,100 @@ async def test_set_primary_leaves_exactly_one_primary() -> None:
 
     assert await Game.filter(primary_game=True).count() == 1
     assert (await Game.get(name="GameB")).primary_game is True
+
+
+@pytest.mark.usefixtures("_db")
+async def test_roster_is_seeded_with_one_bulk_insert_on_add_and_reactivation() -> None:
+    nations = [f"Nation {n}, Some Era" for n in range(30)]
+    real_bulk_create = Player.bulk_create
+
+    async def bulk_create_and_wait(objects: list[Player]) -> None:
+        await real_bulk_create(objects)
+
+    bulk_create = AsyncMock(side_effect=bulk_create_and_wait)
+    with (
+        _patch_fetch(_details(*nations)),
+        patch.object(Player, "bulk_create", new=bulk_create),
+        patch.object(Player, "create", side_effect=AssertionError("one INSERT per nation")),
+    ):
+        await AddGameCommand().execute("BigGame")
+        await RemoveGameCommand().execute("BigGame")
+        await AddGameCommand().execute("BigGame")
+
+    assert bulk_create.await_count == 2
+    game = await Game.get(name="BigGame")
+    assert sorted(await Player.filter(game=game).values_list("short_name", flat=True)) == sorted(
+        f"Nation {n}" for n in range(30)
+    )
+
+
+@pytest.mark.usefixtures("_db")
+async def test_batch_add_reports_each_game() -> None:
+    with _patch_fetch(_details("Ermor, Ashen Empire")):
+        await AddGameCommand().execute("Tracked")
+        await AddGameCommand().execute("Removed")
+    await RemoveGameCommand().execute("Removed")
+
+    async def fake_fetch(game_name: str) -> LobbyDetails | None:
+        return None if game_name == "Missing" else _details("Ulm, Forges of Steel", "Pangaea, Age of Revelry")
+
+    with patch(
+        "src.commands.game_commands.fetch_lobby_details_from_web", new=AsyncMock(side_effect=fake_fetch)
+    ) as fetch:
+        result = str(await AddGameCommand().execute("New", "Tracked", "Missing", "Removed", "New"))
+
+    assert {call.kwargs["game_name"] for call in fetch.await_args_list} == {"New", "Missing", "Removed"}
+    assert "Added 2 of 4 games" in result
+    assert "*Tracked*: already tracked" in result
+    assert "*Missing*: could not be fetched" in result
+    assert "*New*: 2 nations" in result
+    assert "*Removed*: 2 nations" in result
+
+    assert await Game.filter(name="Removed").count() == 1, "reactivated, not duplicated"
+    for name in ("New", "Removed"):
+        game = await Game.get(name=name, active=True)
+        assert await Player.filter(game=game).count() == 2
+
+
+def _listed(blocks: list[dict[str, Any]]) -> list[str]:
+    return [field["text"] for block in blocks if block["type"] == "section" for field in block["fields"]]
+
+
+def _buttons(blocks: list[dict[str, Any]]) -> dict[str, str]:
+    actions = [block for block in blocks if block["type"] == "actions"]
+    return {button["action_id"]: button["value"] for block in actions for button in block["elements"]}
+
+
+@pytest.mark.usefixtures("_db")
+async def test_game_list_pages_through_every_game() -> None:
+    total = GAME_LIST_PAGE_SIZE * 2 + 5
+    for number in range(total):
+        await Game.create(name=f"game{number:03}", turn=number)
+
+    blocks = await ListGamesCommand().execute()
+    pages = [blocks]
+    while "game_list_next" in _buttons(blocks):
+        blocks = await ListGamesCommand().page(_buttons(blocks)["game_list_next"])
+        pages.append(blocks)
+
+    assert [len(_listed(page)) for page in pages] == [GAME_LIST_PAGE_SIZE, GAME_LIST_PAGE_SIZE, 5]
+    assert all(len(page) < 50 for page in pages), "Slack rejects a message with more than 50 blocks"
+    listed = [text for page in pages for text in _listed(page)]
+    assert len(set(listed)) == total
+    assert "game_list_previous" not in _buttons(pages[0])
+    assert _buttons(pages[2])["game_list_previous"] == f"game{GAME_LIST_PAGE_SIZE:03}"
+    assert f"{GAME_LIST_PAGE_SIZE * 2 + 1}-{total} of {total}" in str(pages[2])
+
+
+@pytest.mark.usefixtures("_db")
+async def test_game_list_pages_come_from_the_read_model_snapshot() -> None:
+    for name in ("beta", "Alpha", "gamma"):
+        await Game.create(name=name, nickname="The Big One" if name == "beta" else "")
+    await read_model.load()
+    try:
+        with patch.object(Game, "filter", new=Mock(side_effect=AssertionError("queried"))):
+            listed = _listed(await ListGamesCommand().execute())
+    finally:
+        read_model.clear()
+
+    assert [text.split("*")[1] for text in listed] == ["Alpha", "The Big One", "gamma"]
@@ -1,12 +1,15 @@
-from json import dumps
-
-from .base import Command
+from .base import Blocks, Command
 
 
 class HelpCommand(Command):
-    async def execute(self, command: str = "") -> str:
+    async def execute(self, command: str = "") -> Blocks:
         command = command.lower()
+        if (page := HELP_PAGES.get(command)) is not None:
+            return list(page)
+        return self.render(command)
 
+    @staticmethod
+    def render(command: str) -> Blocks:
         if command == "game":
             blocks = [
                 {"type": "header", "text": {"type": "plain_text", "text": "Game Commands Help"}},
@@ -23,7 +26,7 @@ class HelpCommand(Command):
                     "text": {
                         "type": "mrkdwn",
                         "text": "*Subcommands:*\n"
-                        "• `add [game_name]` - Add a new game to track\n"
+                        "• `add [game_name] ...` - Add a new game to track, or several at once\n"
                         "• `remove [game_name]` - Remove a game from tracking\n"
                         "• `nickname [game_name] [nickname]` - Set a nickname for a game\n"
                         "• `list` - List all active games\n"
@@ -32,7 +35,7 @@ class HelpCommand(Command):
                     },
                 },
             ]
-            return dumps(blocks)
+            return blocks
 
         if command == "player":
             blocks = [
@@ -50,11 +53,13 @@ class HelpCommand(Command):
                     "text": {
                         "type": "mrkdwn",
                         "text": "Associate a player name with a nation in a specific game.\n\n"
-                        "*Example:*\n`/dom player MyGame Ermor @john`",
+                        "*Example:*\n`/dom player MyGame Ermor @john`\n\n"
+                        "Assign a whole roster at once with `nation=player` pairs, by short or full nation name:\n"
+                        "`/dom player MyGame Ermor=@john T'ien Ch'i, Spring and Autumn=@jane Ulm=@bob`",
                     },
                 },
             ]
-            return dumps(blocks)
+            return blocks
 
         if command in ["check", "turn"]:
             cmd_info = {
@@ -68,7 +73,7 @@ class HelpCommand(Command):
                     "title": "Turn Command Help",
                     "usage": "`/dom turn`",
                     "description": "Display the current turn status for the primary game.\n\n"
-                    "This command uses the database cache, which updates every 15 minutes.",
+                    "This command uses the database cache, which is polled more often as the turn deadline nears.",
                 },
             }
             info = cmd_info[command]
@@ -78,7 +83,7 @@ class HelpCommand(Command):
                 {"type": "section", "text": {"type": "mrkdwn", "text": f"*Usage:* {info['usage']}"}},
                 {"type": "section", "text": {"type": "mrkdwn", "text": info["description"]}},
             ]
-            return dumps(blocks)
+            return blocks
 
         if not command:
             blocks = [
@@ -106,7 +111,7 @@ class HelpCommand(Command):
                         "type": "mrkdwn",
                         "text": "*Game Management*\n"
                         "`/dom game list` - List tracked games\n"
-                        "`/dom game add [game]` - Start tracking a game\n"
+                        "`/dom game add [game] ...` - Start tracking one or more games\n"
                         "`/dom game remove [game]` - Stop tracking a game\n"
                         "`/dom game primary [game]` - Set the game `/dom turn` reports on\n"
                         "`/dom game nickname [game] [nickname]` - Set a display name\n"
@@ -133,7 +138,7 @@ class HelpCommand(Command):
                     ],
                 },
             ]
-            return dumps(blocks)
+            return blocks
 
         # Unknown command
         blocks = [
@@ -145,4 +150,8 @@ class HelpCommand(Command):
                 },
             }
         ]
-        return dumps(blocks)
+        return blocks
+
+
+# help never changes while the process runs, so every page is built once, at import
+HELP_PAGES = {topic: HelpCommand.render(topic) for topic in ("", "game", "player", "check", "turn")}
@@ -1,34 +1,109 @@
-from json import dumps
+from re import compile as re_compile
+
+from tortoise.transactions import in_transaction
 
 from src.controllers.formatting import create_error_block, create_success_block
+from src.controllers.read_model import read_model
 from src.models.db import Game, Player
 
-from .base import Command
+from .base import Blocks, Command
+
+# `nation=player`; nations may contain spaces and commas ("Ermor, Ashen Empire"), player names may not. A player
+# name ends at whitespace or a comma, so whatever follows up to the next `=` is the next nation.
+ASSIGNMENT_PATTERN = re_compile(r"\s*(?P<nation>[^=\s,][^=]*?)\s*=\s*(?P<player>[^\s,=]+)")
 
 
 class UpdatePlayerCommand(Command):
-    async def execute(self, game_name: str, nation_name: str, player_name: str) -> str:
+    async def execute(self, game_name: str, nation_name: str, player_name: str) -> Blocks:
         existing_game = await Game.filter(name=game_name, active=True).first()
         if not existing_game:
-            return dumps(
-                create_error_block(f"Game '{game_name}' not found", "Use `/dom game list` to see active games")
-            )
+            return create_error_block(f"Game '{game_name}' not found", "Use `/dom game list` to see active games")
 
-        # iexact: nations are typed by hand, don't make people match the scraped casing
-        player = await Player.filter(game=existing_game, short_name__iexact=nation_name).first()
+        # nations are typed by hand: short_name compares case-insensitively in the db, so this matches any casing
+        # and still uses the (game_id, short_name) index, which __iexact's UPPER() would bypass
+        player = await Player.filter(game=existing_game, short_name=nation_name).first()
         if not player:
-            return dumps(
-                create_error_block(
-                    f"Nation '{nation_name}' not found in game '{game_name}'",
-                    "Check the nation name and try again. Use `/dom check [game_name]` to see all nations",
-                )
+            return create_error_block(
+                f"Nation '{nation_name}' not found in game '{game_name}'",
+                "Check the nation name and try again. Use `/dom check [game_name]` to see all nations",
             )
 
         player.player_name = player_name
         await player.save()
-        return dumps(
-            create_success_block(
-                "Player Updated",
-                f"• Game: *{game_name}*\n• Nation: *{nation_name}*\n• Player: *{player_name}*",
-            )
+        await read_model.refresh_game(existing_game.id)
+        return create_success_block(
+            "Player Updated",
+            f"• Game: *{game_name}*\n• Nation: *{nation_name}*\n• Player: *{player_name}*",
         )
+
+
+def parse_assignments(text: str) -> tuple[list[tuple[str, str]], list[str]]:
+    """
+    Split a pasted roster into (nation, player) pairs.
+
+    :param text: The arguments after the game name, e.g. "Ermor=@john T'ien Ch'i=@jane"
+    :return: The pairs in order, and any leftover text that isn't a pair
+    """
+    pairs: list[tuple[str, str]] = []
+    leftovers: list[str] = []
+    position = 0
+    for match in ASSIGNMENT_PATTERN.finditer(text):
+        if text[position : match.start()].strip(" ,"):
+            leftovers.append(text[position : match.start()].strip(" ,"))
+        pairs.append((match["nation"], match["player"]))
+        position = match.end()
+    if text[position:].strip(" ,"):
+        leftovers.append(text[position:].strip(" ,"))
+    return pairs, leftovers
+
+
+class BulkUpdatePlayersCommand(Command):
+    """`/dom player [game_name] nation=player ...` — assign a whole roster in one go."""
+
+    async def execute(self, game_name: str, *assignments: str) -> Blocks:
+        pairs, leftovers = parse_assignments(" ".join(assignments))
+        if not pairs or leftovers:
+            return create_error_block(
+                f"Could not read {', '.join(f'`{text}`' for text in leftovers) or 'any nation=player pairs'}",
+                "Usage: `/dom player [game_name] nation=player nation=player ...`",
+            )
+
+        # one query for the whole roster; nations are matched here, case-insensitively, by short or full name
+        roster = await Player.filter(game__name=game_name, game__active=True)
+        if not roster:
+            return create_error_block(f"Game '{game_name}' not found", "Use `/dom game list` to see active games")
+
+        by_nation: dict[str, Player] = {}
+        for player in roster:
+            by_nation[player.nation.casefold()] = player
+            by_nation[player.short_name.casefold()] = player
+
+        assigned: dict[str, Player] = {}
+        lines: list[str] = []
+        unmatched: list[str] = []
+        for nation, player_name in pairs:
+            player = by_nation.get(nation.casefold())
+            if player is None:
+                unmatched.append(nation)
+                continue
+            player.player_name = player_name
+            assigned[player.nation] = player
+            lines.append(f"• {player.short_name}: *{player_name}*")
+
+        if not assigned:
+            return create_error_block(
+                f"None of these nations are in game '{game_name}': {', '.join(unmatched)}",
+                "Use `/dom check [game_name]` to see all nations",
+            )
+
+        async with in_transaction():
+            await Player.bulk_update(list(assigned.values()), fields=["player_name"])
+        await read_model.refresh_game(roster[0].game_id)  # ty: ignore[unresolved-attribute]
+
+        blocks = create_success_block(f"{len(assigned)} Player(s) Updated in {game_name}", "\n".join(lines))
+        if unmatched:
+            blocks += create_error_block(
+                f"Not found in '{game_name}': {', '.join(unmatched)}",
+                "Use `/dom check [game_name]` to see all nations",
+            )
+        return blocks
@@ -0,0 +1,76 @@
+import pytest
+from tortoise import Tortoise
+
+from src.commands.player_commands import BulkUpdatePlayersCommand, parse_assignments
+from src.controllers.command_parser import command_parser_wrapper
+from src.models.db import Game, Player
+
+
+@pytest.fixture
+async def _db():  # noqa: ANN202
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["src.models.db"]})
+    await Tortoise.generate_schemas()
+    yield
+    await Tortoise.close_connections()
+
+
+async def _game(name: str, *nations: str) -> Game:
+    game = await Game.create(name=name)
+    for nation in nations:
+        await Player.create(nation=nation, short_name=nation.split(",")[0], game=game)
+    return game
+
+
+@pytest.mark.parametrize(
+    ("text", "pairs", "leftovers"),
+    [
+        ("Ermor=@john Ulm=@jane", [("Ermor", "@john"), ("Ulm", "@jane")], []),
+        ("T'ien Ch'i = carol, Ermor=dave", [("T'ien Ch'i", "carol"), ("Ermor", "dave")], []),
+        ("Ermor john", [], ["Ermor john"]),
+        ("Ermor=a=b", [("Ermor", "a")], ["=b"]),
+        (
+            "Ermor, Ashen Empire=@john,Ulm, Forges of Steel = @jane",
+            [("Ermor, Ashen Empire", "@john"), ("Ulm, Forges of Steel", "@jane")],
+            [],
+        ),
+    ],
+)
+def test_parse_assignments(text: str, pairs: list[tuple[str, str]], leftovers: list[str]) -> None:
+    assert parse_assignments(text) == (pairs, leftovers)
+
+
+@pytest.mark.usefixtures("_db")
+async def test_roster_is_applied_together_and_unmatched_nations_reported() -> None:
+    game = await _game("Season", "Ermor, Ashen Empire", "T'ien Ch'i, Spring and Autumn", "Ulm, Forges of Steel")
+
+    result = str(
+        await BulkUpdatePlayersCommand().execute(
+            "Season", "ermor=@john", "T'ien", "Ch'i,", "Spring", "and", "Autumn=@jane", "Atlantis=@x"
+        )
+    )
+
+    assert "2 Player(s) Updated" in result
+    assert "Not found in 'Season': Atlantis" in result
+    names = dict(await Player.filter(game=game).values_list("short_name", "player_name"))
+    assert names == {"Ermor": "@john", "T'ien Ch'i": "@jane", "Ulm": None}
+
+
+@pytest.mark.usefixtures("_db")
+async def test_inactive_or_unknown_game_is_rejected() -> None:
+    game = await _game("Old", "Ermor, Ashen Empire")
+    await Game.filter(id=game.id).update(active=False)
+
+    result = str(await BulkUpdatePlayersCommand().execute("Old", "Ermor=@john"))
+
+    assert "Game 'Old' not found" in result
+    assert await Player.filter(player_name="@john").count() == 0
+
+
+@pytest.mark.usefixtures("_db")
+async def test_pairs_route_to_the_bulk_form() -> None:
+    await _game("Season", "Ermor, Ashen Empire", "Ulm, Forges of Steel")
+
+    blocks, ephemeral = await command_parser_wrapper("player Season Ermor=@john Ulm=@jane")
+
+    assert ephemeral
+    assert "2 Player(s) Updated" in str(blocks)
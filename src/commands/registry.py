@@ -0,0 +1,172 @@
+"""
+Every /dom command, compiled once at import.
+
+Each command is a single shared instance with its arity and usage worked out up front, and every word it can be
+reached by (its name, its aliases and each unambiguous prefix of either, so `/dom g l` lists games) is a key in a
+lookup table. Routing a call is then a dict lookup per word, with no reflection or allocation.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from inspect import Parameter, signature
+
+from .base import Command
+from .check_commands import CheckGameStatusCommand
+from .game_commands import (
+    AddGameCommand,
+    ListGamesCommand,
+    NicknameGameCommand,
+    RemoveGameCommand,
+    SetGameStatusCommand,
+    SetPrimaryGameCommand,
+)
+from .help_commands import HelpCommand
+from .player_commands import BulkUpdatePlayersCommand, UpdatePlayerCommand
+from .turn_commands import TurnStatusCommand
+
+_POSITIONAL = {Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD}
+
+
+@dataclass(frozen=True, slots=True)
+class CommandSpec:
+    name: str
+    command: Command
+    usage: str
+    aliases: tuple[str, ...] = ()
+    # posted to the channel; everything else answers the caller privately
+    channel_visible: bool = False
+    # reached by rewriting another command's arguments rather than by a word of its own
+    routed: bool = True
+    min_args: int = field(init=False)
+    max_args: int | None = field(init=False)  # None: takes any number
+
+    def __post_init__(self) -> None:
+        parameters = signature(self.command.execute).parameters.values()
+        positional = [parameter for parameter in parameters if parameter.kind in _POSITIONAL]
+        variadic = any(parameter.kind is Parameter.VAR_POSITIONAL for parameter in parameters)
+        object.__setattr__(self, "min_args", sum(parameter.default is Parameter.empty for parameter in positional))
+        object.__setattr__(self, "max_args", None if variadic else len(positional))
+
+    def accepts(self, count: int) -> bool:
+        return self.min_args <= count and (self.max_args is None or count <= self.max_args)
+
+
+class RoutingError(Exception):
+    def __init__(self, message: str, suggestion: str) -> None:
+        super().__init__(message)
+        self.message = message
+        self.suggestion = suggestion
+
+
+def _compile[T](words: dict[str, T]) -> dict[str, T | tuple[str, ...]]:
+    """
+    Map every prefix of every word to what it selects.
+
+    :param words: Full names and aliases, each mapped to its target
+    :return: Exact words and unambiguous prefixes map to their target; ambiguous prefixes to the words they could mean
+    """
+    matches: dict[str, dict[str, T]] = {}
+    for word, target in words.items():
+        for end in range(1, len(word) + 1):
+            matches.setdefault(word[:end], {})[word] = target
+
+    table: dict[str, T | tuple[str, ...]] = {}
+    for prefix, candidates in matches.items():
+        targets = {id(target): target for target in candidates.values()}
+        if prefix in words:
+            table[prefix] = words[prefix]
+        elif len(targets) == 1:
+            table[prefix] = next(iter(targets.values()))
+        else:
+            table[prefix] = tuple(sorted(candidates))
+    return table
+
+
+class CommandRegistry:
+    def __init__(self, specs: Iterable[CommandSpec]) -> None:
+        self._by_name = {spec.name: spec for spec in specs}
+
+        top: dict[str, CommandSpec | str] = {}
+        groups: dict[str, dict[str, CommandSpec]] = {}
+        for spec in self._by_name.values():
+            if not spec.routed:
+                continue
+            *group, word = spec.name.split()
+            if group:
+                top[group[0]] = group[0]
+                groups.setdefault(group[0], {}).update(dict.fromkeys((word, *spec.aliases), spec))
+            else:
+                top.update(dict.fromkeys((word, *spec.aliases), spec))
+
+        self._top = _compile(top)
+        self._groups = {group: _compile(words) for group, words in groups.items()}
+        self._subcommands = {
+            group: [spec.name.split()[1] for spec in dict.fromkeys(words.values())] for group, words in groups.items()
+        }
+
+    def get(self, name: str) -> CommandSpec:
+        return self._by_name[name]
+
+    def route(self, words: list[str]) -> tuple[CommandSpec, list[str]]:
+        """
+        Find the command a /dom invocation names.
+
+        :param words: The invocation split on whitespace, e.g. ["g", "l"]
+        :return: The command and the arguments left for it
+        :raises RoutingError: For an unknown or ambiguous word, with a message and suggestion for the user
+        """
+        target = self._top.get(words[0].lower())
+        if isinstance(target, CommandSpec):
+            return target, words[1:]
+        if target is None:
+            raise RoutingError(f"Unknown command: '{words[0]}'", "Use `/dom help` to see all commands")
+        if isinstance(target, tuple):
+            raise _ambiguous(words[0], target)
+
+        # a bare group, `/dom game`, is a request for its help rather than an error
+        if len(words) == 1:
+            return self._by_name["help"], [target]
+
+        sub = self._groups[target].get(words[1].lower())
+        if isinstance(sub, CommandSpec):
+            return sub, words[2:]
+        if sub is None:
+            raise RoutingError(
+                f"Unknown {target} subcommand: '{words[1]}'",
+                f"Valid subcommands: {', '.join(f'`{word}`' for word in self._subcommands[target])}\n"
+                f"Use `/dom help {target}` for details",
+            )
+        raise _ambiguous(words[1], sub)
+
+
+def _ambiguous(word: str, candidates: tuple[str, ...]) -> RoutingError:
+    return RoutingError(
+        f"'{word}' is ambiguous", f"Did you mean {' or '.join(f'`{candidate}`' for candidate in candidates)}?"
+    )
+
+
+registry = CommandRegistry(
+    [
+        CommandSpec(
+            "game add",
+            AddGameCommand(),
+            "`/dom game add [game_name]` or `/dom game add [game_1] [game_2] ...`",
+            aliases=("track",),
+        ),
+        CommandSpec("game remove", RemoveGameCommand(), "`/dom game remove [game_name]`", aliases=("rm", "untrack")),
+        CommandSpec("game nickname", NicknameGameCommand(), "`/dom game nickname [game_name] [nickname]`"),
+        CommandSpec("game list", ListGamesCommand(), "`/dom game list`", aliases=("ls",)),
+        CommandSpec("game primary", SetPrimaryGameCommand(), "`/dom game primary [game_name]`"),
+        CommandSpec("game status", SetGameStatusCommand(), "`/dom game status [game_name] [active|inactive]`"),
+        CommandSpec("player", UpdatePlayerCommand(), "`/dom player [game_name] [nation] [player_name]`"),
+        CommandSpec(
+            "player bulk",
+            BulkUpdatePlayersCommand(),
+            "`/dom player [game_name] nation=player nation=player ...`",
+            routed=False,
+        ),
+        CommandSpec("check", CheckGameStatusCommand(), "`/dom check [game_name]`", channel_visible=True),
+        CommandSpec("turn", TurnStatusCommand(), "`/dom turn`", channel_visible=True),
+        CommandSpec("help", HelpCommand(), "`/dom help [game|player|check|turn]`", aliases=("?",)),
+    ]
+)
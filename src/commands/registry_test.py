@@ -0,0 +1,78 @@
+import pytest
+
+from src.commands.base import Blocks, Command
+from src.commands.registry import CommandRegistry, CommandSpec, RoutingError, registry
+
+
+class _Fixed(Command):
+    async def execute(self, first: str, second: str = "") -> Blocks:  # noqa: ARG002
+        return []
+
+
+class _Variadic(Command):
+    async def execute(self, first: str, *rest: str) -> Blocks:  # noqa: ARG002
+        return []
+
+
+@pytest.mark.parametrize(
+    ("words", "name", "args"),
+    [
+        (["game", "list"], "game list", []),
+        (["g", "l"], "game list", []),
+        (["GAME", "LS"], "game list", []),
+        (["ga", "rm", "Old"], "game remove", ["Old"]),
+        (["game", "track", "A", "B"], "game add", ["A", "B"]),
+        (["p", "Season", "Ermor", "@john"], "player", ["Season", "Ermor", "@john"]),
+        (["?"], "help", []),
+        (["game"], "help", ["game"]),
+    ],
+)
+def test_routes_names_aliases_and_prefixes(words: list[str], name: str, args: list[str]) -> None:
+    spec, rest = registry.route(words)
+
+    assert spec.name == name
+    assert rest == args
+
+
+def test_ambiguous_prefix_names_the_candidates() -> None:
+    ambiguous = CommandRegistry(
+        [
+            CommandSpec("game pause", _Fixed(), "`pause`"),
+            CommandSpec("game primary", _Fixed(), "`primary`"),
+            CommandSpec("help", _Fixed(), "`help`"),
+        ]
+    )
+
+    assert ambiguous.route(["game", "pr", "x"])[0].name == "game primary"
+    with pytest.raises(RoutingError) as error:
+        ambiguous.route(["game", "p", "x"])
+    assert "`pause` or `primary`" in error.value.suggestion
+
+
+def test_unrouted_commands_are_only_reachable_by_name() -> None:
+    with pytest.raises(RoutingError):
+        registry.route(["bulk"])
+    assert registry.get("player bulk").max_args is None
+
+
+def test_arity_is_worked_out_once_from_the_signature() -> None:
+    fixed = CommandSpec("fixed", _Fixed(), "`fixed`")
+    variadic = CommandSpec("variadic", _Variadic(), "`variadic`")
+
+    assert (fixed.min_args, fixed.max_args) == (1, 2)
+    assert [fixed.accepts(count) for count in range(4)] == [False, True, True, False]
+    assert (variadic.min_args, variadic.max_args) == (1, None)
+    assert variadic.accepts(20)
+
+
+def test_commands_are_shared_instances() -> None:
+    assert registry.route(["turn"])[0].command is registry.route(["t"])[0].command
+
+
+async def test_help_pages_are_built_once() -> None:
+    help_command = registry.get("help").command
+
+    first, second = await help_command.execute("game"), await help_command.execute("GAME")
+
+    assert first == second
+    assert first[0] is second[0]
@@ -1,11 +1,9 @@
-from typing import Any
-
 from src.controllers.lobby_details import turn_command_wrapper
 
-from .base import Command
+from .base import Blocks, Command
 
 
 class TurnStatusCommand(Command):
-    async def execute(self) -> list[Any]:
+    async def execute(self) -> Blocks:
         # turn_command_wrapper already renders its own failures as blocks
         return await turn_command_wrapper()
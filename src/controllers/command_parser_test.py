@@ -2,7 +2,7 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from src.controllers.command_parser import command_parser_wrapper
+from src.controllers.command_parser import command_label, command_parser_wrapper
 
 
 @pytest.mark.parametrize(
@@ -79,3 +79,18 @@ async def test_command_body_failure_is_reported_without_the_exception_text() ->
     assert ephemeral
     assert "hunter2" not in str(blocks), "connection strings must never reach Slack"
     assert "Something went wrong" in str(blocks)
+
+
+async def test_prefixes_reach_the_same_command() -> None:
+    short, _ = await command_parser_wrapper("he game")
+    full, _ = await command_parser_wrapper("help game")
+
+    assert short == full
+
+
+@pytest.mark.parametrize(
+    ("command", "label"),
+    [("game list", "game list"), ("GAME LS", "game list"), ("", "invalid"), ("launch missiles", "invalid")],
+)
+def test_commands_are_labelled_by_what_they_route_to(command: str, label: str) -> None:
+    assert command_label(command) == label
@@ -1,6 +1,13 @@
 from typing import Any
 
 from src.models.app.lobby_details import LobbyDetails
+from src.models.app.player_status import PlayerStatus
+from src.utils.constants import NATION_COMPACT_THRESHOLD
+
+# Slack rejects a section whose text is longer than this
+SECTION_TEXT_LIMIT = 3000
+# compact cards list who the game is waiting on first; statuses not named here follow in the order they appear
+NATION_GROUP_ORDER = ("Turn unfinished", "-", "Turn played", "AI", "Eliminated")
 
 
 def create_success_block(message: str, details: str | None = None) -> list[dict[str, Any]]:
@@ -57,6 +64,16 @@ def create_info_block(message: str, details: str | None = None) -> list[dict[str
     return blocks
 
 
+def create_context_block(text: str) -> list[dict[str, Any]]:
+    """
+    Create the small grey footer line used for a message's source or totals.
+
+    :param text: Footer text (mrkdwn)
+    :return: List of Slack blocks for the footer
+    """
+    return [{"type": "context", "elements": [{"type": "mrkdwn", "text": text}]}]
+
+
 def get_emoji(turn_status: str) -> str:
     """
     This function takes a player's turn status as an argument and returns an emoji that corresponds to the status.
@@ -131,23 +148,61 @@ def create_game_details_block(lobby_details: LobbyDetails, game_name: str | None
     return formatted_msg
 
 
-def create_nations_block(player_list: list) -> list[dict[str, Any]]:
+def create_nations_block(player_list: list[PlayerStatus]) -> list[dict[str, Any]]:
+    """
+    One section per nation, or the compact form once a game has more than NATION_COMPACT_THRESHOLD of them.
+
+    :param player_list: The nations in page order
+    :return: List of Slack blocks for the player list
+    """
+    if len(player_list) > NATION_COMPACT_THRESHOLD:
+        return create_compact_nations_block(player_list)
+
     player_blocks = []
 
     for player in player_list:
         turn_emoji = get_emoji(turn_status=player.turn_status)
 
         # web rows carry the full "Ermor, Ashen Empire" title, db rows the short name — show the short one either way
-        nation = player.name.split(",")[0].strip()
         player_name_string = f" - {player.nickname}" if player.nickname else ""
 
         nation_section = {
             "type": "section",
             "text": {
                 "type": "mrkdwn",
-                "text": f"{turn_emoji} - *{nation}*{player_name_string}",
+                "text": f"{turn_emoji} - *{player.short_name}*{player_name_string}",
             },
         }
 
         player_blocks.append(nation_section)
     return player_blocks
+
+
+def create_compact_nations_block(player_list: list[PlayerStatus]) -> list[dict[str, Any]]:
+    """
+    Nations grouped by turn status, one line each under a header carrying the group's emoji and count.
+    Who the game is waiting on comes first. A large game fits in a few blocks rather than one per nation.
+
+    :param player_list: The nations in page order; kept in that order within each group
+    :return: List of Slack blocks, each section under Slack's length limit
+    """
+    groups: dict[str, list[PlayerStatus]] = {status: [] for status in NATION_GROUP_ORDER}
+    for player in player_list:
+        groups.setdefault(player.turn_status, []).append(player)
+
+    blocks: list[dict[str, Any]] = []
+    for status, players in groups.items():
+        if not players:
+            continue
+        lines = [f"{get_emoji(status)} *{status}* ({len(players)})"]
+        lines += [
+            f"{player.short_name} - {player.nickname}" if player.nickname else player.short_name for player in players
+        ]
+        text = ""
+        for line in lines:
+            if len(text) + len(line) + 1 > SECTION_TEXT_LIMIT:
+                blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": text}})
+                text = ""
+            text = f"{text}\n{line}" if text else line
+        blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": text}})
+    return blocks
@@ -1,3 +1,4 @@
+from json import dumps
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -5,6 +6,7 @@ from aiohttp import ClientResponse, ClientSession
 from tortoise import Tortoise
 
 from src.controllers.formatting import (
+    SECTION_TEXT_LIMIT,
     create_game_details_block,
     create_nations_block,
     get_emoji,
@@ -15,10 +17,15 @@ from src.controllers.lobby_details import (
     fetch_lobby_details_live,
     format_lobby_details,
     get_lobby_details,
+    render_lobby_card,
+    scrape_cache,
+    server_guard,
 )
 from src.models.app.lobby_details import LobbyDetails
 from src.models.app.player_status import PlayerStatus
 from src.models.db import Game, Player
+from src.utils.constants import NATION_COMPACT_THRESHOLD
+from src.utils.host_guard import CircuitState
 
 
 @pytest.fixture
@@ -29,15 +36,21 @@ async def _initialize_tortoise():  # noqa: ANN202
     await Tortoise.close_connections()
 
 
+@pytest.fixture(autouse=True)
+def _empty_scrape_cache() -> None:
+    """Each test serves its own page for the same game names."""
+    scrape_cache.clear()
+
+
 def _patched_session(html: str):  # noqa: ANN202
     mock_response = AsyncMock(spec=ClientResponse)
+    mock_response.status = 200
     mock_response.text.return_value = html
     mock_session = AsyncMock(spec=ClientSession)
     mock_session.get.return_value.__aenter__.return_value = mock_response
 
-    patcher = patch("src.controllers.lobby_details.ClientSession")
-    mock_client_session = patcher.start()
-    mock_client_session.return_value.__aenter__.return_value = mock_session
+    patcher = patch("src.controllers.lobby_details.get_session", return_value=mock_session)
+    patcher.start()
     return patcher
 
 
@@ -276,3 +289,88 @@ def test_create_nations_block() -> None:
     assert ":question: - *Player2*" in result[1]["text"]["text"]
     # scraped nation titles get trimmed to the short name the db card already shows
     assert ":white_check_mark: - *Ermor*" in result[2]["text"]["text"]
+
+
+def _large_game(nations: int) -> list[PlayerStatus]:
+    statuses = ["Turn played", "Turn unfinished", "Eliminated", "AI"]
+    return [
+        PlayerStatus(
+            name=f"Nation{n}, Empire of the Very Long Title {n}",
+            turn_status=statuses[n % len(statuses)],
+            nickname=f"@player{n}" if n % 2 else None,
+        )
+        for n in range(nations)
+    ]
+
+
+def test_large_game_card_stays_within_slack_limits() -> None:
+    players = _large_game(60)
+    details = LobbyDetails(server_info="big, turn 40", player_status=players, turn="40", time_left="2 days")
+
+    card = render_lobby_card(details, "big")
+    compact = create_nations_block(players)
+    one_per_nation = [
+        {"type": "section", "text": {"type": "mrkdwn", "text": f"{get_emoji(p.turn_status)} - *{p.short_name}*"}}
+        for p in players
+    ]
+
+    assert len(card) < 50, "Slack rejects a message with more than 50 blocks"
+    assert all(len(block["text"]["text"]) <= SECTION_TEXT_LIMIT for block in compact)
+    assert len(dumps(compact)) * 3 < len(dumps(one_per_nation))
+    text = "\n".join(block["text"]["text"] for block in compact)
+    assert all(player.short_name in text for player in players)
+    assert "Nation1 - @player1" in text
+    # who the game is waiting on comes first
+    assert text.startswith(":question: *Turn unfinished* (15)")
+
+
+def test_compact_layout_starts_past_the_threshold() -> None:
+    at_threshold = create_nations_block(_large_game(NATION_COMPACT_THRESHOLD))
+    past_threshold = create_nations_block(_large_game(NATION_COMPACT_THRESHOLD + 1))
+
+    assert len(at_threshold) == NATION_COMPACT_THRESHOLD
+    assert len(past_threshold) == 4, "one section per status"
+
+
+def test_compact_groups_split_at_the_section_limit() -> None:
+    players = [PlayerStatus(name=f"{'N' * 90}{n}", turn_status="Turn played") for n in range(100)]
+
+    blocks = create_nations_block(players)
+
+    assert len(blocks) > 1
+    assert all(len(block["text"]["text"]) <= SECTION_TEXT_LIMIT for block in blocks)
+    assert sum(block["text"]["text"].count("\n") + 1 for block in blocks) == 101
+
+
+async def test_repeated_live_fetches_share_one_scrape() -> None:
+    patcher = _patched_session("<html><body><tr>Game, Turn 2 (2 days left)</tr></body></html>")
+    try:
+        first = await fetch_lobby_details_from_web("shared")
+        assert first is not None
+        first.is_primary = True  # callers decorate their copy; that must not reach the cache
+        second = await fetch_lobby_details_from_web("shared")
+        session = patcher.target.get_session()
+    finally:
+        patcher.stop()
+
+    assert session.get.call_count == 1
+    assert second is not None
+    assert second.is_primary is False
+
+
+@pytest.mark.usefixtures("_initialize_tortoise")
+async def test_open_circuit_serves_the_cached_card_without_a_request() -> None:
+    game = await Game.create(name="TestGame", turn=3, time_left="3 days left")
+    await Player.create(nation="Ermor, Ashen Empire", short_name="Ermor", turn_status="Turn played", game=game)
+
+    patcher = _patched_session("<html></html>")
+    try:
+        with patch.object(server_guard, "state", CircuitState.OPEN), patch.object(server_guard, "_opened_at", 1e18):
+            blocks = await get_lobby_details("TestGame", use_db=False)
+        session = patcher.target.get_session()
+    finally:
+        patcher.stop()
+
+    session.get.assert_not_called()
+    assert "Ermor" in str(blocks)
+    assert "could not be reached" in str(blocks)
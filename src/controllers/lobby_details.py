@@ -1,74 +1,116 @@
 import re
 from typing import Any
 
-import bs4
-from aiohttp import ClientError, ClientSession, ClientTimeout
-from bs4 import BeautifulSoup
+from aiohttp import ClientError
 from loguru import logger
 
 from src.controllers.formatting import (
+    create_context_block,
     create_error_block,
     create_game_details_block,
     create_nations_block,
 )
+from src.controllers.read_model import cached_render, read_model
+from src.controllers.status_page import (
+    UnexpectedLayoutError,
+    extract_status_table,
+    extract_status_table_with_soup,
+)
 from src.models.app.lobby_details import LobbyDetails
 from src.models.app.player_status import PlayerStatus
 from src.models.db import Game
 from src.models.db.players import Player
+from src.utils.constants import SCRAPE_CACHE_SIZE, SCRAPE_CACHE_TTL_SECONDS
+from src.utils.executor_manager import run_parse
+from src.utils.host_guard import CircuitOpenError, guard_for
+from src.utils.http_manager import get_session
+from src.utils.scrape_cache import ScrapeCache
+
+scrape_cache = ScrapeCache[LobbyDetails](ttl=SCRAPE_CACHE_TTL_SECONDS, maxsize=SCRAPE_CACHE_SIZE)
+
+SERVER_URL = "http://ulm.illwinter.com/dom6/server/"
 
-REQUEST_TIMEOUT = ClientTimeout(total=15)
+LIVE_SOURCE = "Live from the Dominions server"
+UNREACHABLE_NOTE = ":warning: Last known state · the Dominions server could not be reached"
 
 # requires whitespace + digits, so a game named "nocturne" or "saturnalia" can't match
 TURN_PATTERN = re.compile(r"turn\s+(\d+)")
 
 
 def format_url(game_name: str) -> str:
-    return f"http://ulm.illwinter.com/dom6/server/{game_name}.html"
+    return f"{SERVER_URL}{game_name}.html"
+
+
+async def _probe_server() -> None:
+    """Any answer short of a 5xx means the server is back."""
+    async with get_session().get(url=SERVER_URL) as response:
+        if response.status >= 500:
+            response.raise_for_status()
+
+
+server_guard = guard_for(SERVER_URL, probe=_probe_server)
+
+
+def parse_lobby_details(html_content: str, game_name: str) -> LobbyDetails | None:
+    """Read a status page into LobbyDetails. Returns None when it has no table or no turn counter."""
+    try:
+        table = extract_status_table(html_content)
+    except UnexpectedLayoutError as e:
+        logger.warning(f"unexpected status page layout for game {game_name} ({e}); parsing with BeautifulSoup")
+        table = extract_status_table_with_soup(html_content)
+
+    if table is None:
+        logger.error(f"Failed to find table row in HTML content for game {game_name}")
+        return None
+
+    first_row, rows = table
+    server_info = first_row.strip().lower()
+    # page reads "<game name>, turn N (time left)" — take the last match, the game name comes first
+    turn_matches = TURN_PATTERN.findall(server_info)
+    if not turn_matches:
+        logger.error(f"Failed to extract turn information for game {game_name}")
+        return None
+
+    turn = turn_matches[-1]
+
+    time_left: str | None = None
+    if "(" in server_info and ")" in server_info:
+        # rsplit so a game named "Blitz (fast)" doesn't shadow the real timer
+        time_left = server_info.rsplit("(", 1)[1].split(")")[0]
+
+    return LobbyDetails(
+        server_info=server_info,
+        player_status=[PlayerStatus(name=name, turn_status=turn_status) for name, turn_status in rows],
+        turn=turn,
+        time_left=time_left,
+    )
 
 
 async def fetch_lobby_details_from_web(game_name: str) -> LobbyDetails | None:
-    """Scrape a game's status page. Returns None on any failure — never raises."""
+    """
+    A game's live status. Concurrent callers share one scrape, and a result is reused for SCRAPE_CACHE_TTL_SECONDS,
+    so the poller warms it for the checks that follow. Returns None on any failure — never raises.
+    """
+    details = await scrape_cache.get_or_fetch(game_name, lambda: _scrape(game_name))
+    # callers fill in nicknames and the primary flag; don't let that leak into the shared copy
+    return None if details is None else details.copy()
+
+
+async def _scrape(game_name: str) -> LobbyDetails | None:
     formatted_url = format_url(game_name)
     try:
-        async with ClientSession(timeout=REQUEST_TIMEOUT) as session, session.get(url=formatted_url) as response:
+        # shared session: keeps the illwinter connection alive between scrapes instead of a handshake per game
+        async with server_guard.slot(), get_session().get(url=formatted_url) as response:
+            # a 5xx counts against the server; a 404 page is just a mistyped game name, and parses to None
+            if response.status >= 500:
+                response.raise_for_status()
             html_content = await response.text()
 
-        soup = BeautifulSoup(html_content, "html.parser")
-        first_row = soup.find("tr")
-
-        if not isinstance(first_row, bs4.Tag):
-            logger.error(f"Failed to find table row in HTML content for game {game_name}")
-            return None
-
-        server_info = first_row.text.strip().lower()
-        # page reads "<game name>, turn N (time left)" — take the last match, the game name comes first
-        turn_matches = TURN_PATTERN.findall(server_info)
-        if not turn_matches:
-            logger.error(f"Failed to extract turn information for game {game_name}")
-            return None
-
-        turn = turn_matches[-1]
-
-        time_left: str | None = None
-        if "(" in server_info and ")" in server_info:
-            # rsplit so a game named "Blitz (fast)" doesn't shadow the real timer
-            time_left = server_info.rsplit("(", 1)[1].split(")")[0]
-
-        player_status_list = []
-        for row in soup.find_all("tr")[1:]:
-            columns = row.find_all("td")
-            if len(columns) >= 2:
-                player_status_list.append(
-                    PlayerStatus(name=columns[0].text.strip(), turn_status=columns[1].text.strip()),
-                )
-
-        return LobbyDetails(
-            server_info=server_info,
-            player_status=player_status_list,
-            turn=turn,
-            time_left=time_left,
-        )
+        # parsing is CPU-bound; PARSE_MODE decides whether it blocks the event loop or runs in a pool
+        return await run_parse(parse_lobby_details, html_content, game_name)
 
+    except CircuitOpenError as e:
+        logger.warning(f"Skipping scrape of game {game_name}: {e}")
     except (ClientError, TimeoutError) as e:
         logger.error(f"HTTP request failed for game {game_name}: {e}")
     except (IndexError, ValueError) as e:
@@ -78,6 +120,24 @@ async def fetch_lobby_details_from_web(game_name: str) -> LobbyDetails | None:
 
 
 async def fetch_lobby_details_from_db(game_name: str) -> LobbyDetails | None:
+    """The poller's copy of a game — from the read model for active games, else from the db itself."""
+    if read_model.loaded and (view := read_model.game_by_name(game_name)) is not None:
+        return LobbyDetails(
+            server_info=f"{view.name} - Turn {view.turn}",
+            player_status=[
+                PlayerStatus(
+                    name=player.short_name,
+                    turn_status=player.turn_status,
+                    nickname=player.player_name,
+                    short_name=player.short_name,
+                )
+                for player in view.players
+            ],
+            turn=str(view.turn),
+            time_left=view.time_left,
+            is_primary=view.primary_game,
+        )
+
     # newest row wins: names aren't unique, so a re-added game must not resolve to a stale row
     game = await Game.filter(name=game_name).order_by("-created_at").first()
     if game is None:
@@ -87,7 +147,12 @@ async def fetch_lobby_details_from_db(game_name: str) -> LobbyDetails | None:
     player_list = await Player.filter(game=game)
 
     player_status_list = [
-        PlayerStatus(name=player.short_name, turn_status=player.turn_status, nickname=player.player_name)
+        PlayerStatus(
+            name=player.short_name,
+            turn_status=player.turn_status,
+            nickname=player.player_name,
+            short_name=player.short_name,
+        )
         for player in player_list
     ]
 
@@ -107,33 +172,61 @@ async def fetch_lobby_details_live(game_name: str) -> LobbyDetails | None:
     lobby_details = await fetch_lobby_details_from_web(game_name)
     if lobby_details is None:
         return None
+    return await _with_tracked_details(lobby_details, game_name)
 
-    game = await Game.filter(name=game_name).order_by("-created_at").first()
-    if game is None:
-        return lobby_details
 
-    lobby_details.is_primary = game.primary_game
+async def fetch_lobby_details_last_known(game_name: str) -> LobbyDetails | None:
+    """The newest state available without a scrape: the last scrape of any age, else the poller's copy in the db."""
+    scraped = scrape_cache.peek(game_name)
+    if scraped is not None:
+        return await _with_tracked_details(scraped.copy(), game_name)
+    return await fetch_lobby_details_from_db(game_name)
+
+
+async def _with_tracked_details(lobby_details: LobbyDetails, game_name: str) -> LobbyDetails:
+    """Fill in what only the db knows about a scraped game: player nicknames and whether it is primary."""
+    if read_model.loaded and (view := read_model.game_by_name(game_name)) is not None:
+        lobby_details.is_primary = view.primary_game
+        nicknames = {player.nation: player.player_name for player in view.players}
+    else:
+        game = await Game.filter(name=game_name).order_by("-created_at").first()
+        if game is None:
+            return lobby_details
+        lobby_details.is_primary = game.primary_game
+        nicknames = {player.nation: player.player_name for player in await Player.filter(game=game)}
 
-    nicknames = {player.nation: player.player_name for player in await Player.filter(game=game)}
     for player in lobby_details.player_status:
         player.nickname = nicknames.get(player.name)
 
     return lobby_details
 
 
-def format_lobby_details(lobby_details: LobbyDetails, use_db: bool = False, game_name: str | None = None) -> list[dict]:
-    source = "Cached · updates every 15 minutes" if use_db else "Live from the Dominions server"
-
-    logger.debug("format_lobby_details run")
+def render_lobby_card(lobby_details: LobbyDetails, game_name: str | None = None) -> list[dict]:
+    """The status card without its source line — two renders show the same thing exactly when these are equal."""
     return [
         *create_game_details_block(lobby_details, game_name),
         *create_nations_block(lobby_details.player_status),
-        {"type": "context", "elements": [{"type": "mrkdwn", "text": source}]},
     ]
 
 
+def format_lobby_details(
+    lobby_details: LobbyDetails, use_db: bool = False, game_name: str | None = None, note: str | None = None
+) -> list[dict]:
+    source = note or ("Cached · polled more often as the turn deadline nears" if use_db else LIVE_SOURCE)
+
+    logger.debug("format_lobby_details run")
+    return [*render_lobby_card(lobby_details, game_name), *create_context_block(source)]
+
+
 async def get_lobby_details(game_name: str, use_db: bool = False) -> list[Any]:
     """Always returns a non-empty block list — Slack rejects a message with zero blocks."""
+    if use_db:
+        # the poller's copy only changes through the read model's write-through, so its card is rendered once per change
+        return await cached_render(("status", game_name), lambda: _get_lobby_details(game_name, use_db))
+    return await _get_lobby_details(game_name, use_db)
+
+
+async def _get_lobby_details(game_name: str, use_db: bool) -> list[Any]:
     try:
         if use_db:
             fetch_function = fetch_lobby_details_from_db
@@ -144,6 +237,12 @@ async def get_lobby_details(game_name: str, use_db: bool = False) -> list[Any]:
 
         lobby_details = await fetch_function(game_name)
 
+        note = None
+        if lobby_details is None and not use_db and server_guard.is_open:
+            # the server is down: answer with what we have in milliseconds rather than an error
+            lobby_details = await fetch_lobby_details_last_known(game_name)
+            note = UNREACHABLE_NOTE
+
         if lobby_details is None:
             logger.error(f"No lobby details found for game '{game_name}'")
             return create_error_block(
@@ -151,7 +250,7 @@ async def get_lobby_details(game_name: str, use_db: bool = False) -> list[Any]:
                 "Check the name with `/dom game list`, or confirm the game exists on the Dominions server",
             )
 
-        return format_lobby_details(lobby_details, use_db, game_name)
+        return format_lobby_details(lobby_details, use_db, game_name, note)
 
     except Exception:
         logger.exception(f"Error fetching lobby details for game '{game_name}'")
@@ -162,7 +261,10 @@ async def get_lobby_details(game_name: str, use_db: bool = False) -> list[Any]:
 
 
 async def turn_command_wrapper() -> list[Any]:
-    current_game = await Game.filter(primary_game=True).first()
+    if read_model.loaded:
+        current_game = read_model.primary_game()
+    else:
+        current_game = await Game.filter(active=True, primary_game=True).first()
     if current_game is None:
         logger.error("No primary game found")
         return create_error_block("No primary game set", "Set one with `/dom game primary [game_name]`")
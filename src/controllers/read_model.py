@@ -0,0 +1,197 @@
+"""
+In-memory copy of the active games and their players.
+
+This process is the only writer, so after one load at startup the copy is kept current write-through: the poller
+applies what it wrote, and commands reload the game they changed. Read-only commands answer from here without a
+query. Nothing loads it but main(), so anywhere else `loaded` stays False and callers go to the database instead.
+
+Every write-through that changes something bumps `version`, and read-only commands keep their rendered responses in
+`render_cache` tagged with it: a response is reused until the state behind it changes.
+"""
+
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from loguru import logger
+
+from src.models.db import Game, Player
+from src.models.db.fields import canonical_turn_status
+from src.utils.constants import RENDER_CACHE_SIZE
+from src.utils.render_cache import RenderCache
+
+
+@dataclass
+class PlayerView:
+    id: UUID
+    nation: str
+    short_name: str
+    player_name: str | None
+    turn_status: str
+
+
+@dataclass
+class GameView:
+    id: UUID
+    name: str
+    nickname: str
+    turn: int
+    time_left: str | None
+    primary_game: bool
+    created_at: datetime
+    players: list[PlayerView] = field(default_factory=list)
+
+
+def _game_view(game: Game, players: list[Player]) -> GameView:
+    return GameView(
+        id=game.id,
+        name=game.name,
+        nickname=game.nickname,
+        turn=game.turn,
+        time_left=game.time_left,
+        primary_game=game.primary_game,
+        created_at=game.created_at,
+        players=[
+            PlayerView(
+                id=player.id,
+                nation=player.nation,
+                short_name=player.short_name,
+                player_name=player.player_name,
+                turn_status=player.turn_status,
+            )
+            for player in players
+        ],
+    )
+
+
+async def _load_active() -> dict[UUID, GameView]:
+    games = await Game.filter(active=True)
+    players_by_game: dict[UUID, list[Player]] = {game.id: [] for game in games}
+    if games:
+        for player in await Player.filter(game_id__in=list(players_by_game)):
+            players_by_game[player.game_id].append(player)  # ty: ignore[unresolved-attribute]
+    return {game.id: _game_view(game, players_by_game[game.id]) for game in games}
+
+
+class ReadModel:
+    def __init__(self) -> None:
+        self.loaded = False
+        self.version = 0
+        self._games: dict[UUID, GameView] = {}
+
+    async def load(self) -> None:
+        self._games = await _load_active()
+        self.loaded = True
+        self.version += 1
+        logger.info(f"read model loaded: {len(self._games)} active game(s)")
+
+    def clear(self) -> None:
+        self._games = {}
+        self.loaded = False
+        self.version += 1
+
+    # reads
+
+    def active_games(self) -> list[GameView]:
+        return list(self._games.values())
+
+    def game_by_name(self, name: str) -> GameView | None:
+        # newest row wins, as in the db lookups: names aren't unique
+        matches = [game for game in self._games.values() if game.name == name]
+        return max(matches, key=lambda game: game.created_at) if matches else None
+
+    def primary_game(self) -> GameView | None:
+        return next((game for game in self._games.values() if game.primary_game), None)
+
+    # write-through
+
+    async def refresh_game(self, game_id: UUID) -> None:
+        """Reload one game after a command changed it; drops it if it is no longer active."""
+        if not self.loaded:
+            return
+        game = await Game.get_or_none(id=game_id)
+        if game is None or not game.active:
+            self._games.pop(game_id, None)
+        else:
+            self._games[game_id] = _game_view(game, await Player.filter(game_id=game_id))
+        # only once the change is in: a render made while the queries were in flight shows the old state, and must
+        # not be cached under the new version
+        self.version += 1
+
+    def set_primary(self, game_id: UUID) -> None:
+        self.version += 1
+        for game in self._games.values():
+            game.primary_game = game.id == game_id
+
+    def update_game(self, game_id: UUID, time_left: str | None, turn: int | None = None) -> None:
+        """Apply the poller's write of a game's timer, and its turn when that advanced."""
+        if (game := self._games.get(game_id)) is None:
+            return
+        if game.time_left != time_left or (turn is not None and game.turn != turn):
+            self.version += 1
+        game.time_left = time_left
+        if turn is not None:
+            game.turn = turn
+
+    def update_statuses(self, game_id: UUID, statuses: dict[str, str]) -> None:
+        """Apply a scrape's statuses by full nation name. Nations the game doesn't track are ignored."""
+        if (game := self._games.get(game_id)) is None:
+            return
+        for player in game.players:
+            if player.nation in statuses:
+                status = canonical_turn_status(statuses[player.nation])
+                if player.turn_status != status:
+                    player.turn_status = status
+                    self.version += 1
+
+    def remove_game(self, game_id: UUID) -> None:
+        if self._games.pop(game_id, None) is not None:
+            self.version += 1
+
+    # verification
+
+    async def check_consistency(self) -> list[str]:
+        """Compare against a fresh read of the database. Returns one line per difference; empty means in sync."""
+        if not self.loaded:
+            return ["read model is not loaded"]
+
+        expected = await _load_active()
+        problems = [f"game {game_id} missing from read model" for game_id in expected.keys() - self._games.keys()]
+        problems += [f"game {game_id} in read model but not active" for game_id in self._games.keys() - expected]
+        for game_id in expected.keys() & self._games.keys():
+            mine, theirs = self._games[game_id], expected[game_id]
+            players = {player.id: player for player in mine.players}
+            for attribute in ("name", "nickname", "turn", "time_left", "primary_game"):
+                held, stored = getattr(mine, attribute), getattr(theirs, attribute)
+                if held != stored:
+                    problems.append(f"{theirs.name}: {attribute} is {held!r}, db has {stored!r}")
+            for player in theirs.players:
+                if players.pop(player.id, None) != player:
+                    problems.append(f"{theirs.name}: player {player.nation} differs from the db")
+            problems += [f"{theirs.name}: player {player.nation} no longer in the db" for player in players.values()]
+        return problems
+
+
+read_model = ReadModel()
+render_cache = RenderCache[list[dict[str, Any]]](maxsize=RENDER_CACHE_SIZE)
+
+
+async def cached_render(key: Hashable, render: Callable[[], Awaitable[list[dict[str, Any]]]]) -> list[dict[str, Any]]:
+    """
+    A read-only command's response, rendered again only once the read model has changed since it was cached.
+    Without a loaded read model nothing tracks the state, so every call renders.
+    """
+    if not read_model.loaded:
+        return await render()
+    # a copy of the list, so a caller appending a block can't change what the next caller gets
+    return list(await render_cache.get_or_render(key, read_model.version, render))
+
+
+async def report_consistency() -> None:
+    """Run the consistency check and log what it found — wired to SIGUSR1 in main."""
+    problems = await read_model.check_consistency()
+    for problem in problems:
+        logger.warning(f"read model drift: {problem}")
+    logger.info(f"read model consistency check: {len(problems)} difference(s)")
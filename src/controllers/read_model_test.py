@@ -0,0 +1,184 @@
+from asyncio import Event, create_task
+from contextlib import ExitStack
+from unittest.mock import AsyncMock, Mock, patch
+from uuid import UUID
+
+import pytest
+from tortoise import Tortoise
+
+from src.commands.game_commands import (
+    AddGameCommand,
+    ListGamesCommand,
+    NicknameGameCommand,
+    RemoveGameCommand,
+    SetPrimaryGameCommand,
+)
+from src.commands.player_commands import UpdatePlayerCommand
+from src.controllers.lobby_details import turn_command_wrapper
+from src.controllers.read_model import read_model
+from src.models.app.lobby_details import LobbyDetails
+from src.models.app.player_status import PlayerStatus
+from src.models.db import Game, Player
+from src.tasks.update_games import update_games_wrapper
+
+NATION = "Ermor, Ashen Empire"
+
+
+@pytest.fixture
+async def _db():  # noqa: ANN202
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["src.models.db"]})
+    await Tortoise.generate_schemas()
+    await read_model.load()
+    yield
+    read_model.clear()
+    await Tortoise.close_connections()
+
+
+def _details(turn: str, status: str = "Turn unfinished", time_left: str = "1 day left") -> LobbyDetails:
+    return LobbyDetails(
+        server_info=f"game, turn {turn} ({time_left})",
+        player_status=[PlayerStatus(name=NATION, turn_status=status)],
+        turn=turn,
+        time_left=time_left,
+    )
+
+
+def _no_queries() -> ExitStack:
+    stack = ExitStack()
+    for model in (Game, Player):
+        for method in ("all", "filter", "get", "get_or_none"):
+            stack.enter_context(
+                patch.object(model, method, new=Mock(side_effect=AssertionError(f"{model.__name__}.{method} queried")))
+            )
+    return stack
+
+
+@pytest.mark.usefixtures("_db")
+async def test_commands_write_through() -> None:
+    with patch("src.commands.game_commands.fetch_lobby_details_from_web", new=AsyncMock(return_value=_details("3"))):
+        await AddGameCommand().execute("Kept")
+        await AddGameCommand().execute("Dropped")
+    await NicknameGameCommand().execute("Kept", "The", "Big", "One")
+    await SetPrimaryGameCommand().execute("Kept")
+    await UpdatePlayerCommand().execute("Kept", "ermor", "alice")
+    await RemoveGameCommand().execute("Dropped")
+
+    assert [game.name for game in read_model.active_games()] == ["Kept"]
+    view = read_model.primary_game()
+    assert view is not None
+    assert view.nickname == "The Big One"
+    assert [player.player_name for player in view.players] == ["alice"]
+    assert await read_model.check_consistency() == []
+
+
+@pytest.mark.usefixtures("_db")
+async def test_poller_writes_through() -> None:
+    game = await Game.create(name="Polled", turn=1)
+    await Player.create(nation=NATION, short_name="Ermor", turn_status="Turn unfinished", game=game)
+    await read_model.load()
+
+    with (
+        patch("src.tasks.update_games.fetch_lobby_details_from_web", new=AsyncMock(return_value=_details("2"))),
+        patch("src.tasks.notifications.client.chat_postMessage", new=AsyncMock()),
+    ):
+        await update_games_wrapper()
+
+    view = read_model.game_by_name("Polled")
+    assert view is not None
+    assert view.turn == 2
+    assert await read_model.check_consistency() == []
+
+    with patch(
+        "src.tasks.update_games.fetch_lobby_details_from_web",
+        new=AsyncMock(return_value=_details("2", time_left="finished")),
+    ):
+        await update_games_wrapper()
+
+    assert read_model.game_by_name("Polled") is None
+    assert await read_model.check_consistency() == []
+
+
+@pytest.mark.usefixtures("_db")
+async def test_read_only_commands_do_not_query() -> None:
+    game = await Game.create(name="Primary", turn=7, time_left="2 days left", primary_game=True)
+    await Player.create(nation=NATION, short_name="Ermor", turn_status="Turn played", game=game)
+    await read_model.load()
+
+    with _no_queries():
+        listing = str(await ListGamesCommand().execute())
+        card = await turn_command_wrapper()
+
+    assert "Primary" in listing
+    assert "Turn 7" in str(card)
+    assert "Ermor" in str(card)
+
+
+@pytest.mark.usefixtures("_db")
+async def test_rendered_responses_are_reused_until_the_state_changes() -> None:
+    game = await Game.create(name="Cached", turn=3, time_left="1 day left", primary_game=True)
+    await Player.create(nation=NATION, short_name="Ermor", turn_status="Turn unfinished", game=game)
+    await read_model.load()
+
+    listing, card = await ListGamesCommand().execute(), await turn_command_wrapper()
+    with patch("src.tasks.update_games.fetch_lobby_details_from_web", new=AsyncMock(return_value=_details("3"))):
+        await update_games_wrapper()
+
+    with _no_queries():
+        assert (await ListGamesCommand().execute())[2] is listing[2], "a poll that changed nothing keeps the render"
+        assert (await turn_command_wrapper())[0] is card[0]
+
+    with patch(
+        "src.tasks.update_games.fetch_lobby_details_from_web",
+        new=AsyncMock(return_value=_details("3", status="Turn played")),
+    ):
+        await update_games_wrapper()
+    await NicknameGameCommand().execute("Cached", "Renamed")
+
+    assert "Renamed" in str(await ListGamesCommand().execute())
+    assert "Turn played" not in str(card)
+    assert str(await turn_command_wrapper()) != str(card)
+
+
+@pytest.mark.usefixtures("_db")
+async def test_a_render_during_a_refresh_is_not_cached_as_the_new_state() -> None:
+    game = await Game.create(name="Slow", nickname="Old", turn=3)
+    await read_model.load()
+
+    player_query = Player.filter
+    queried, release = Event(), Event()
+
+    async def held_player_query(game_id: UUID) -> list[Player]:
+        queried.set()
+        await release.wait()
+        return await player_query(game_id=game_id)
+
+    with patch.object(Player, "filter", new=held_player_query):
+        refresh = create_task(NicknameGameCommand().execute("Slow", "New"))
+        await queried.wait()
+        # another command worker renders while the refresh waits on its query
+        assert "New" not in str(await ListGamesCommand().execute())
+        release.set()
+        await refresh
+
+    view = read_model.game_by_name(game.name)
+    assert view is not None
+    assert view.nickname == "New"
+    assert "New" in str(await ListGamesCommand().execute())
+
+
+@pytest.mark.usefixtures("_db")
+async def test_consistency_check_reports_drift() -> None:
+    game = await Game.create(name="Drifting", turn=1)
+    await Player.create(nation=NATION, short_name="Ermor", turn_status="Turn unfinished", game=game)
+    await read_model.load()
+    assert await read_model.check_consistency() == []
+
+    # writes that bypass the model, as another process would make
+    await Game.filter(id=game.id).update(turn=2)
+    await Player.filter(game=game).update(turn_status="Turn played")
+    extra = await Game.create(name="Elsewhere", turn=1)
+
+    problems = await read_model.check_consistency()
+    assert any("turn is 1, db has 2" in problem for problem in problems)
+    assert any(f"player {NATION} differs" in problem for problem in problems)
+    assert f"game {extra.id} missing from read model" in problems
@@ -0,0 +1,124 @@
+"""
+Extraction of the illwinter status table: the first row's text, then (nation, status) from each later row.
+"""
+
+from html.parser import HTMLParser
+
+import bs4
+from bs4 import BeautifulSoup
+
+# (first row text, [(nation, turn status), ...])
+StatusTable = tuple[str, list[tuple[str, str]]]
+
+# never pushed on the open-tag stack, mirroring how BeautifulSoup's html.parser builder treats them
+VOID_TAGS = frozenset(
+    {
+        "area", "base", "basefont", "bgsound", "br", "col", "command", "embed", "frame", "hr", "image",
+        "img", "input", "isindex", "keygen", "link", "menuitem", "meta", "nextid", "param", "source",
+        "spacer", "track", "wbr",
+    }
+)  # fmt: skip
+
+
+class UnexpectedLayoutError(ValueError):
+    """The page has structure the streaming extractor doesn't model; the BeautifulSoup path should handle it."""
+
+
+class _StatusTableParser(HTMLParser):
+    """
+    Single pass over the page, keeping only the text the status table needs — no DOM is built.
+    Nested rows or cells and scripts inside rows raise UnexpectedLayoutError rather than guess.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self._open: list[str] = []
+        self._first_row: list[str] | None = None
+        self._in_first_row = False
+        self._cells: list[list[str]] | None = None
+        self._cell: list[str] | None = None
+        self.rows: list[tuple[str, str]] = []
+
+    @property
+    def first_row(self) -> str | None:
+        return None if self._first_row is None else "".join(self._first_row)
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:  # noqa: ARG002
+        if tag in VOID_TAGS:
+            return
+        if tag in {"tr", "table", "script", "style"} and "tr" in self._open:
+            raise UnexpectedLayoutError(f"<{tag}> inside a table row")
+        if tag == "td" and "td" in self._open:
+            raise UnexpectedLayoutError("<td> inside a table cell")
+
+        self._open.append(tag)
+        if tag == "tr":
+            if self._first_row is None:
+                self._first_row, self._in_first_row = [], True
+            else:
+                self._cells = []
+        elif tag == "td" and self._cells is not None:
+            self._cell = []
+            self._cells.append(self._cell)
+
+    def handle_endtag(self, tag: str) -> None:
+        # like BeautifulSoup: close everything up to the matching open tag, ignore strays
+        if tag not in self._open:
+            return
+        while self._open:
+            closed = self._open.pop()
+            self._close(closed)
+            if closed == tag:
+                break
+
+    def _close(self, tag: str) -> None:
+        if tag == "td":
+            self._cell = None
+        elif tag == "tr":
+            if self._in_first_row:
+                self._in_first_row = False
+            elif self._cells is not None:
+                if len(self._cells) >= 2:
+                    self.rows.append(("".join(self._cells[0]).strip(), "".join(self._cells[1]).strip()))
+                self._cells = None
+
+    def handle_data(self, data: str) -> None:
+        if self._in_first_row and self._first_row is not None:
+            self._first_row.append(data)
+        elif self._cell is not None:
+            self._cell.append(data)
+
+    def close(self) -> None:
+        super().close()
+        # an unterminated page still yields its last row, as it does when BeautifulSoup closes the tree
+        while self._open:
+            self._close(self._open.pop())
+
+
+def extract_status_table(html_content: str) -> StatusTable | None:
+    """Streaming extraction. Returns None when the page has no table row at all."""
+    parser = _StatusTableParser()
+    parser.feed(html_content)
+    parser.close()
+
+    first_row = parser.first_row
+    if first_row is None:
+        return None
+    return first_row, parser.rows
+
+
+def extract_status_table_with_soup(html_content: str) -> StatusTable | None:
+    """The BeautifulSoup reading of the same table — the fallback for layouts the streaming parser rejects."""
+    soup = BeautifulSoup(html_content, "html.parser")
+    first_row = soup.find("tr")
+
+    if not isinstance(first_row, bs4.Tag):
+        return None
+
+    rows = []
+    for row in soup.find_all("tr")[1:]:
+        columns = row.find_all("td")
+        if len(columns) >= 2:
+            rows.append((columns[0].text.strip(), columns[1].text.strip()))
+
+    return first_row.text, rows
@@ -0,0 +1,73 @@
+import pytest
+
+from src.controllers.lobby_details import parse_lobby_details
+from src.controllers.status_page import (
+    UnexpectedLayoutError,
+    extract_status_table,
+    extract_status_table_with_soup,
+)
+
+ILLWINTER_PAGE = """<!DOCTYPE html>
+<html><head><title>Dominions 6 Game Status</title>
+<style>td { padding: 2px }</style></head>
+<body>
+<table class="basictab">
+<tr><td class="blackbolc" colspan="2">Grogfest, turn 14 (1 day and 3 hours left)</td></tr>
+<tr><td class="whiteleft">Arcoscephale, Golden Era</td><td class="whiteleft">Turn played</td></tr>
+<tr><td class="whiteleft">Ermor, New Faith</td><td class="whiteleft">Turn unfinished</td></tr>
+<tr><td class="whiteleft">T'ien Ch'i, Spring and Autumn</td><td class="whiteleft">-</td></tr>
+<tr><td class="whiteleft">Lanka, Land of Demons</td><td class="whiteleft">Eliminated</td></tr>
+</table>
+<!-- <tr><td>Commented</td><td>out</td></tr> -->
+</body></html>
+"""
+
+PARITY_PAGES = [
+    pytest.param(ILLWINTER_PAGE, id="illwinter"),
+    pytest.param(
+        "<html><body><tr>Server Info, Turn 2 (2 days left)</tr>"
+        "<tr><td>Player1</td><td>Turn played</td></tr></body></html>",
+        id="rows-without-table",
+    ),
+    pytest.param("<tr><td>Ermor &amp; Co &#233;</td><td><b>Turn</b> played</td><td>extra</td></tr>", id="entities"),
+    pytest.param("<tr><th>head</th></tr><tr><td>only one cell</td></tr><tr><td>a</td><td>b</td>", id="unclosed"),
+    pytest.param("<TR><TD>Upper</TD></TR><TR><TD>Nation<br>Name</TD><TD>Turn played</TD></TR>", id="uppercase"),
+    pytest.param("<tr><td>x</td></tr></td></tr><tr><td>a</td><td>b</td></tr>", id="stray-end-tags"),
+    pytest.param("<html><body><p>lobby is not started yet</p></body></html>", id="no-table"),
+]
+
+
+@pytest.mark.parametrize("html", PARITY_PAGES)
+def test_streaming_extractor_matches_beautifulsoup(html: str) -> None:
+    assert extract_status_table(html) == extract_status_table_with_soup(html)
+
+
+def test_illwinter_page() -> None:
+    table = extract_status_table(ILLWINTER_PAGE)
+
+    assert table is not None
+    first_row, rows = table
+    assert first_row == "Grogfest, turn 14 (1 day and 3 hours left)"
+    assert rows[0] == ("Arcoscephale, Golden Era", "Turn played")
+    assert len(rows) == 4, "the commented-out row must not be picked up"
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        "<tr><td>Ermor<td>Turn played</tr>",
+        "<tr><td>outer<table><tr><td>inner</td><td>x</td></tr></table></td></tr>",
+        "<tr><td>a<script>var x = 1</script></td><td>b</td></tr>",
+    ],
+)
+def test_unexpected_layouts_fall_back_to_beautifulsoup(html: str) -> None:
+    header = "<tr>Game, turn 3 (1 hour left)</tr>"
+    with pytest.raises(UnexpectedLayoutError):
+        extract_status_table(header + html)
+
+    details = parse_lobby_details(header + html, "game")
+    _, rows = extract_status_table_with_soup(header + html) or ("", [])
+
+    assert details is not None
+    assert details.turn == "3"
+    assert [(player.name, player.turn_status) for player in details.player_status] == rows
@@ -2,9 +2,10 @@
 Handlers package for interactive components
 """
 
-from .interactions import handle_refresh_game_status, handle_set_primary_game
+from .interactions import handle_game_list_page, handle_refresh_game_status, handle_set_primary_game
 
 __all__ = [
+    "handle_game_list_page",
     "handle_refresh_game_status",
     "handle_set_primary_game",
 ]
@@ -3,13 +3,25 @@ Handlers for Slack interactive components (buttons)
 """
 
 from collections.abc import Awaitable, Callable
-from json import loads
-from typing import Any
+from dataclasses import replace
+from typing import Any, cast
 
 from loguru import logger
 
-from src.commands.command_factory import CommandFactory
-from src.controllers.lobby_details import get_lobby_details
+from src.commands.game_commands import ListGamesCommand
+from src.commands.registry import registry
+from src.controllers.formatting import create_context_block, create_error_block
+from src.controllers.lobby_details import (
+    LIVE_SOURCE,
+    UNREACHABLE_NOTE,
+    fetch_lobby_details_last_known,
+    fetch_lobby_details_live,
+    render_lobby_card,
+)
+from src.models.app.lobby_details import LobbyDetails
+
+# this footer stays up when the live scrape shows nothing new, so it must read true after the check too
+REFRESHING_NOTE = ":arrows_counterclockwise: Last known state · replaced if the Dominions server shows any change"
 
 
 async def handle_refresh_game_status(
@@ -18,14 +30,57 @@ async def handle_refresh_game_status(
     """
     Handle the refresh game status button click.
     Overwrites the existing card rather than posting a new one, so repeated clicks don't spam the channel.
+    The last known state goes up straight away; the live scrape replaces it only if it shows something new.
     """
     await ack()
 
     game_name = body["actions"][0]["value"]
     logger.info(f"Refreshing game status for: {game_name}")
+    text = f"Status for {game_name}"
+
+    stale: LobbyDetails | None = None
+    stale_card: list[dict[str, Any]] | None = None
+    try:
+        if (stale := await fetch_lobby_details_last_known(game_name)) is not None:
+            stale_card = render_lobby_card(stale, game_name)
+            await respond(
+                blocks=[*stale_card, *create_context_block(REFRESHING_NOTE)], text=text, replace_original=True
+            )
+    except Exception:
+        # the stale card is a nicety; the live scrape below still answers the click
+        logger.exception(f"Could not show last known state for '{game_name}'")
+
+    try:
+        fresh = await fetch_lobby_details_live(game_name)
+    except Exception:
+        logger.exception(f"Error refreshing game '{game_name}'")
+        fresh = None
+
+    if fresh is None:
+        if stale_card is not None:
+            blocks = [*stale_card, *create_context_block(UNREACHABLE_NOTE)]
+        else:
+            blocks = create_error_block(
+                f"Could not load status for '{game_name}'",
+                "The Dominions server may be unreachable. Try again in a moment.",
+            )
+        await respond(blocks=blocks, text=text, replace_original=True)
+        return
 
-    blocks = await get_lobby_details(game_name, use_db=False)
-    await respond(blocks=blocks, text=f"Status for {game_name}", replace_original=True)
+    if stale is not None and _roster_order_card(fresh, game_name) == _roster_order_card(stale, game_name):
+        logger.debug(f"'{game_name}' unchanged since last known state; leaving the card as is")
+        return
+    blocks = [*render_lobby_card(fresh, game_name), *create_context_block(LIVE_SOURCE)]
+    await respond(blocks=blocks, text=text, replace_original=True)
+
+
+def _roster_order_card(lobby_details: LobbyDetails, game_name: str) -> list[dict[str, Any]]:
+    """
+    The card with its nations sorted, for comparing two states of a game: the db keeps players in insertion order,
+    the status page in its own, and the same roster must compare equal either way.
+    """
+    roster = sorted(lobby_details.player_status, key=lambda player: player.short_name.casefold())
+    return render_lobby_card(replace(lobby_details, player_status=roster), game_name)
 
 
 async def handle_set_primary_game(ack: Callable[[], Awaitable[None]], body: dict[str, Any], respond: Callable) -> None:
@@ -38,8 +93,18 @@ async def handle_set_primary_game(ack: Callable[[], Awaitable[None]], body: dict
     game_name = body["actions"][0]["value"]
     logger.info(f"Setting primary game to: {game_name}")
 
-    command_obj = CommandFactory.get_command("game primary")
-    result = await command_obj.execute(game_name)
-    blocks = loads(result) if isinstance(result, str) else result
+    blocks = await registry.get("game primary").command.execute(game_name)
 
     await respond(blocks=blocks, text=f"Primary game set to {game_name}", replace_original=False)
+
+
+async def handle_game_list_page(ack: Callable[[], Awaitable[None]], body: dict[str, Any], respond: Callable) -> None:
+    """Handle the Next/Previous buttons on `/dom game list`: the page replaces the one the button was on."""
+    await ack()
+
+    cursor = body["actions"][0]["value"]
+    # the instance /dom game list routes to, so both page through the same cached renders
+    command = cast(ListGamesCommand, registry.get("game list").command)
+    blocks = await command.page(cursor)
+
+    await respond(blocks=blocks, text="Active games", replace_original=True)
@@ -0,0 +1,122 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from tortoise import Tortoise
+
+from src.commands.registry import registry
+from src.controllers.lobby_details import scrape_cache
+from src.handlers.interactions import (
+    REFRESHING_NOTE,
+    UNREACHABLE_NOTE,
+    handle_game_list_page,
+    handle_refresh_game_status,
+)
+from src.models.app.lobby_details import LobbyDetails
+from src.models.app.player_status import PlayerStatus
+from src.models.db import Game, Player
+
+NATION = "Ermor, Ashen Empire"
+
+
+@pytest.fixture
+async def _db():  # noqa: ANN202
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["src.models.db"]})
+    await Tortoise.generate_schemas()
+    scrape_cache.clear()
+    yield
+    await Tortoise.close_connections()
+
+
+@pytest.fixture
+async def tracked_game() -> Game:
+    game = await Game.create(name="MyGame", turn=3, time_left="1 day left")
+    await Player.create(nation=NATION, short_name="Ermor", turn_status="Turn unfinished", player_name="Nick", game=game)
+    return game
+
+
+def _scraped(turn_status: str, turn: str = "3") -> LobbyDetails:
+    return LobbyDetails(
+        server_info=f"mygame, turn {turn} (1 day left)",
+        player_status=[PlayerStatus(name=NATION, turn_status=turn_status)],
+        turn=turn,
+        time_left="1 day left",
+    )
+
+
+async def _click(scraped: LobbyDetails | None) -> AsyncMock:
+    respond = AsyncMock()
+    body = {"actions": [{"value": "MyGame"}]}
+    with patch("src.controllers.lobby_details.fetch_lobby_details_from_web", new=AsyncMock(return_value=scraped)):
+        await handle_refresh_game_status(AsyncMock(), body, respond)
+    return respond
+
+
+@pytest.mark.usefixtures("_db", "tracked_game")
+async def test_last_known_state_goes_up_first_then_the_live_one() -> None:
+    respond = await _click(_scraped("Turn played"))
+
+    assert respond.await_count == 2
+    first, second = (call.kwargs["blocks"] for call in respond.await_args_list)
+    assert REFRESHING_NOTE in str(first)
+    assert ":question:" in str(first)
+    assert ":white_check_mark:" in str(second)
+    assert "Nick" in str(second), "nicknames survive the live refresh"
+    assert all(call.kwargs["replace_original"] for call in respond.await_args_list)
+
+
+@pytest.mark.usefixtures("_db", "tracked_game")
+async def test_unchanged_game_skips_the_second_update() -> None:
+    respond = await _click(_scraped("Turn unfinished"))
+
+    respond.assert_awaited_once()
+    assert respond.await_args is not None
+    # the card is left as is, so its footer must not claim a check is still running
+    assert respond.await_args.kwargs["blocks"][-1]["elements"][0]["text"] == (
+        ":arrows_counterclockwise: Last known state · replaced if the Dominions server shows any change"
+    )
+
+
+@pytest.mark.usefixtures("_db")
+async def test_unchanged_game_listed_in_another_order_skips_the_second_update() -> None:
+    game = await Game.create(name="MyGame", turn=3, time_left="1 day left")
+    for nation in (NATION, "Ulm, Forges of Steel", "Agartha, Pale Ones"):
+        await Player.create(nation=nation, short_name=nation.split(",")[0], turn_status="Turn unfinished", game=game)
+    # the status page lists the nations in the reverse of whatever order the db returns them in
+    tracked = await Player.filter(game=game).values_list("nation", flat=True)
+    scraped = _scraped("Turn unfinished")
+    scraped.player_status = [PlayerStatus(name=str(nation), turn_status="Turn unfinished") for nation in tracked[::-1]]
+
+    respond = await _click(scraped)
+
+    respond.assert_awaited_once()
+    assert REFRESHING_NOTE in str(respond.await_args)
+
+
+@pytest.mark.usefixtures("_db", "tracked_game")
+async def test_unreachable_server_keeps_the_last_known_state() -> None:
+    respond = await _click(None)
+
+    assert respond.await_count == 2
+    assert respond.await_args is not None
+    assert UNREACHABLE_NOTE in str(respond.await_args.kwargs["blocks"])
+    assert "Ermor" in str(respond.await_args.kwargs["blocks"])
+
+
+@pytest.mark.usefixtures("_db")
+async def test_untracked_game_waits_for_the_scrape() -> None:
+    respond = await _click(_scraped("Turn played"))
+
+    respond.assert_awaited_once()
+    assert "Live from the Dominions server" in str(respond.await_args)
+
+
+async def test_game_list_buttons_page_through_the_registered_command() -> None:
+    respond = AsyncMock()
+    page = AsyncMock(return_value=[{"type": "divider"}])
+    body = {"actions": [{"value": "mygame"}]}
+
+    with patch.object(registry.get("game list").command, "page", new=page):
+        await handle_game_list_page(AsyncMock(), body, respond)
+
+    page.assert_awaited_once_with("mygame")
+    respond.assert_awaited_once_with(blocks=[{"type": "divider"}], text="Active games", replace_original=True)
@@ -1,8 +1,9 @@
-from asyncio import gather, run, sleep
+from asyncio import Task, create_task, gather, get_running_loop, run
 from collections.abc import Awaitable, Callable
 from os import getenv
 from random import choice
 from re import compile as re_compile
+from signal import SIGUSR1
 from typing import Any, NoReturn, TypedDict, cast
 
 import pyroscope
@@ -12,14 +13,19 @@ from slack_sdk.errors import SlackApiError
 from slack_sdk.web.async_client import AsyncWebClient
 from uvloop import install as install_uvloop
 
-from src.controllers.command_parser import command_parser_wrapper
-from src.handlers import handle_refresh_game_status, handle_set_primary_game
+from src.controllers.command_parser import command_label, command_parser_wrapper
+from src.controllers.formatting import create_error_block
+from src.controllers.read_model import read_model, report_consistency
+from src.handlers import handle_game_list_page, handle_refresh_game_status, handle_set_primary_game
 from src.responders import grog_response_list, mad_reactions_list
-from src.tasks.update_games import update_games_wrapper
+from src.tasks.loop_monitor import monitor_event_loop
+from src.tasks.notifications import notification_dispatcher
+from src.tasks.scheduler import PollScheduler
+from src.utils import command_pool, executor_manager, host_guard, http_manager, slack_manager
 from src.utils.constants import SLACK_APP_TOKEN
 from src.utils.db_manager import init
 from src.utils.log_manager import setup_logger
-from src.utils.slack_manager import app
+from src.utils.slack_manager import app, queued, send
 
 setup_logger()
 
@@ -43,13 +49,13 @@ class SlackSayResponse(TypedDict, total=False):
 
 
 @app.message(keyword=re_compile(pattern="(?i)grog"))
-async def grog_responder(say: Callable[[SlackSayResponse], Awaitable[Any]]) -> None:
+async def grog_responder(message: dict[str, Any], say: Callable[[SlackSayResponse], Awaitable[Any]]) -> None:
     """
     when the word grog is mentioned in a channel the bot is present it
     will return one of several random responses
     """
     random_grog = choice(seq=grog_response_list)
-    await say(cast(SlackSayResponse, {"text": random_grog}))
+    await queued("chat.postMessage", say, channel=message["channel"])(cast(SlackSayResponse, {"text": random_grog}))
 
 
 @app.message(keyword=re_compile(pattern=r"\bmad\b"))
@@ -60,10 +66,9 @@ async def mad_reactor(message: dict[str, Any], client: AsyncWebClient) -> None:
     random_mad = choice(seq=mad_reactions_list)
 
     try:
-        await client.reactions_add(
-            channel=message["channel"],
-            timestamp=message["ts"],
-            name=random_mad,
+        await send(
+            "reactions.add",
+            lambda: client.reactions_add(channel=message["channel"], timestamp=message["ts"], name=random_mad),
         )
     except SlackApiError as e:
         # already_reacted on a repeat pick, or invalid_name if the workspace lacks the custom emoji
@@ -83,12 +88,19 @@ async def handle_dom_command(
     # ack first: Slack gives us 3 seconds, and parsing can involve a scrape of the dominions server
     await ack()
 
-    blocks, ephemeral = await command_parser_wrapper(command=command["text"])
+    async def execute_command() -> None:
+        blocks, ephemeral = await command_parser_wrapper(command=command["text"])
 
-    if ephemeral:
-        await respond(blocks=blocks, text="Response (see blocks for formatted content)")
-    else:
-        await say(cast(SlackSayResponse, {"blocks": blocks, "text": "Response (see blocks for formatted content)"}))
+        if ephemeral:
+            await queued("response_url", respond)(blocks=blocks, text="Response (see blocks for formatted content)")
+        else:
+            reply = cast(SlackSayResponse, {"blocks": blocks, "text": "Response (see blocks for formatted content)"})
+            await queued("chat.postMessage", say, channel=command["channel_id"])(reply)
+
+    # the listener only queues: workers run the command, so a burst of slow checks can't pile up scrapes
+    if not command_pool.get_pool().submit(command_label(command["text"]), execute_command):
+        busy = create_error_block("The bot is busy", "Too many commands are waiting. Try again in a moment.")
+        await queued("response_url", respond)(blocks=busy, text="The bot is busy, try again in a moment")
 
 
 @app.event(event="message")
@@ -102,7 +114,7 @@ async def handle_message_events() -> None:
 @app.action({"action_id": "refresh_game_status"})
 async def refresh_button_handler(ack: Callable[[], Awaitable[None]], body: dict[str, Any], respond: Callable) -> None:
     """Handle refresh game status button clicks"""
-    await handle_refresh_game_status(ack, body, respond)
+    await handle_refresh_game_status(ack, body, queued("response_url", respond))
 
 
 @app.action({"action_id": "set_primary_game"})
@@ -110,18 +122,28 @@ async def set_primary_button_handler(
     ack: Callable[[], Awaitable[None]], body: dict[str, Any], respond: Callable
 ) -> None:
     """Handle set primary game button clicks"""
-    await handle_set_primary_game(ack, body, respond)
+    await handle_set_primary_game(ack, body, queued("response_url", respond))
+
+
+@app.action(re_compile(pattern="game_list_(previous|next)"))
+async def game_list_page_handler(ack: Callable[[], Awaitable[None]], body: dict[str, Any], respond: Callable) -> None:
+    """Handle Next/Previous clicks on the game list"""
+    await handle_game_list_page(ack, body, queued("response_url", respond))
 
 
 async def periodic_task() -> NoReturn:
-    while True:
-        logger.info("Running task...")
-        try:
-            await update_games_wrapper()
-        except Exception:
-            # never let a DB blip escape into gather() — that would take the slack handler down with it
-            logger.exception("game update cycle failed")
-        await sleep(delay=900)  # wait for 15 mins
+    # each game is polled on its own cadence, tightening as its host deadline approaches
+    await PollScheduler().run()
+
+
+# the loop only keeps weak references to tasks: hold each report until it finishes
+_consistency_reports: set[Task[None]] = set()
+
+
+def start_consistency_report() -> None:
+    task = create_task(report_consistency())
+    _consistency_reports.add(task)
+    task.add_done_callback(_consistency_reports.discard)
 
 
 async def main() -> None:
@@ -129,9 +151,23 @@ async def main() -> None:
     main method to encapsulate the app
     """
     await init()
+    await read_model.load()
+    # `kill -USR1 <pid>` compares the read model against the database and logs any drift
+    get_running_loop().add_signal_handler(SIGUSR1, start_consistency_report)
+    await http_manager.init()
+    await executor_manager.init()
+    await slack_manager.init()
+    await command_pool.init()
     handler = AsyncSocketModeHandler(app=app, app_token=SLACK_APP_TOKEN)
-    # Run both the handler and periodic task concurrently
-    await gather(handler.start_async(), periodic_task())
+    try:
+        # Run the handler, the poller, the notification outbox and the loop monitor concurrently
+        await gather(handler.start_async(), periodic_task(), notification_dispatcher.run(), monitor_event_loop())
+    finally:
+        await command_pool.close()
+        await slack_manager.close()
+        await host_guard.close()
+        await executor_manager.close()
+        await http_manager.close()
 
 
 # Start your app
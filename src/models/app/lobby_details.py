@@ -1,11 +1,17 @@
-from pydantic.main import BaseModel
+from dataclasses import dataclass, replace
+from typing import Self
 
 from .player_status import PlayerStatus
 
 
-class LobbyDetails(BaseModel):
+@dataclass(slots=True)
+class LobbyDetails:
     server_info: str
     player_status: list[PlayerStatus]
     turn: str
     time_left: str | None = None
     is_primary: bool = False
+
+    def copy(self) -> Self:
+        """A copy whose players can be annotated (nicknames, the primary flag) without touching this one."""
+        return replace(self, player_status=[replace(player) for player in self.player_status])
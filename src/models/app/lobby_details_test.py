@@ -0,0 +1,27 @@
+from src.models.app.lobby_details import LobbyDetails
+from src.models.app.player_status import PlayerStatus
+
+
+def test_short_name_is_worked_out_once_and_strings_are_shared() -> None:
+    scraped = PlayerStatus(name="".join(["Ermor, ", "Ashen Empire"]), turn_status="".join(["Turn ", "played"]))
+    stored = PlayerStatus(name="Ermor", turn_status="Turn played", short_name="Ermor")
+
+    assert scraped.short_name == "Ermor"
+    assert scraped.short_name is stored.short_name
+    assert scraped.turn_status is stored.turn_status
+
+
+def test_copy_can_be_annotated_without_touching_the_original() -> None:
+    original = LobbyDetails(
+        server_info="game, turn 3",
+        player_status=[PlayerStatus(name="Ermor, Ashen Empire", turn_status="Turn played")],
+        turn="3",
+    )
+
+    copy = original.copy()
+    copy.is_primary = True
+    copy.player_status[0].nickname = "@john"
+
+    assert original.is_primary is False
+    assert original.player_status[0].nickname is None
+    assert copy.player_status[0].short_name == "Ermor"
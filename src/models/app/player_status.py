@@ -1,8 +1,23 @@
-from pydantic.main import BaseModel
+from dataclasses import dataclass
+from sys import intern
 
 
-class PlayerStatus(BaseModel):
+@dataclass(slots=True)
+class PlayerStatus:
+    """
+    One nation's row on a status card. Built for every nation on every scrape and cached read, so it is a plain
+    slotted dataclass: the strings come from our own parser or the db, and there is nothing to validate.
+    """
+
     name: str
     turn_status: str
     turn_emoji: str | None = None
     nickname: str | None = None
+    # "Ermor" for "Ermor, Ashen Empire"; worked out once here rather than by every renderer
+    short_name: str = ""
+
+    def __post_init__(self) -> None:
+        # a handful of statuses and a few dozen nations repeat across every game and poll: keep one copy of each
+        self.name = intern(self.name)
+        self.turn_status = intern(self.turn_status)
+        self.short_name = intern(self.short_name or self.name.split(",")[0].strip())
@@ -1,2 +1,3 @@
 from .games import Game  # noqa: F401
+from .notifications import Notification, NotificationKind  # noqa: F401
 from .players import Player  # noqa: F401
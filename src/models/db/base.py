@@ -1,8 +1,10 @@
 from tortoise import Model, fields
+from tortoise.contrib.mysql.fields import UUIDField
 
 
 class BaseModel(Model):
-    id = fields.UUIDField(primary_key=True)
+    # 16 raw bytes rather than CHAR(36): smaller rows, and smaller player.game_id and every index holding it
+    id = UUIDField(primary_key=True)
 
     created_at = fields.DatetimeField(auto_now_add=True)
     updated_at = fields.DatetimeField(auto_now=True)
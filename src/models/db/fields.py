@@ -0,0 +1,47 @@
+from tortoise import Model, fields
+
+# stored as the index into this tuple, so only ever append; code 0 catches statuses the server adds later
+TURN_STATUSES = ("Unknown", "Turn unfinished", "Turn played", "-", "Eliminated", "AI")
+_TURN_STATUS_CODES = {status: code for code, status in enumerate(TURN_STATUSES)}
+
+
+def canonical_turn_status(status: str) -> str:
+    """The status as it reads back from the db — unrecognised statuses collapse to "Unknown"."""
+    return status if status in _TURN_STATUS_CODES else TURN_STATUSES[0]
+
+
+class CaseInsensitiveCharField(fields.CharField):
+    """
+    VARCHAR whose `=` compares case-insensitively inside the database, so such lookups can use an index
+    (`__iexact` wraps the column in UPPER(), which no index serves). MySQL's utf8mb4 default collations are
+    already case-insensitive; sqlite needs NOCASE spelled out.
+    """
+
+    class _db_sqlite:  # noqa: N801
+        def __init__(self, field: fields.CharField) -> None:
+            self.field = field
+
+        @property
+        def SQL_TYPE(self) -> str:  # noqa: N802
+            return f"VARCHAR({self.field.max_length}) COLLATE NOCASE"
+
+
+class TurnStatusField(fields.Field[str], str):
+    """A turn status string stored as a one-byte code; see TURN_STATUSES."""
+
+    SQL_TYPE = "SMALLINT"
+
+    class _db_mysql:  # noqa: N801
+        SQL_TYPE = "TINYINT UNSIGNED"
+
+    def to_db_value(self, value: object, instance: type[Model] | Model) -> int | None:  # noqa: ARG002
+        if value is None or isinstance(value, int):
+            return value
+        return _TURN_STATUS_CODES.get(str(value), 0)
+
+    def to_python_value(self, value: object) -> str | None:
+        if value is None:
+            return None
+        if isinstance(value, int):
+            return TURN_STATUSES[value] if 0 <= value < len(TURN_STATUSES) else TURN_STATUSES[0]
+        return str(value)
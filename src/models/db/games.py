@@ -1,12 +1,24 @@
-from tortoise import fields
+from tortoise import Model, fields
+from tortoise.indexes import Index
 
 from src.models.db.base import BaseModel
 
 
 class Game(BaseModel):
-    name = fields.TextField()
+    name = fields.CharField(max_length=255)
     primary_game = fields.BooleanField(default=False)
     nickname = fields.TextField(default="")
     active = fields.BooleanField(default=True)
     turn = fields.IntField(default=0)
     time_left = fields.TextField(null=True)
+    # the live status message kept up to date when STATUS_MESSAGE_MODE edits in place, and the turn it was posted for
+    status_ts = fields.CharField(max_length=32, null=True)
+    status_channel = fields.CharField(max_length=80, null=True)
+    status_turn = fields.IntField(null=True)
+
+    class Meta(Model.Meta):  # ty: ignore[invalid-attribute-override]
+        indexes = (
+            # lookups by name take the newest row: names aren't unique once a game is removed and re-added
+            Index(fields=("name", "created_at"), name="idx_game_name_created"),
+            Index(fields=("active", "primary_game"), name="idx_game_active_primary"),
+        )
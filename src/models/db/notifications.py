@@ -0,0 +1,36 @@
+from enum import StrEnum
+
+from tortoise import Model, fields
+from tortoise.fields import ForeignKeyRelation
+from tortoise.indexes import Index
+
+from src.models.db.base import BaseModel
+from src.models.db.games import Game
+
+
+class NotificationKind(StrEnum):
+    TURN = "turn"  # a new turn to announce
+    STATUS_EDIT = "status edit"  # player statuses changed within a turn; refresh the game's live message
+
+
+class Notification(BaseModel):
+    """A message waiting in the outbox; a turn notification is written in the same transaction as its turn."""
+
+    game: ForeignKeyRelation[Game] = fields.ForeignKeyField("models.Game", related_name="notifications")
+    kind = fields.CharEnumField(NotificationKind, max_length=16, default=NotificationKind.TURN)
+    # the turn announced, or for a status edit the turn the statuses belong to
+    turn = fields.IntField()
+    channel = fields.CharField(max_length=80)
+    attempts = fields.IntField(default=0)
+    next_attempt_at = fields.DatetimeField()
+    sent_at = fields.DatetimeField(null=True)
+    last_error = fields.TextField(null=True)
+
+    class Meta(Model.Meta):  # ty: ignore[invalid-attribute-override]
+        # the dispatcher's only query: unsent rows, soonest first
+        indexes = (Index(fields=("sent_at", "next_attempt_at"), name="idx_notification_pending"),)
+
+    @property
+    def label(self) -> str:
+        """What the row delivers, for logs: "turn 5 notification" or "turn 5 status edit"."""
+        return f"turn {self.turn} {'status edit' if self.kind == NotificationKind.STATUS_EDIT else 'notification'}"
@@ -1,16 +1,24 @@
-from tortoise import fields
+from tortoise import Model, fields
 from tortoise.fields import ForeignKeyRelation
+from tortoise.indexes import Index
 
 from src.models.db.base import BaseModel
+from src.models.db.fields import CaseInsensitiveCharField, TurnStatusField
 from src.models.db.games import Game
 
 
 class Player(BaseModel):
-    nation = fields.TextField(null=False)
-    short_name = fields.TextField(null=False)
+    nation = fields.CharField(max_length=128, null=False)
+    short_name = CaseInsensitiveCharField(max_length=64, null=False)
     player_name = fields.TextField(null=True)
-    turn_status = fields.TextField(default="Turn unfinished")
+    turn_status = TurnStatusField(default="Turn unfinished")
     game: ForeignKeyRelation[Game] = fields.ForeignKeyField("models.Game", related_name="players")
 
+    class Meta(Model.Meta):  # ty: ignore[invalid-attribute-override]
+        indexes = (
+            Index(fields=("game_id", "nation"), name="idx_player_game_nation"),
+            Index(fields=("game_id", "short_name"), name="idx_player_game_short_name"),
+        )
+
     def __str__(self) -> str:
         return self.nation.split(sep=",")[0]
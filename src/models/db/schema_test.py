@@ -0,0 +1,100 @@
+from uuid import uuid4
+
+import pytest
+from tortoise import Tortoise
+from tortoise.queryset import QuerySet
+
+from src.models.db import Game, Player
+from src.models.db.fields import TURN_STATUSES
+
+
+@pytest.fixture
+async def _db():  # noqa: ANN202
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["src.models.db"]})
+    await Tortoise.generate_schemas()
+    yield
+    await Tortoise.close_connections()
+
+
+async def _seed() -> None:
+    """Enough rows for sqlite's planner statistics to look like a real deployment: many games, few of them active."""
+    games = [Game(name=f"game-{n}", active=n % 10 == 0, turn=n) for n in range(200)]
+    await Game.bulk_create(games)
+    await Player.bulk_create(
+        Player(nation=f"Nation {n}, Era", short_name=f"Nation {n}", game_id=game.id)
+        for game in games
+        for n in range(20)
+    )
+    await Tortoise.get_connection("default").execute_script("ANALYZE")
+
+
+async def _plan(queryset: QuerySet) -> str:
+    # parameterized: ids are binary and don't inline into SQL text
+    sql, params = queryset.sql(), queryset.query.get_parameterized_sql()[1]
+    _, rows = await Tortoise.get_connection("default").execute_query(f"EXPLAIN QUERY PLAN {sql}", params)
+    return " | ".join(row["detail"] for row in rows)
+
+
+GAME_ID = uuid4()
+
+
+@pytest.mark.usefixtures("_db")
+@pytest.mark.parametrize(
+    ("query", "index"),
+    [
+        pytest.param(
+            lambda: Game.filter(name="g").order_by("-created_at").first(), "idx_game_name_created", id="game-by-name"
+        ),
+        pytest.param(lambda: Game.filter(name="g", active=True).first(), "idx_game_name_created", id="active-by-name"),
+        pytest.param(lambda: Game.filter(active=True), "idx_game_active_primary", id="active-games"),
+        pytest.param(
+            lambda: Game.filter(active=True, primary_game=True).first(), "idx_game_active_primary", id="primary-game"
+        ),
+        pytest.param(lambda: Player.filter(game_id=GAME_ID), "idx_player_game_", id="roster"),
+        pytest.param(
+            lambda: Player.filter(game_id=GAME_ID, nation="Ermor, Ashen Empire"),
+            "idx_player_game_nation",
+            id="player-by-nation",
+        ),
+        pytest.param(
+            lambda: Player.filter(game_id=GAME_ID, short_name="ermor").first(),
+            "idx_player_game_short_name",
+            id="player-by-short-name",
+        ),
+    ],
+)
+async def test_hot_queries_use_an_index(query, index: str) -> None:  # noqa: ANN001
+    await _seed()
+    plan = await _plan(query())
+
+    assert f"USING INDEX {index}" in plan or f"USING COVERING INDEX {index}" in plan, plan
+    assert "SCAN" not in plan, plan
+    assert "TEMP B-TREE" not in plan, f"sort not served by the index: {plan}"
+
+
+@pytest.mark.usefixtures("_db")
+async def test_short_name_matches_any_casing() -> None:
+    game = await Game.create(name="g")
+    await Player.create(nation="Ermor, Ashen Empire", short_name="Ermor", game=game)
+
+    assert await Player.filter(game=game, short_name="eRMOR").exists()
+
+
+@pytest.mark.usefixtures("_db")
+async def test_ids_and_statuses_are_stored_compactly_behind_the_same_api() -> None:
+    game = await Game.create(name="g")
+    played = await Player.create(nation="Ermor, Ashen Empire", short_name="Ermor", turn_status="Turn played", game=game)
+    await Player.create(nation="Ulm, Forges", short_name="Ulm", turn_status="Something new", game=game)
+
+    _, rows = await Tortoise.get_connection("default").execute_query(
+        "SELECT id, game_id, turn_status FROM player WHERE short_name = ?", ["Ermor"]
+    )
+    assert rows[0]["id"] == played.id.bytes
+    assert rows[0]["game_id"] == game.id.bytes
+    assert rows[0]["turn_status"] == TURN_STATUSES.index("Turn played")
+
+    player = await Player.get(id=played.id).prefetch_related("game")
+    assert player.turn_status == "Turn played"
+    assert player.game.id == game.id
+    assert await Player.filter(game=game, turn_status="Turn played").count() == 1
+    assert await Player.get(short_name="ulm").values_list("turn_status", flat=True) == "Unknown"
@@ -0,0 +1,33 @@
+from asyncio import sleep
+from time import monotonic
+from typing import NoReturn
+
+from loguru import logger
+
+from src.utils import metrics
+
+SAMPLE_SECONDS = 0.5
+# a Slack ack has 3 seconds; warn well before blocking gets anywhere near that
+WARN_LAG_SECONDS = 0.1
+REPORT_SECONDS = 300
+
+
+async def sample_loop_lag(interval: float = SAMPLE_SECONDS) -> float:
+    """How late the loop woke us from a sleep of `interval` — the same delay every Slack handler sees."""
+    started = monotonic()
+    await sleep(interval)
+    return max(monotonic() - started - interval, 0.0)
+
+
+async def monitor_event_loop() -> NoReturn:
+    """Record event loop lag continuously and log every timing metric every REPORT_SECONDS."""
+    last_report = monotonic()
+    while True:
+        lag = await sample_loop_lag()
+        metrics.record("event_loop.lag", lag)
+        if lag > WARN_LAG_SECONDS:
+            logger.warning(f"event loop blocked for {lag * 1000:.0f}ms")
+
+        if monotonic() - last_report >= REPORT_SECONDS:
+            logger.info(f"metrics over the last {REPORT_SECONDS}s: {metrics.summary(reset=True)}")
+            last_report = monotonic()
@@ -0,0 +1,173 @@
+"""
+Delivers turn notifications, and status message edits, from the outbox.
+
+The poller only records a Notification row, in the same transaction as the turn it announces, so a poll cycle never
+waits on Slack and a notification can't be lost between the two writes. This dispatcher posts due rows, backs off
+exponentially when Slack fails, and on startup picks up whatever was still pending when the process last stopped.
+
+With STATUS_MESSAGE_MODE set to edit or repost, the poller also queues a row when player statuses change, and
+delivery edits the game's live message instead of adding another post to the channel.
+"""
+
+from asyncio import Event, wait_for
+from contextlib import suppress
+from datetime import timedelta
+from typing import NoReturn
+
+from loguru import logger
+from slack_sdk.errors import SlackApiError
+from tortoise.queryset import QuerySet
+from tortoise.timezone import now
+
+from src.controllers.lobby_details import get_lobby_details
+from src.models.db import Game, Notification
+from src.utils.constants import (
+    NOTIFY_MAX_ATTEMPTS,
+    NOTIFY_RETRY_BASE_SECONDS,
+    NOTIFY_RETRY_MAX_SECONDS,
+    STATUS_MESSAGE_MODE,
+)
+from src.utils.slack_manager import Priority, client, send
+
+# a safety net: new rows wake the dispatcher directly, this only bounds how long a missed wake can go unnoticed
+IDLE_SECONDS = 60
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds to wait after the `attempts`-th failure: doubling from the base, capped at the max."""
+    return min(NOTIFY_RETRY_MAX_SECONDS, NOTIFY_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+
+
+# errors meaning the live message is gone or can no longer be edited: post a new one instead
+_STALE_MESSAGE_ERRORS = {"message_not_found", "cant_update_message", "edit_window_closed", "channel_not_found"}
+
+
+def _edits_in_place(game: Game, turn: int) -> bool:
+    match STATUS_MESSAGE_MODE:
+        case "edit":
+            return game.status_ts is not None
+        case "repost":
+            return game.status_ts is not None and game.status_turn == turn
+        case _:
+            return False
+
+
+async def send_turn_update(game: Game, channel: str, turn: int | None = None) -> None:
+    """
+    Post the status of the game this notification is about — not whichever game happens to be primary.
+    When STATUS_MESSAGE_MODE keeps a live message, edit that instead and remember where a new post went.
+    """
+    # a status edit still queued when the next turn arrived describes the game as it is now, i.e. the newer turn
+    turn = game.turn if turn is None else max(turn, game.turn)
+    formatted_response = await get_lobby_details(game.name, use_db=True)
+
+    if _edits_in_place(game, turn):
+        try:
+            await send(
+                "chat.update",
+                lambda: client.chat_update(
+                    channel=game.status_channel,
+                    ts=game.status_ts,
+                    text=f"Turn {turn} in {game.nickname or game.name}",
+                    blocks=formatted_response,
+                ),
+                Priority.BACKGROUND,
+                game.status_channel,
+            )
+        except SlackApiError as e:
+            if e.response.get("error") not in _STALE_MESSAGE_ERRORS:
+                raise
+            logger.info(f"status message for {game.name} can't be edited ({e.response.get('error')}), posting anew")
+        else:
+            if game.status_turn != turn:
+                game.status_turn = turn
+                await Game.filter(id=game.id).update(status_turn=turn)
+            return
+
+    response = await send(
+        "chat.postMessage",
+        lambda: client.chat_postMessage(
+            channel=channel,
+            text=f"New turn in {game.nickname or game.name}",
+            blocks=formatted_response,
+        ),
+        Priority.BACKGROUND,
+        channel,
+    )
+    if STATUS_MESSAGE_MODE != "post":
+        # chat.update wants the channel id, which the post returns even when it was addressed by #name
+        game.status_ts, game.status_channel, game.status_turn = response["ts"], response["channel"], turn
+        await Game.filter(id=game.id).update(
+            status_ts=game.status_ts, status_channel=game.status_channel, status_turn=turn
+        )
+
+
+class NotificationDispatcher:
+    def __init__(self) -> None:
+        self._wake = Event()
+
+    def wake(self) -> None:
+        """Look at the outbox now rather than at the next scheduled retry."""
+        self._wake.set()
+
+    @staticmethod
+    def _pending() -> QuerySet[Notification]:
+        return Notification.filter(sent_at=None, attempts__lt=NOTIFY_MAX_ATTEMPTS)
+
+    async def dispatch_due(self) -> int:
+        """Try every notification that is due. Returns how many were sent."""
+        due = (
+            await self._pending()
+            .filter(next_attempt_at__lte=now())
+            .order_by("next_attempt_at")
+            .prefetch_related("game")
+        )
+        sent = 0
+        for notification in due:
+            sent += await self._deliver(notification)
+        return sent
+
+    async def _deliver(self, notification: Notification) -> bool:
+        game = notification.game
+        try:
+            await send_turn_update(game, notification.channel, notification.turn)
+        except Exception as e:
+            notification.attempts += 1
+            notification.last_error = str(e)
+            notification.next_attempt_at = now() + timedelta(seconds=retry_delay(notification.attempts))
+            await notification.save(update_fields=["attempts", "last_error", "next_attempt_at"])
+            if notification.attempts >= NOTIFY_MAX_ATTEMPTS:
+                logger.error(f"giving up on {notification.label} for {game.name}: {e}")
+            else:
+                logger.warning(
+                    f"{notification.label} for {game.name} failed "
+                    f"(attempt {notification.attempts}), retrying at {notification.next_attempt_at}: {e}"
+                )
+            return False
+
+        notification.sent_at = now()
+        await notification.save(update_fields=["sent_at"])
+        logger.info(f"delivered {notification.label} for {game.name}")
+        return True
+
+    async def seconds_until_next(self) -> float:
+        upcoming = await self._pending().order_by("next_attempt_at").first()
+        if upcoming is None:
+            return IDLE_SECONDS
+        return min(IDLE_SECONDS, max(0.0, (upcoming.next_attempt_at - now()).total_seconds()))
+
+    async def run(self) -> NoReturn:
+        # anything left pending by the last process is simply due on the first pass
+        while True:
+            self._wake.clear()
+            try:
+                await self.dispatch_due()
+                delay = await self.seconds_until_next()
+            except Exception:
+                logger.exception("notification dispatch failed")
+                delay = IDLE_SECONDS
+            with suppress(TimeoutError):
+                await wait_for(self._wake.wait(), timeout=delay)
+
+
+notification_dispatcher = NotificationDispatcher()
@@ -0,0 +1,231 @@
+from asyncio import create_task, sleep
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from slack_sdk.errors import SlackApiError
+from tortoise import Tortoise
+from tortoise.timezone import now
+
+from src.models.app.lobby_details import LobbyDetails
+from src.models.app.player_status import PlayerStatus
+from src.models.db import Game, Notification, NotificationKind, Player
+from src.tasks.notifications import NotificationDispatcher, retry_delay
+from src.tasks.update_games import UpdateOutcome, update_games_wrapper
+from src.utils.constants import NOTIFY_MAX_ATTEMPTS, NOTIFY_RETRY_BASE_SECONDS, NOTIFY_RETRY_MAX_SECONDS
+
+
+@pytest.fixture
+async def _db():  # noqa: ANN202
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["src.models.db"]})
+    await Tortoise.generate_schemas()
+    yield
+    await Tortoise.close_connections()
+
+
+def _details(turn: str, *played: str) -> LobbyDetails:
+    statuses = [PlayerStatus(name=nation, turn_status="Turn played") for nation in played]
+    return LobbyDetails(server_info=f"game, turn {turn}", player_status=statuses, turn=turn, time_left="1 day left")
+
+
+def _slack_error() -> SlackApiError:
+    return SlackApiError("ratelimited", {"ok": False, "error": "ratelimited"})
+
+
+async def _pending(game: Game) -> Notification:
+    return await Notification.get(game=game)
+
+
+def test_retry_delay_doubles_up_to_the_cap() -> None:
+    assert retry_delay(1) == NOTIFY_RETRY_BASE_SECONDS
+    assert retry_delay(2) == 2 * NOTIFY_RETRY_BASE_SECONDS
+    assert retry_delay(50) == NOTIFY_RETRY_MAX_SECONDS
+
+
+@pytest.mark.usefixtures("_db")
+async def test_new_turn_is_recorded_in_the_outbox_without_calling_slack() -> None:
+    game = await Game.create(name="Advancing", turn=1)
+
+    posted = AsyncMock()
+    with (
+        patch("src.tasks.update_games.fetch_lobby_details_from_web", new=AsyncMock(return_value=_details("2"))),
+        patch("src.tasks.notifications.client.chat_postMessage", new=posted),
+    ):
+        report = await update_games_wrapper()
+
+    posted.assert_not_awaited()
+    assert report.results[0].outcome == UpdateOutcome.NEW_TURN
+    notification = await _pending(game)
+    assert (notification.kind, notification.label) == (NotificationKind.TURN, "turn 2 notification")
+    assert notification.sent_at is None
+
+
+@pytest.mark.usefixtures("_db")
+async def test_turn_and_notification_commit_together() -> None:
+    game = await Game.create(name="Atomic", turn=1)
+
+    with (
+        patch("src.tasks.update_games.fetch_lobby_details_from_web", new=AsyncMock(return_value=_details("2"))),
+        patch.object(Notification, "create", side_effect=OSError("disk full")),
+    ):
+        report = await update_games_wrapper()
+
+    assert report.results[0].outcome == UpdateOutcome.ERROR
+    assert (await Game.get(id=game.id)).turn == 1, "a turn nobody will be told about must not be recorded"
+
+
+@pytest.mark.usefixtures("_db")
+async def test_failed_delivery_backs_off_then_retries() -> None:
+    game = await Game.create(name="Flaky", turn=2)
+    await Notification.create(game=game, turn=2, channel="#c", next_attempt_at=now())
+    dispatcher = NotificationDispatcher()
+
+    posted = AsyncMock(side_effect=[_slack_error(), None])
+    with patch("src.tasks.notifications.client.chat_postMessage", new=posted):
+        assert await dispatcher.dispatch_due() == 0
+        notification = await _pending(game)
+        assert notification.attempts == 1
+        assert notification.last_error is not None
+        assert notification.next_attempt_at > now() + timedelta(seconds=NOTIFY_RETRY_BASE_SECONDS - 5)
+
+        assert await dispatcher.dispatch_due() == 0, "not due again until the backoff has passed"
+        assert posted.await_count == 1
+
+        await Notification.filter(id=notification.id).update(next_attempt_at=now())
+        assert await dispatcher.dispatch_due() == 1
+
+    assert (await _pending(game)).sent_at is not None
+
+
+@pytest.mark.usefixtures("_db")
+async def test_gives_up_after_the_last_attempt() -> None:
+    game = await Game.create(name="Doomed", turn=2)
+    await Notification.create(
+        game=game, turn=2, channel="#gone", attempts=NOTIFY_MAX_ATTEMPTS - 1, next_attempt_at=now()
+    )
+    dispatcher = NotificationDispatcher()
+
+    with patch("src.tasks.notifications.client.chat_postMessage", new=AsyncMock(side_effect=_slack_error())):
+        await dispatcher.dispatch_due()
+
+    assert (await _pending(game)).attempts == NOTIFY_MAX_ATTEMPTS
+    assert await dispatcher.seconds_until_next() > 1, "abandoned rows are no longer scheduled"
+
+
+@pytest.mark.usefixtures("_db")
+async def test_run_resumes_what_a_previous_process_left_pending() -> None:
+    game = await Game.create(name="Leftover", turn=5)
+    await Notification.create(game=game, turn=5, channel="#c", next_attempt_at=now() - timedelta(hours=1))
+    dispatcher = NotificationDispatcher()
+
+    posted = AsyncMock()
+    with patch("src.tasks.notifications.client.chat_postMessage", new=posted):
+        task = create_task(dispatcher.run())
+        for _ in range(100):
+            if await Notification.filter(sent_at__isnull=False).exists():
+                break
+            await sleep(0.01)
+        task.cancel()
+
+    posted.assert_awaited_once()
+    assert "Leftover" in str(posted.await_args)
+    assert (await _pending(game)).sent_at is not None
+
+
+def _stale_message() -> SlackApiError:
+    return SlackApiError("message_not_found", {"ok": False, "error": "message_not_found"})
+
+
+async def _poll(details: LobbyDetails, posted: AsyncMock, updated: AsyncMock, mode: str) -> None:
+    """One poll cycle followed by one dispatch, with Slack mocked and STATUS_MESSAGE_MODE set to `mode`."""
+    with (
+        patch("src.tasks.update_games.STATUS_MESSAGE_MODE", mode),
+        patch("src.tasks.notifications.STATUS_MESSAGE_MODE", mode),
+        patch("src.tasks.update_games.fetch_lobby_details_from_web", new=AsyncMock(return_value=details)),
+        patch("src.tasks.notifications.client.chat_postMessage", new=posted),
+        patch("src.tasks.notifications.client.chat_update", new=updated),
+    ):
+        await update_games_wrapper()
+        await NotificationDispatcher().dispatch_due()
+
+
+@pytest.mark.usefixtures("_db")
+async def test_edit_mode_posts_once_then_edits_for_turns_and_statuses() -> None:
+    game = await Game.create(name="Live", turn=1)
+    await Player.create(game=game, nation="Ermor", short_name="Ermor")
+    posted = AsyncMock(return_value={"ts": "111.1", "channel": "C1"})
+    updated = AsyncMock()
+
+    await _poll(_details("2"), posted, updated, "edit")
+    await _poll(_details("2", "Ermor"), posted, updated, "edit")
+    await _poll(_details("3"), posted, updated, "edit")
+
+    posted.assert_awaited_once()
+    assert updated.await_count == 2
+    assert updated.await_args is not None
+    assert updated.await_args.kwargs["ts"] == "111.1"
+    assert updated.await_args.kwargs["channel"] == "C1"
+    stored = await Game.get(id=game.id)
+    assert (stored.status_ts, stored.status_turn) == ("111.1", 3)
+
+
+@pytest.mark.usefixtures("_db")
+async def test_repost_mode_posts_each_turn_and_edits_within_it() -> None:
+    game = await Game.create(name="Fresh", turn=1)
+    await Player.create(game=game, nation="Ermor", short_name="Ermor")
+    posted = AsyncMock(side_effect=[{"ts": "1.1", "channel": "C1"}, {"ts": "2.2", "channel": "C1"}])
+    updated = AsyncMock()
+
+    await _poll(_details("2"), posted, updated, "repost")
+    await _poll(_details("2", "Ermor"), posted, updated, "repost")
+    await _poll(_details("3"), posted, updated, "repost")
+
+    assert posted.await_count == 2
+    updated.assert_awaited_once()
+    assert (await Game.get(id=game.id)).status_ts == "2.2"
+
+
+@pytest.mark.usefixtures("_db")
+async def test_post_mode_ignores_status_changes() -> None:
+    game = await Game.create(name="Quiet", turn=2)
+    await Player.create(game=game, nation="Ermor", short_name="Ermor")
+    posted = AsyncMock()
+
+    await _poll(_details("2", "Ermor"), posted, AsyncMock(), "post")
+
+    posted.assert_not_awaited()
+    assert not await Notification.exists()
+
+
+@pytest.mark.usefixtures("_db")
+async def test_status_changes_share_one_pending_edit() -> None:
+    game = await Game.create(name="Busy", turn=2)
+    await Player.create(game=game, nation="Ermor", short_name="Ermor")
+    await Player.create(game=game, nation="Ulm", short_name="Ulm")
+
+    for details in (_details("2", "Ermor"), _details("2", "Ulm")):
+        with (
+            patch("src.tasks.update_games.STATUS_MESSAGE_MODE", "edit"),
+            patch("src.tasks.update_games.fetch_lobby_details_from_web", new=AsyncMock(return_value=details)),
+        ):
+            await update_games_wrapper()
+
+    pending = await Notification.get(game=game)
+    assert (pending.kind, pending.label) == (NotificationKind.STATUS_EDIT, "turn 2 status edit")
+
+
+@pytest.mark.usefixtures("_db")
+async def test_deleted_status_message_is_replaced_by_a_new_post() -> None:
+    game = await Game.create(name="Deleted", turn=2, status_ts="9.9", status_channel="C1", status_turn=2)
+    await Notification.create(game=game, turn=2, channel="#c", next_attempt_at=now())
+    posted = AsyncMock(return_value={"ts": "10.1", "channel": "C1"})
+
+    with (
+        patch("src.tasks.notifications.STATUS_MESSAGE_MODE", "edit"),
+        patch("src.tasks.notifications.client.chat_postMessage", new=posted),
+        patch("src.tasks.notifications.client.chat_update", new=AsyncMock(side_effect=_stale_message())),
+    ):
+        assert await NotificationDispatcher().dispatch_due() == 1
+
+    posted.assert_awaited_once()
+    assert (await Game.get(id=game.id)).status_ts == "10.1"
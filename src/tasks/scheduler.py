@@ -0,0 +1,187 @@
+import re
+from asyncio import sleep
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from heapq import heappop, heappush
+from random import uniform
+from time import monotonic
+from typing import NoReturn
+from uuid import UUID
+
+from loguru import logger
+
+from src.controllers.lobby_details import server_guard
+from src.models.db import Game
+from src.tasks.update_games import GameUpdateResult, UpdateOutcome, update_games_wrapper
+from src.utils.constants import (
+    POLL_IDLE_MAX_INTERVAL_SECONDS,
+    POLL_MAX_INTERVAL_SECONDS,
+    POLL_MIN_INTERVAL_SECONDS,
+)
+
+# the page reads "(2 days and 3 hours left)", "(12 hours left)", "(5 minutes left)"
+TIME_LEFT_PATTERN = re.compile(r"(\d+)\s*(day|hour|minute|min|second|sec)s?\b")
+TIME_UNITS = {"day": 86400, "hour": 3600, "minute": 60, "min": 60, "second": 1, "sec": 1}
+
+# spread of each delay, so games added together don't stay in lockstep and hit the server in one burst
+JITTER = 0.1
+# how long after the advertised deadline to look again — hosting a turn takes the server a moment
+HOST_GRACE_SECONDS = 30
+# newly seen games are polled within this window, and the active list is re-read at least this often
+REFRESH_SECONDS = 60
+
+
+def parse_time_left(time_left: str | None) -> float | None:
+    """Seconds until the game hosts, or None when the page shows no timer ("finished", paused, not started)."""
+    if not time_left:
+        return None
+    matches = TIME_LEFT_PATTERN.findall(time_left.lower())
+    if not matches:
+        return None
+    return float(sum(int(amount) * TIME_UNITS[unit] for amount, unit in matches))
+
+
+def next_check_delay(time_left: str | None, idle_streak: int = 0, failures: int = 0, stalled: int = 0) -> float:
+    """
+    Seconds until a game should be polled again, before jitter.
+
+    :param time_left: The game's timer as last scraped
+    :param idle_streak: Consecutive polls that found nothing new
+    :param failures: Consecutive polls that failed to fetch the game
+    :param stalled: Consecutive polls that found the timer run out but no new turn
+    :return: Delay in seconds
+    """
+    if failures:
+        return min(POLL_IDLE_MAX_INTERVAL_SECONDS, POLL_MIN_INTERVAL_SECONDS * 2**failures)
+
+    remaining = parse_time_left(time_left)
+    if remaining is not None and remaining <= POLL_MIN_INTERVAL_SECONDS:
+        # about to host: look again just after it does, so the new-turn notice goes out promptly. A game that
+        # never hosts (host down, paused at zero) backs off instead of being polled every grace period forever
+        delay = remaining + HOST_GRACE_SECONDS
+        return min(delay * 2**stalled, POLL_IDLE_MAX_INTERVAL_SECONDS) if stalled else delay
+
+    # halving the remaining time makes checks denser as the deadline approaches
+    delay = POLL_MAX_INTERVAL_SECONDS if remaining is None else remaining / 2
+    delay = min(max(delay, POLL_MIN_INTERVAL_SECONDS), POLL_MAX_INTERVAL_SECONDS)
+
+    if idle_streak:
+        delay = min(delay * 2**idle_streak, POLL_IDLE_MAX_INTERVAL_SECONDS)
+        if remaining is not None:
+            # backing off must never sleep through the host itself
+            delay = min(delay, remaining + HOST_GRACE_SECONDS)
+    return delay
+
+
+def host_retry_delay() -> float:
+    """Seconds until the server's circuit next lets a scrape through, and at least the shortest poll interval."""
+    return max(server_guard.seconds_until_probe(), POLL_MIN_INTERVAL_SECONDS)
+
+
+def jittered(delay: float) -> float:
+    return delay * uniform(1 - JITTER, 1 + JITTER)
+
+
+@dataclass
+class _Schedule:
+    due: float
+    idle_streak: int = 0
+    failures: int = 0
+    stalled: int = 0
+
+
+class PollScheduler:
+    """
+    Polls each active game on its own cadence, from a priority queue ordered by next check time.
+    Games near their deadline are checked often; idle ones and ones the server can't serve back off.
+    """
+
+    def __init__(self, clock: Callable[[], float] = monotonic) -> None:
+        self._clock = clock
+        self._queue: list[tuple[float, int, UUID]] = []
+        self._schedules: dict[UUID, _Schedule] = {}
+        self._sequence = 0
+
+    def _push(self, game_id: UUID, schedule: _Schedule) -> None:
+        self._schedules[game_id] = schedule
+        self._sequence += 1
+        heappush(self._queue, (schedule.due, self._sequence, game_id))
+
+    def sync(self, game_ids: set[UUID]) -> None:
+        """Start tracking newly active games and forget deactivated ones."""
+        now = self._clock()
+        for game_id in game_ids - self._schedules.keys():
+            # spread first checks over the refresh window instead of polling every new game at once
+            self._push(game_id, _Schedule(due=now + uniform(0, REFRESH_SECONDS)))
+        for game_id in self._schedules.keys() - game_ids:
+            # its queue entry goes stale and is skipped when popped
+            del self._schedules[game_id]
+
+    def pop_due(self) -> list[UUID]:
+        now = self._clock()
+        due: list[UUID] = []
+        while self._queue and self._queue[0][0] <= now:
+            when, _, game_id = heappop(self._queue)
+            schedule = self._schedules.get(game_id)
+            # skip entries for removed games and ones superseded by a later reschedule
+            if schedule is not None and schedule.due == when:
+                due.append(game_id)
+        return due
+
+    def reschedule(self, result: GameUpdateResult) -> None:
+        previous = self._schedules.get(result.game.id)
+        if previous is None or result.outcome == UpdateOutcome.FINISHED:
+            self._schedules.pop(result.game.id, None)
+            return
+
+        if result.outcome == UpdateOutcome.HOST_UNAVAILABLE:
+            # the whole server is down, not this game: look again once the guard lets a request through, and keep
+            # the game's own backoff as it was so turns hosted after the outage are seen promptly
+            self._push(result.game.id, replace(previous, due=self._clock() + jittered(host_retry_delay())))
+            return
+
+        if result.outcome in {UpdateOutcome.FETCH_FAILED, UpdateOutcome.ERROR, UpdateOutcome.TIMED_OUT}:
+            schedule = _Schedule(
+                due=0, idle_streak=previous.idle_streak, failures=previous.failures + 1, stalled=previous.stalled
+            )
+            time_left = None
+        else:
+            timer_ran_out = (remaining := parse_time_left(result.time_left)) is not None and remaining <= 0
+            schedule = _Schedule(
+                due=0,
+                idle_streak=0 if result.changed else previous.idle_streak + 1,
+                stalled=previous.stalled + 1 if timer_ran_out and result.outcome != UpdateOutcome.NEW_TURN else 0,
+            )
+            time_left = result.time_left
+
+        delay = jittered(next_check_delay(time_left, schedule.idle_streak, schedule.failures, schedule.stalled))
+        schedule.due = self._clock() + delay
+        logger.debug(f"next check of {result.game.name} in {delay:.0f}s")
+        self._push(result.game.id, schedule)
+
+    def seconds_until_next(self) -> float:
+        wait = float(REFRESH_SECONDS)
+        if self._queue:
+            wait = min(wait, self._queue[0][0] - self._clock())
+        return max(wait, 1.0)
+
+    async def tick(self) -> None:
+        games = {game.id: game for game in await Game.filter(active=True)}
+        self.sync(set(games))
+
+        due = [games[game_id] for game_id in self.pop_due()]
+        if not due:
+            return
+
+        report = await update_games_wrapper(due)
+        for result in report.results:
+            self.reschedule(result)
+
+    async def run(self) -> NoReturn:
+        while True:
+            try:
+                await self.tick()
+            except Exception:
+                # never let a DB blip escape into gather() — that would take the slack handler down with it
+                logger.exception("poll scheduler tick failed")
+            await sleep(self.seconds_until_next())
@@ -0,0 +1,157 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from tortoise import Tortoise
+
+from conftest import FakeClock
+from src.controllers.lobby_details import server_guard
+from src.models.db import Game
+from src.tasks.scheduler import (
+    HOST_GRACE_SECONDS,
+    PollScheduler,
+    next_check_delay,
+    parse_time_left,
+)
+from src.tasks.update_games import CycleReport, GameUpdateResult, UpdateOutcome
+from src.utils.constants import POLL_IDLE_MAX_INTERVAL_SECONDS, POLL_MAX_INTERVAL_SECONDS, POLL_MIN_INTERVAL_SECONDS
+
+
+@pytest.fixture
+async def _db():  # noqa: ANN202
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["src.models.db"]})
+    await Tortoise.generate_schemas()
+    yield
+    await Tortoise.close_connections()
+
+
+def _polled(cycle: AsyncMock) -> list[Game]:
+    assert cycle.await_args is not None
+    return cycle.await_args.args[0]
+
+
+@pytest.mark.parametrize(
+    ("time_left", "expected"),
+    [
+        ("2 days left", 2 * 86400),
+        ("12 hours left", 12 * 3600),
+        ("1 day and 3 hours left", 86400 + 3 * 3600),
+        ("5 minutes left", 300),
+        ("finished", None),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_parse_time_left(time_left: str | None, expected: float | None) -> None:
+    assert parse_time_left(time_left) == expected
+
+
+def test_polls_tighten_as_the_deadline_approaches() -> None:
+    days = next_check_delay("3 days left")
+    hours = next_check_delay("40 minutes left")
+    imminent = next_check_delay("1 minute left")
+
+    assert days == POLL_MAX_INTERVAL_SECONDS
+    assert hours < days
+    assert imminent == 60 + HOST_GRACE_SECONDS, "look again just after the host, not a full interval later"
+    assert hours >= POLL_MIN_INTERVAL_SECONDS
+
+
+def test_idle_games_back_off_but_never_past_the_host() -> None:
+    assert next_check_delay("3 days left", idle_streak=5) == POLL_IDLE_MAX_INTERVAL_SECONDS
+    assert next_check_delay("20 minutes left", idle_streak=5) <= 20 * 60 + HOST_GRACE_SECONDS
+
+
+def test_a_quiet_game_is_still_checked_just_after_its_deadline() -> None:
+    assert next_check_delay("1 minute left", idle_streak=8) == 60 + HOST_GRACE_SECONDS
+    assert next_check_delay("40 seconds left", idle_streak=3) == 40 + HOST_GRACE_SECONDS
+
+
+def test_a_stalled_timer_backs_off() -> None:
+    delays = [next_check_delay("0 minutes left", idle_streak=8, stalled=stalled) for stalled in range(8)]
+
+    assert delays[0] == HOST_GRACE_SECONDS, "the first look after the deadline stays prompt"
+    assert delays == sorted(delays)
+    assert delays[1] > delays[0]
+    assert delays[-1] == POLL_IDLE_MAX_INTERVAL_SECONDS
+
+
+@pytest.mark.usefixtures("_db")
+async def test_stalled_count_grows_at_zero_and_resets_on_a_new_turn(clock: FakeClock) -> None:
+    scheduler = PollScheduler(clock=clock)
+    game = await Game.create(name="Stuck", turn=1)
+    scheduler.sync({game.id})
+
+    def poll(outcome: UpdateOutcome, time_left: str) -> float:
+        scheduler.reschedule(GameUpdateResult(game, outcome, time_left))
+        return scheduler._schedules[game.id].due - clock.now
+
+    stuck = [poll(UpdateOutcome.UPDATED, "0 minutes left") for _ in range(4)]
+    assert stuck == sorted(stuck)
+    assert stuck[-1] > 4 * HOST_GRACE_SECONDS
+
+    assert poll(UpdateOutcome.NEW_TURN, "1 minute left") <= (60 + HOST_GRACE_SECONDS) * 1.1
+
+
+def test_failures_back_off_exponentially() -> None:
+    assert next_check_delay("1 minute left", failures=1) < next_check_delay("1 minute left", failures=3)
+    assert next_check_delay(None, failures=20) == POLL_IDLE_MAX_INTERVAL_SECONDS
+
+
+@pytest.mark.usefixtures("_db")
+async def test_tick_polls_only_due_games_and_reschedules_them(clock: FakeClock) -> None:
+    scheduler = PollScheduler(clock=clock)
+    soon = await Game.create(name="Soon", turn=1)
+    later = await Game.create(name="Later", turn=1)
+
+    async def fake_cycle(games: list[Game]) -> CycleReport:
+        time_left = {"Soon": "2 minutes left", "Later": "3 days left"}
+        return CycleReport(
+            [GameUpdateResult(game, UpdateOutcome.UPDATED, time_left[game.name], changed=True) for game in games], 0
+        )
+
+    cycle = AsyncMock(side_effect=fake_cycle)
+    with patch("src.tasks.scheduler.update_games_wrapper", new=cycle):
+        await scheduler.tick()
+        cycle.assert_not_awaited()  # new games are spread over the next minute, not polled in one burst
+
+        clock.now += 61
+        await scheduler.tick()
+        assert {game.name for game in _polled(cycle)} == {"Soon", "Later"}
+
+        clock.now += 120 * 1.2
+        await scheduler.tick()
+        assert [game.id for game in _polled(cycle)] == [soon.id]
+
+        clock.now += POLL_MAX_INTERVAL_SECONDS * 1.2
+        await scheduler.tick()
+        assert later.id in [game.id for game in _polled(cycle)]
+
+
+@pytest.mark.usefixtures("_db")
+async def test_an_outage_is_not_counted_against_each_game(clock: FakeClock) -> None:
+    scheduler = PollScheduler(clock=clock)
+    game = await Game.create(name="Waiting", turn=1)
+    scheduler.sync({game.id})
+
+    with patch.object(server_guard, "seconds_until_probe", return_value=300):
+        for _ in range(10):
+            scheduler.reschedule(GameUpdateResult(game, UpdateOutcome.HOST_UNAVAILABLE))
+
+    schedule = scheduler._schedules[game.id]
+    assert schedule.failures == 0
+    assert 300 * 0.9 <= schedule.due - clock.now <= 300 * 1.1, "polled again when the circuit lets a scrape through"
+
+
+@pytest.mark.usefixtures("_db")
+async def test_deactivated_games_are_dropped(clock: FakeClock) -> None:
+    scheduler = PollScheduler(clock=clock)
+    game = await Game.create(name="Gone", turn=1)
+
+    cycle = AsyncMock(return_value=CycleReport([], 0))
+    with patch("src.tasks.scheduler.update_games_wrapper", new=cycle):
+        await scheduler.tick()
+        await Game.filter(id=game.id).update(active=False)
+        clock.now += 120
+        await scheduler.tick()
+
+    cycle.assert_not_awaited()
@@ -1,11 +1,20 @@
+from asyncio import Semaphore, create_task, gather, wait
+from dataclasses import dataclass
+from enum import StrEnum
 from os import getenv
+from time import monotonic
 
 from loguru import logger
-from slack_sdk.errors import SlackApiError
+from tortoise.timezone import now
+from tortoise.transactions import in_transaction
 
-from src.controllers.lobby_details import fetch_lobby_details_from_web, get_lobby_details
-from src.models.db import Game, Player
-from src.utils.slack_manager import client
+from src.controllers.lobby_details import fetch_lobby_details_from_web, server_guard
+from src.controllers.read_model import read_model
+from src.models.app.player_status import PlayerStatus
+from src.models.db import Game, Notification, NotificationKind, Player
+from src.models.db.fields import canonical_turn_status
+from src.tasks.notifications import notification_dispatcher
+from src.utils.constants import NOTIFY_MAX_ATTEMPTS, POLL_CONCURRENCY, POLL_CYCLE_DEADLINE_SECONDS, STATUS_MESSAGE_MODE
 
 TURN_UPDATE_CHANNEL = getenv("TURN_UPDATE_CHANNEL", "#grog_hole")
 
@@ -14,53 +23,176 @@ class GameDetailsFetchError(Exception):
     pass
 
 
-async def send_turn_update(game: Game) -> None:
-    """Post the status of the game whose turn just advanced — not whichever game happens to be primary."""
-    formatted_response = await get_lobby_details(game.name, use_db=True)
-    await client.chat_postMessage(
+class UpdateOutcome(StrEnum):
+    UPDATED = "updated"
+    NEW_TURN = "new turn"
+    FINISHED = "finished"
+    FETCH_FAILED = "fetch failed"
+    # the host guard refused the scrape: the server is down, not this game
+    HOST_UNAVAILABLE = "host unavailable"
+    ERROR = "error"
+    TIMED_OUT = "timed out"
+
+
+@dataclass
+class GameUpdateResult:
+    game: Game
+    outcome: UpdateOutcome
+    time_left: str | None = None
+    # anything new on the page: a turn or a player status — the scheduler backs off games where this stays False
+    changed: bool = False
+
+
+@dataclass
+class CycleReport:
+    results: list[GameUpdateResult]
+    elapsed: float
+
+    @property
+    def failures(self) -> list[GameUpdateResult]:
+        failed = {
+            UpdateOutcome.FETCH_FAILED,
+            UpdateOutcome.HOST_UNAVAILABLE,
+            UpdateOutcome.ERROR,
+            UpdateOutcome.TIMED_OUT,
+        }
+        return [result for result in self.results if result.outcome in failed]
+
+    def summary(self) -> str:
+        counts: dict[str, int] = {}
+        for result in self.results:
+            counts[result.outcome] = counts.get(result.outcome, 0) + 1
+        totals = ", ".join(f"{count} {outcome}" for outcome, count in counts.items()) or "nothing to do"
+        text = f"poll cycle: {len(self.results)} game(s) in {self.elapsed:.1f}s — {totals}"
+        if failures := self.failures:
+            text += "; failed: " + ", ".join(f"{result.game.name} ({result.outcome})" for result in failures)
+        return text
+
+
+async def store_player_statuses(game: Game, player_status: list[PlayerStatus]) -> int:
+    """
+    Write only the statuses that changed since the last cycle, as one bulk statement.
+    Most polls change nothing, and those now cost a single read. Returns the number of rows written.
+    """
+    rows: dict[str, list[Player]] = {}
+    for row in await Player.filter(game=game).only("id", "nation", "turn_status"):
+        rows.setdefault(row.nation, []).append(row)
+
+    changed: list[Player] = []
+    for player in player_status:
+        matched = rows.get(player.name)
+        if not matched:
+            logger.warning(f"no row matched nation '{player.name}' in {game.name} — status left stale")
+            continue
+        # compare as stored: statuses the db has no code for read back as "Unknown"
+        status = canonical_turn_status(player.turn_status)
+        for row in matched:
+            if row.turn_status != status:
+                row.turn_status = status
+                changed.append(row)
+
+    if changed:
+        await Player.bulk_update(changed, fields=["turn_status"])
+    return len(changed)
+
+
+async def queue_status_edit(game: Game) -> None:
+    """Have the dispatcher edit the live status message; a row still waiting already picks up the latest statuses."""
+    if await Notification.filter(game_id=game.id, sent_at=None, attempts__lt=NOTIFY_MAX_ATTEMPTS).exists():
+        return
+    await Notification.create(
+        game_id=game.id,
+        kind=NotificationKind.STATUS_EDIT,
+        turn=game.turn,
         channel=TURN_UPDATE_CHANNEL,
-        text=f"New turn in {game.nickname or game.name}",
-        blocks=formatted_response,
+        next_attempt_at=now(),
     )
+    notification_dispatcher.wake()
 
 
-async def update_games_wrapper() -> None:
-    game_list = await Game.filter(active=True).all()
-    for game in game_list:
-        logger.info(f"querying {game.name} from dominions server")
+async def update_game(game: Game) -> GameUpdateResult:
+    """Scrape and store one game. Never raises — a broken game must not take the rest of the cycle down."""
+    logger.info(f"querying {game.name} from dominions server")
 
-        try:
-            game_details = await fetch_lobby_details_from_web(game_name=game.name)
-            if game_details is None:
-                raise GameDetailsFetchError(f"Failed to fetch details for game {game.name}")
+    try:
+        game_details = await fetch_lobby_details_from_web(game_name=game.name)
+        if game_details is None:
+            raise GameDetailsFetchError(f"Failed to fetch details for game {game.name}")
 
-            logger.info(f"fetched turn {game_details.turn} for {game.name}")
+        logger.info(f"fetched turn {game_details.turn} for {game.name}")
+        outcome = UpdateOutcome.UPDATED
 
-            for player in game_details.player_status:
-                updated = await Player.filter(game=game, nation=player.name).update(turn_status=player.turn_status)
-                if not updated:
-                    logger.warning(f"no row matched nation '{player.name}' in {game.name} — status left stale")
+        written = await store_player_statuses(game, game_details.player_status)
+        read_model.update_statuses(game.id, {player.name: player.turn_status for player in game_details.player_status})
+        logger.debug(f"{written} player status(es) changed in {game.name}")
+        changed = written > 0
 
-            new_turn = int(game_details.turn)
-            if game.turn < new_turn:
-                logger.info("new turn detected")
+        new_turn = int(game_details.turn)
+        if game.turn < new_turn:
+            logger.info("new turn detected")
+            outcome = UpdateOutcome.NEW_TURN
+            changed = True
+            # the outbox row commits with the turn, so the announcement can't be lost or sent twice;
+            # the dispatcher delivers it and the cycle moves on without waiting for Slack
+            async with in_transaction():
                 await Game.filter(id=game.id).update(turn=new_turn, time_left=game_details.time_left)
-                try:
-                    await send_turn_update(game)
-                except SlackApiError, OSError:
-                    # rewind so the next cycle sees the turn as new again and retries the notification
-                    logger.exception(f"turn notification failed for {game.name}; rewinding turn to retry")
-                    await Game.filter(id=game.id).update(turn=game.turn)
-            else:
-                await Game.filter(id=game.id).update(time_left=game_details.time_left)
-
-            # Check if the turn is finished
-            if game_details.time_left and game_details.time_left.lower() == "finished":
-                logger.info(f"Turn finished for game {game.name}. Setting game to inactive.")
-                await Game.filter(id=game.id).update(active=False, primary_game=False)
-
-            logger.info("update complete")
-        except GameDetailsFetchError as e:
-            logger.error(f"Error fetching game details: {e}")
-        except Exception:
-            logger.exception(f"Unexpected error updating game {game.name}")
+                await Notification.create(
+                    game_id=game.id, turn=new_turn, channel=TURN_UPDATE_CHANNEL, next_attempt_at=now()
+                )
+            read_model.update_game(game.id, game_details.time_left, turn=new_turn)
+            notification_dispatcher.wake()
+        else:
+            await Game.filter(id=game.id).update(time_left=game_details.time_left)
+            read_model.update_game(game.id, game_details.time_left)
+            if written and STATUS_MESSAGE_MODE != "post":
+                await queue_status_edit(game)
+
+        # Check if the turn is finished
+        if game_details.time_left and game_details.time_left.lower() == "finished":
+            logger.info(f"Turn finished for game {game.name}. Setting game to inactive.")
+            outcome = UpdateOutcome.FINISHED
+            await Game.filter(id=game.id).update(active=False, primary_game=False)
+            read_model.remove_game(game.id)
+
+        logger.info("update complete")
+        return GameUpdateResult(game, outcome, game_details.time_left, changed)
+    except GameDetailsFetchError as e:
+        logger.error(f"Error fetching game details: {e}")
+        host_down = server_guard.is_open
+        return GameUpdateResult(game, UpdateOutcome.HOST_UNAVAILABLE if host_down else UpdateOutcome.FETCH_FAILED)
+    except Exception:
+        logger.exception(f"Unexpected error updating game {game.name}")
+        return GameUpdateResult(game, UpdateOutcome.ERROR)
+
+
+async def update_games_wrapper(games: list[Game] | None = None) -> CycleReport:
+    """
+    Update every active game (or just `games`) concurrently.
+    Cycle time tracks the slowest game rather than the sum, and the deadline stops one hung scrape holding it open.
+    """
+    started = monotonic()
+    game_list = games if games is not None else await Game.filter(active=True).all()
+    semaphore = Semaphore(POLL_CONCURRENCY)
+
+    async def bounded(game: Game) -> GameUpdateResult:
+        async with semaphore:
+            return await update_game(game)
+
+    tasks = {create_task(bounded(game)): game for game in game_list}
+    results: list[GameUpdateResult] = []
+    if tasks:
+        done, pending = await wait(tasks, timeout=POLL_CYCLE_DEADLINE_SECONDS)
+        for task in pending:
+            task.cancel()
+        await gather(*pending, return_exceptions=True)
+
+        # keep the reporting order stable: the order the games were handed in
+        for task, game in tasks.items():
+            results.append(task.result() if task in done else GameUpdateResult(game, UpdateOutcome.TIMED_OUT))
+
+    report = CycleReport(results, monotonic() - started)
+    if report.failures:
+        logger.warning(report.summary())
+    else:
+        logger.info(report.summary())
+    return report
@@ -1,3 +1,5 @@
+from asyncio import sleep
+from time import monotonic
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -6,7 +8,8 @@ from tortoise import Tortoise
 from src.models.app.lobby_details import LobbyDetails
 from src.models.app.player_status import PlayerStatus
 from src.models.db import Game, Player
-from src.tasks.update_games import update_games_wrapper
+from src.tasks.notifications import notification_dispatcher
+from src.tasks.update_games import UpdateOutcome, store_player_statuses, update_games_wrapper
 
 NATION = "Ermor, Ashen Empire"
 
@@ -41,9 +44,10 @@ async def test_notification_names_the_game_that_advanced_not_the_primary() -> No
     posted = AsyncMock()
     with (
         patch("src.tasks.update_games.fetch_lobby_details_from_web", new=fake_fetch),
-        patch("src.tasks.update_games.client.chat_postMessage", new=posted),
+        patch("src.tasks.notifications.client.chat_postMessage", new=posted),
     ):
         await update_games_wrapper()
+        await notification_dispatcher.dispatch_due()
 
     posted.assert_awaited_once()
     assert "OtherGame" in str(posted.await_args)
@@ -61,9 +65,10 @@ async def test_same_turn_does_not_notify() -> None:
     posted = AsyncMock()
     with (
         patch("src.tasks.update_games.fetch_lobby_details_from_web", new=AsyncMock(return_value=_details("4"))),
-        patch("src.tasks.update_games.client.chat_postMessage", new=posted),
+        patch("src.tasks.notifications.client.chat_postMessage", new=posted),
     ):
         await update_games_wrapper()
+        await notification_dispatcher.dispatch_due()
 
     posted.assert_not_awaited()
     player = await Player.filter(game=game).first()
@@ -80,7 +85,7 @@ async def test_finished_game_is_deactivated_and_unset_as_primary() -> None:
             "src.tasks.update_games.fetch_lobby_details_from_web",
             new=AsyncMock(return_value=_details("9", time_left="finished")),
         ),
-        patch("src.tasks.update_games.client.chat_postMessage", new=AsyncMock()),
+        patch("src.tasks.notifications.client.chat_postMessage", new=AsyncMock()),
     ):
         await update_games_wrapper()
 
@@ -97,7 +102,7 @@ async def test_unparseable_turn_does_not_abort_the_cycle() -> None:
 
     with (
         patch("src.tasks.update_games.fetch_lobby_details_from_web", new=AsyncMock(return_value=garbage)),
-        patch("src.tasks.update_games.client.chat_postMessage", new=AsyncMock()),
+        patch("src.tasks.notifications.client.chat_postMessage", new=AsyncMock()),
     ):
         await update_games_wrapper()  # must not raise
 
@@ -111,10 +116,116 @@ async def test_unmatched_nation_is_skipped_rather_than_crashing() -> None:
 
     with (
         patch("src.tasks.update_games.fetch_lobby_details_from_web", new=AsyncMock(return_value=_details("1"))),
-        patch("src.tasks.update_games.client.chat_postMessage", new=AsyncMock()),
+        patch("src.tasks.notifications.client.chat_postMessage", new=AsyncMock()),
     ):
         await update_games_wrapper()
 
     player = await Player.filter(game=game).first()
     assert player is not None
     assert player.turn_status == "Turn unfinished"
+
+
+@pytest.mark.usefixtures("_db")
+async def test_games_are_polled_concurrently() -> None:
+    """A cycle should take about as long as its slowest game, not the sum of all of them."""
+    for name in ("A", "B", "C"):
+        await Game.create(name=name, turn=1)
+
+    async def slow_fetch(game_name: str) -> LobbyDetails:
+        await sleep(0.2)
+        return _details("1")
+
+    started = monotonic()
+    with (
+        patch("src.tasks.update_games.fetch_lobby_details_from_web", new=slow_fetch),
+        patch("src.tasks.notifications.client.chat_postMessage", new=AsyncMock()),
+    ):
+        report = await update_games_wrapper()
+
+    assert monotonic() - started < 0.5
+    assert [result.outcome for result in report.results] == [UpdateOutcome.UPDATED] * 3
+
+
+@pytest.mark.usefixtures("_db")
+async def test_one_failing_game_does_not_stop_the_others() -> None:
+    await Game.create(name="Broken", turn=1)
+    healthy = await Game.create(name="Healthy", turn=1)
+
+    async def fetch(game_name: str) -> LobbyDetails | None:
+        if game_name == "Broken":
+            raise RuntimeError("boom")
+        return _details("2")
+
+    with (
+        patch("src.tasks.update_games.fetch_lobby_details_from_web", new=fetch),
+        patch("src.tasks.notifications.client.chat_postMessage", new=AsyncMock()),
+    ):
+        report = await update_games_wrapper()
+
+    assert {result.game.name: result.outcome for result in report.results} == {
+        "Broken": UpdateOutcome.ERROR,
+        "Healthy": UpdateOutcome.NEW_TURN,
+    }
+    assert [result.game.name for result in report.failures] == ["Broken"]
+    assert (await Game.get(id=healthy.id)).turn == 2
+
+
+@pytest.mark.usefixtures("_db")
+async def test_cycle_deadline_abandons_a_hung_scrape() -> None:
+    await Game.create(name="Hung", turn=1)
+    await Game.create(name="Quick", turn=1)
+
+    async def fetch(game_name: str) -> LobbyDetails:
+        if game_name == "Hung":
+            await sleep(10)
+        return _details("1")
+
+    with (
+        patch("src.tasks.update_games.POLL_CYCLE_DEADLINE_SECONDS", 0.2),
+        patch("src.tasks.update_games.fetch_lobby_details_from_web", new=fetch),
+        patch("src.tasks.notifications.client.chat_postMessage", new=AsyncMock()),
+    ):
+        report = await update_games_wrapper()
+
+    assert {result.game.name: result.outcome for result in report.results} == {
+        "Hung": UpdateOutcome.TIMED_OUT,
+        "Quick": UpdateOutcome.UPDATED,
+    }
+    assert "Hung (timed out)" in report.summary()
+
+
+@pytest.mark.usefixtures("_db")
+async def test_unchanged_statuses_skip_the_write() -> None:
+    game = await Game.create(name="Quiet", turn=1)
+    await Player.create(nation=NATION, short_name="Ermor", turn_status="Turn played", game=game)
+
+    with patch.object(Player, "bulk_update") as bulk_update:
+        written = await store_player_statuses(game, [PlayerStatus(name=NATION, turn_status="Turn played")])
+
+    assert written == 0
+    bulk_update.assert_not_called()
+
+
+@pytest.mark.usefixtures("_db")
+async def test_changed_statuses_are_written_in_one_statement() -> None:
+    game = await Game.create(name="Busy", turn=1)
+    nations = ["Ermor, Ashen Empire", "Pangaea, Age of Revelry", "Ulm, Enigma of Steel"]
+    for nation in nations:
+        await Player.create(nation=nation, short_name=nation.split(",")[0], turn_status="Turn unfinished", game=game)
+
+    scraped = [
+        PlayerStatus(name=nations[0], turn_status="Turn played"),
+        PlayerStatus(name=nations[1], turn_status="Turn unfinished"),
+        PlayerStatus(name=nations[2], turn_status="Turn played"),
+    ]
+    real_bulk_update = Player.bulk_update
+    with patch.object(Player, "bulk_update", side_effect=real_bulk_update) as bulk_update:
+        written = await store_player_statuses(game, scraped)
+
+    assert written == 2
+    bulk_update.assert_called_once()
+    assert {row.nation: row.turn_status for row in await Player.filter(game=game)} == {
+        nations[0]: "Turn played",
+        nations[1]: "Turn unfinished",
+        nations[2]: "Turn played",
+    }
@@ -0,0 +1,86 @@
+"""
+A bounded pool of workers for /dom commands.
+
+The socket-mode handler only acks and queues; COMMAND_WORKERS workers take commands off a queue of at most
+COMMAND_QUEUE_SIZE. A burst of slow `/dom check`s therefore runs a few at a time instead of starting a scrape each,
+and once the queue is full submit() says so at once, so the caller can tell the user to try again.
+"""
+
+from asyncio import Queue, QueueFull, Task, create_task
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from time import monotonic
+
+from loguru import logger
+
+from src.utils import metrics
+from src.utils.constants import COMMAND_QUEUE_SIZE, COMMAND_WORKERS
+
+type Job = Callable[[], Awaitable[None]]
+
+
+class CommandPool:
+    def __init__(self, workers: int, queue_size: int) -> None:
+        self._queue: Queue[tuple[str, Job, float]] = Queue(maxsize=queue_size)
+        self._workers: list[Task[None]] = [create_task(self._work()) for _ in range(workers)]
+
+    def submit(self, label: str, job: Job) -> bool:
+        """
+        Queue a command for the next free worker.
+
+        :param label: The command's name, for its metrics: command.wait.<label> and command.run.<label>
+        :param job: Runs the command and replies to the user
+        :return: False, without queueing, when the queue is full
+        """
+        try:
+            self._queue.put_nowait((label, job, monotonic()))
+        except QueueFull:
+            logger.warning(f"command queue full ({self._queue.maxsize}), turning away '{label}'")
+            return False
+        metrics.gauge("command.queue", self._queue.qsize())
+        return True
+
+    async def _work(self) -> None:
+        while True:
+            label, job, queued_at = await self._queue.get()
+            metrics.gauge("command.queue", self._queue.qsize())
+            metrics.record(f"command.wait.{label}", monotonic() - queued_at)
+            try:
+                with metrics.timed(f"command.run.{label}"):
+                    await job()
+            except Exception:
+                # the job replies to the user itself; whatever escapes it must not take the worker down too
+                logger.exception(f"command '{label}' failed")
+            finally:
+                self._queue.task_done()
+
+    async def close(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        for worker in self._workers:
+            with suppress(BaseException):
+                await worker
+
+
+_pool: CommandPool | None = None
+
+
+async def init() -> None:
+    global _pool  # noqa: PLW0603
+    logger.info(f"running /dom commands on {COMMAND_WORKERS} workers, queueing up to {COMMAND_QUEUE_SIZE}")
+    _pool = CommandPool(COMMAND_WORKERS, COMMAND_QUEUE_SIZE)
+
+
+def get_pool() -> CommandPool:
+    """The app-wide pool. Its workers are tasks, so without init() the first command starts them on its own loop."""
+    global _pool  # noqa: PLW0603
+    if _pool is None:
+        _pool = CommandPool(COMMAND_WORKERS, COMMAND_QUEUE_SIZE)
+    return _pool
+
+
+async def close() -> None:
+    global _pool  # noqa: PLW0603
+    if _pool is not None:
+        await _pool.close()
+    _pool = None
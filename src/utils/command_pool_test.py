@@ -0,0 +1,80 @@
+from asyncio import Event, sleep
+
+from src.utils import metrics
+from src.utils.command_pool import CommandPool
+
+
+async def test_runs_at_most_one_command_per_worker() -> None:
+    pool = CommandPool(workers=2, queue_size=10)
+    running = 0
+    most = 0
+    release = Event()
+
+    async def job() -> None:
+        nonlocal running, most
+        running += 1
+        most = max(most, running)
+        await release.wait()
+        running -= 1
+
+    for _ in range(5):
+        assert pool.submit("test", job)
+    await sleep(0.01)
+    assert most == 2
+
+    release.set()
+    await sleep(0.01)
+    assert running == 0
+    await pool.close()
+
+
+async def test_turns_commands_away_once_the_queue_is_full() -> None:
+    pool = CommandPool(workers=1, queue_size=1)
+    release = Event()
+
+    async def job() -> None:
+        await release.wait()
+
+    assert pool.submit("test", job)
+    await sleep(0)  # the worker takes the first command, freeing its queue slot
+    assert pool.submit("test", job)
+    assert not pool.submit("test", job)
+
+    release.set()
+    await pool.close()
+
+
+async def test_records_queue_wait_and_run_time_per_command() -> None:
+    pool = CommandPool(workers=1, queue_size=10)
+    done = Event()
+
+    async def job() -> None:
+        await sleep(0.01)
+        done.set()
+
+    before_wait = metrics.get("command.wait.pool test").count
+    before_run = metrics.get("command.run.pool test").count
+    pool.submit("pool test", job)
+    await done.wait()
+    await sleep(0)
+
+    assert metrics.get("command.wait.pool test").count == before_wait + 1
+    assert metrics.get("command.run.pool test").count == before_run + 1
+    assert metrics.get("command.run.pool test").total >= 0.01
+    await pool.close()
+
+
+async def test_a_failing_command_does_not_take_its_worker_down() -> None:
+    pool = CommandPool(workers=1, queue_size=10)
+    done = Event()
+
+    async def fails() -> None:
+        raise RuntimeError("boom")
+
+    async def succeeds() -> None:
+        done.set()
+
+    pool.submit("test", fails)
+    pool.submit("test", succeeds)
+    await done.wait()
+    await pool.close()
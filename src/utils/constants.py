@@ -14,7 +14,75 @@ def _required(name: str) -> str:
     return value
 
 
+def _int(name: str, default: int) -> int:
+    """Optional tunable; a typo'd value should stop startup, not silently fall back to the default."""
+    value = getenv(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        msg = f"environment variable {name} must be an integer, got {value!r}"
+        raise RuntimeError(msg) from None
+
+
+def _choice(name: str, default: str, choices: set[str]) -> str:
+    value = (getenv(name) or default).lower()
+    if value not in choices:
+        msg = f"environment variable {name} must be one of {', '.join(sorted(choices))}, got {value!r}"
+        raise RuntimeError(msg)
+    return value
+
+
 SLACK_BOT_TOKEN = _required("SLACK_BOT_TOKEN")
 SLACK_APP_TOKEN = _required("SLACK_APP_TOKEN")
 
 DB_URI = _required("DB_URI")
+
+# every scrape goes to the one illwinter host, so the per-host cap is effectively the global one
+HTTP_CONNECTIONS_PER_HOST = _int("HTTP_CONNECTIONS_PER_HOST", 8)
+HTTP_DNS_CACHE_SECONDS = _int("HTTP_DNS_CACHE_SECONDS", 300)
+HTTP_KEEPALIVE_SECONDS = _int("HTTP_KEEPALIVE_SECONDS", 60)
+
+# the poller scrapes this many games at once; a cycle still running after the deadline abandons the stragglers
+POLL_CONCURRENCY = _int("POLL_CONCURRENCY", 4)
+POLL_CYCLE_DEADLINE_SECONDS = _int("POLL_CYCLE_DEADLINE_SECONDS", 300)
+
+# each game gets its own poll cadence: tight near its host deadline, relaxed with days left, slower still when idle
+POLL_MIN_INTERVAL_SECONDS = _int("POLL_MIN_INTERVAL_SECONDS", 60)
+POLL_MAX_INTERVAL_SECONDS = _int("POLL_MAX_INTERVAL_SECONDS", 1800)
+POLL_IDLE_MAX_INTERVAL_SECONDS = _int("POLL_IDLE_MAX_INTERVAL_SECONDS", 3600)
+
+# where status pages are parsed: "inline" on the event loop, or in a "thread" or "process" pool of PARSE_WORKERS
+PARSE_MODE = _choice("PARSE_MODE", "inline", {"inline", "thread", "process"})
+PARSE_WORKERS = _int("PARSE_WORKERS", 2)
+
+# live scrapes are shared for this long, so a burst of checks or refresh clicks on one game costs one request
+SCRAPE_CACHE_TTL_SECONDS = _int("SCRAPE_CACHE_TTL_SECONDS", 30)
+SCRAPE_CACHE_SIZE = _int("SCRAPE_CACHE_SIZE", 256)
+# rendered read-only responses (game list, cached status cards), least recently used dropped first
+RENDER_CACHE_SIZE = _int("RENDER_CACHE_SIZE", 128)
+# games per page of /dom game list; Slack caps a message at 50 blocks and a page uses one per ten games
+GAME_LIST_PAGE_SIZE = _int("GAME_LIST_PAGE_SIZE", 20)
+# status cards for games with more nations than this group them by status instead of a section per nation
+NATION_COMPACT_THRESHOLD = _int("NATION_COMPACT_THRESHOLD", 20)
+
+# /dom commands run on this many workers; beyond the queue length, users are told to try again rather than queued
+COMMAND_WORKERS = _int("COMMAND_WORKERS", 4)
+COMMAND_QUEUE_SIZE = _int("COMMAND_QUEUE_SIZE", 32)
+
+# after this many consecutive failures the dominions server is treated as down, and rechecked after the cooldown
+CIRCUIT_FAILURE_THRESHOLD = _int("CIRCUIT_FAILURE_THRESHOLD", 5)
+CIRCUIT_COOLDOWN_SECONDS = _int("CIRCUIT_COOLDOWN_SECONDS", 30)
+# responses slower than this shrink the number of concurrent requests allowed to the server
+HOST_LATENCY_TARGET_SECONDS = _int("HOST_LATENCY_TARGET_SECONDS", 3)
+
+# turn notifications wait in an outbox until Slack takes them: retries back off from the base up to the max delay,
+# and a notification still failing after NOTIFY_MAX_ATTEMPTS is left in the table for a human to look at
+NOTIFY_RETRY_BASE_SECONDS = _int("NOTIFY_RETRY_BASE_SECONDS", 10)
+NOTIFY_RETRY_MAX_SECONDS = _int("NOTIFY_RETRY_MAX_SECONDS", 1800)
+NOTIFY_MAX_ATTEMPTS = _int("NOTIFY_MAX_ATTEMPTS", 12)
+
+# post: a new message every turn. edit: one message per game, edited as the turn and player statuses change.
+# repost: a new message every turn, edited as players finish it
+STATUS_MESSAGE_MODE = _choice("STATUS_MESSAGE_MODE", "post", {"post", "edit", "repost"})
@@ -0,0 +1,44 @@
+from asyncio import get_running_loop
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from loguru import logger
+
+from src.utils import metrics
+from src.utils.constants import PARSE_MODE, PARSE_WORKERS
+from src.utils.log_manager import setup_logger
+
+_executor: Executor | None = None
+
+
+async def init() -> None:
+    global _executor  # noqa: PLW0603
+    match PARSE_MODE:
+        case "thread":
+            _executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parse")
+        case "process":
+            # workers import the app fresh, so give them the same log setup as the parent
+            _executor = ProcessPoolExecutor(max_workers=PARSE_WORKERS, initializer=setup_logger)
+        case _:
+            _executor = None
+    logger.info(f"parsing status pages {PARSE_MODE}" + (f" with {PARSE_WORKERS} workers" if _executor else ""))
+
+
+async def close() -> None:
+    global _executor  # noqa: PLW0603
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+
+
+async def run_parse[T](function: Callable[..., T], *args: object) -> T:
+    """
+    Run a parse step according to PARSE_MODE.
+    Inline runs are timed as parse.inline — that is time the event loop, and so the Slack handler, sat blocked.
+    """
+    if _executor is None:
+        with metrics.timed("parse.inline"):
+            return function(*args)
+
+    with metrics.timed(f"parse.{PARSE_MODE}"):
+        return await get_running_loop().run_in_executor(_executor, function, *args)
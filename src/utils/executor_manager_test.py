@@ -0,0 +1,49 @@
+from threading import current_thread, main_thread
+from time import sleep
+from unittest.mock import patch
+
+from src.controllers.lobby_details import parse_lobby_details
+from src.tasks.loop_monitor import sample_loop_lag
+from src.utils import executor_manager, metrics
+
+
+def _thread_name() -> str:
+    return current_thread().name
+
+
+async def test_inline_mode_runs_on_the_loop_and_is_timed() -> None:
+    before = metrics.get("parse.inline").count
+
+    assert await executor_manager.run_parse(_thread_name) == main_thread().name
+    assert metrics.get("parse.inline").count == before + 1
+
+
+async def test_thread_mode_runs_off_the_loop() -> None:
+    with patch("src.utils.executor_manager.PARSE_MODE", "thread"):
+        await executor_manager.init()
+        try:
+            assert (await executor_manager.run_parse(_thread_name)).startswith("parse")
+        finally:
+            await executor_manager.close()
+
+
+async def test_process_mode_returns_parsed_details() -> None:
+    html = "<tr>Game, turn 4 (1 hour left)</tr><tr><td>Ermor</td><td>Turn played</td></tr>"
+    with patch("src.utils.executor_manager.PARSE_MODE", "process"):
+        await executor_manager.init()
+        try:
+            details = await executor_manager.run_parse(parse_lobby_details, html, "game")
+        finally:
+            await executor_manager.close()
+
+    assert details is not None
+    assert details.turn == "4"
+    assert details.player_status[0].name == "Ermor"
+
+
+async def test_loop_lag_shows_a_blocking_call() -> None:
+    assert await sample_loop_lag(0.01) < 0.1
+
+    # stands in for a parse that holds the loop: the sleep returns 150ms late
+    with patch("src.tasks.loop_monitor.sleep", side_effect=lambda _: sleep(0.15)):
+        assert await sample_loop_lag(0.01) >= 0.1
@@ -0,0 +1,174 @@
+from asyncio import Condition, Task, create_task, sleep
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from enum import StrEnum
+from time import monotonic
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+from src.utils import metrics
+from src.utils.constants import (
+    CIRCUIT_COOLDOWN_SECONDS,
+    CIRCUIT_FAILURE_THRESHOLD,
+    HOST_LATENCY_TARGET_SECONDS,
+    HTTP_CONNECTIONS_PER_HOST,
+)
+
+
+class CircuitOpenError(Exception):
+    """The host has failed repeatedly; callers should serve what they already have instead of waiting."""
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half open"
+
+
+class HostController:
+    """
+    Guards requests to one upstream host.
+
+    Concurrency adapts AIMD-style: it creeps up while responses stay under the latency target and halves on
+    slow responses or errors. After `failure_threshold` consecutive failures the circuit opens and requests fail
+    immediately; once the cooldown passes a single probe is let through (or sent, if `probe` is given) and its
+    result decides whether the circuit closes again.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        host: str,
+        *,
+        max_concurrency: int = HTTP_CONNECTIONS_PER_HOST,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        cooldown: float = CIRCUIT_COOLDOWN_SECONDS,
+        latency_target: float = HOST_LATENCY_TARGET_SECONDS,
+        probe: Callable[[], Awaitable[None]] | None = None,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self.host = host
+        self.max_concurrency = max_concurrency
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.latency_target = latency_target
+        self._probe = probe
+        self._clock = clock
+
+        self.limit = float(max_concurrency)
+        self.state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._in_flight = 0
+        self._capacity = Condition()
+        self._probe_task: Task[None] | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """True while requests are being refused — including the half-open window while a probe is out."""
+        return self.state != CircuitState.CLOSED
+
+    def seconds_until_probe(self) -> float:
+        """How long until the open circuit lets a request through again; 0 once it does, or while closed."""
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.cooldown - self._clock())
+
+    def _admit(self) -> bool:
+        """Whether a request may go out now; True means it is the half-open probe."""
+        if self.state == CircuitState.CLOSED:
+            return False
+        if self.state == CircuitState.OPEN and self._clock() - self._opened_at >= self.cooldown:
+            self.state = CircuitState.HALF_OPEN
+        if self.state == CircuitState.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        raise CircuitOpenError(f"{self.host} is unavailable; circuit {self.state}")
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncGenerator[None]:
+        """Hold one of the host's request slots. Raises CircuitOpenError at once while the circuit is open."""
+        is_probe = self._admit()
+        acquired = False
+        try:
+            async with self._capacity:
+                await self._capacity.wait_for(lambda: is_probe or self._in_flight < int(self.limit))
+                self._in_flight += 1
+                acquired = True
+
+            started = self._clock()
+            try:
+                yield
+            except Exception:
+                self.record_failure()
+                raise
+            self.record_success(self._clock() - started)
+        finally:
+            if is_probe:
+                self._probing = False
+            if acquired:
+                async with self._capacity:
+                    self._in_flight -= 1
+                    self._capacity.notify_all()
+
+    def record_success(self, latency: float) -> None:
+        metrics.record(f"http.{self.host}", latency)
+        self._failures = 0
+        if self.state != CircuitState.CLOSED:
+            logger.info(f"{self.host} is answering again; closing circuit")
+            self.state = CircuitState.CLOSED
+
+        if latency > self.latency_target:
+            self.limit = max(1.0, self.limit / 2)
+        else:
+            # roughly +1 per full window of requests
+            self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self.limit = max(1.0, self.limit / 2)
+        if self.state == CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state == CircuitState.CLOSED:
+                logger.warning(f"{self.host} failed {self._failures} times in a row; opening circuit")
+            self.state = CircuitState.OPEN
+            self._opened_at = self._clock()
+            self._schedule_probe()
+
+    def _schedule_probe(self) -> None:
+        if self._probe is None or (self._probe_task is not None and not self._probe_task.done()):
+            return
+        self._probe_task = create_task(self._probe_until_closed(self._probe))
+
+    async def _probe_until_closed(self, probe: Callable[[], Awaitable[None]]) -> None:
+        """Check for recovery even when nothing else is asking — the poller backs off while the host is down."""
+        while self.state != CircuitState.CLOSED:
+            await sleep(self.cooldown)
+            try:
+                async with self.slot():
+                    await probe()
+            except CircuitOpenError:
+                pass  # not cooled down yet, or a real request is already acting as the probe
+            except Exception as e:
+                logger.info(f"probe of {self.host} failed: {e}")
+
+    async def close(self) -> None:
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+        self._probe_task = None
+
+
+_guards: dict[str, HostController] = {}
+
+
+def guard_for(url: str, probe: Callable[[], Awaitable[None]] | None = None) -> HostController:
+    """The controller for the url's host, created on first use."""
+    host = urlsplit(url).hostname or url
+    if host not in _guards:
+        _guards[host] = HostController(host, probe=probe)
+    return _guards[host]
+
+
+async def close() -> None:
+    for guard in _guards.values():
+        await guard.close()
@@ -0,0 +1,102 @@
+from asyncio import Event, create_task, sleep
+from unittest.mock import AsyncMock
+
+import pytest
+
+from conftest import FakeClock
+from src.utils.host_guard import CircuitOpenError, CircuitState, HostController
+
+
+async def _fail(guard: HostController) -> None:
+    with pytest.raises(OSError, match="down"):
+        async with guard.slot():
+            raise OSError("down")
+
+
+async def test_repeated_failures_open_the_circuit_and_fail_fast(clock: FakeClock) -> None:
+    guard = HostController("host", failure_threshold=3, cooldown=30, clock=clock)
+    for _ in range(3):
+        await _fail(guard)
+
+    assert guard.state == CircuitState.OPEN
+    request = AsyncMock()
+    with pytest.raises(CircuitOpenError):
+        async with guard.slot():
+            await request()
+    request.assert_not_awaited()
+
+
+async def test_one_probe_after_cooldown_decides_recovery(clock: FakeClock) -> None:
+    guard = HostController("host", failure_threshold=1, cooldown=30, clock=clock)
+    await _fail(guard)
+
+    clock.now = 31
+    async with guard.slot():
+        # while the probe is out, everyone else still fails fast
+        with pytest.raises(CircuitOpenError):
+            async with guard.slot():
+                pass
+
+    assert guard.state == CircuitState.CLOSED
+    assert not guard.is_open
+
+
+async def test_failed_probe_reopens_for_another_cooldown(clock: FakeClock) -> None:
+    guard = HostController("host", failure_threshold=1, cooldown=30, clock=clock)
+    await _fail(guard)
+
+    clock.now = 31
+    await _fail(guard)
+
+    assert guard.state == CircuitState.OPEN
+    clock.now = 40
+    assert guard.seconds_until_probe() == 21
+    with pytest.raises(CircuitOpenError):
+        async with guard.slot():
+            pass
+
+
+async def test_concurrency_shrinks_on_trouble_and_recovers() -> None:
+    guard = HostController("host", max_concurrency=8, failure_threshold=100, latency_target=1)
+    await _fail(guard)
+    assert guard.limit == 4
+
+    guard.record_success(latency=5)
+    assert guard.limit == 2
+
+    for _ in range(50):
+        guard.record_success(latency=0.1)
+    assert guard.limit == 8
+
+
+async def test_requests_beyond_the_limit_wait_for_a_slot() -> None:
+    guard = HostController("host", max_concurrency=1)
+    release = Event()
+    order: list[str] = []
+
+    async def request(name: str) -> None:
+        async with guard.slot():
+            order.append(name)
+            await release.wait()
+
+    first = create_task(request("first"))
+    second = create_task(request("second"))
+    await sleep(0.01)
+    assert order == ["first"]
+
+    release.set()
+    await first
+    await second
+    assert order == ["first", "second"]
+
+
+async def test_background_probe_detects_recovery() -> None:
+    probe = AsyncMock()
+    guard = HostController("host", failure_threshold=1, cooldown=0.01, probe=probe)
+    await _fail(guard)
+
+    await sleep(0.05)
+
+    probe.assert_awaited()
+    assert guard.state == CircuitState.CLOSED
+    await guard.close()
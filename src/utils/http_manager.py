@@ -0,0 +1,39 @@
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from loguru import logger
+
+from src.utils.constants import HTTP_CONNECTIONS_PER_HOST, HTTP_DNS_CACHE_SECONDS, HTTP_KEEPALIVE_SECONDS
+
+REQUEST_TIMEOUT = ClientTimeout(total=15)
+
+_session: ClientSession | None = None
+
+
+def _new_session() -> ClientSession:
+    connector = TCPConnector(
+        limit_per_host=HTTP_CONNECTIONS_PER_HOST,
+        ttl_dns_cache=HTTP_DNS_CACHE_SECONDS,
+        keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+    )
+    return ClientSession(connector=connector, timeout=REQUEST_TIMEOUT)
+
+
+async def init() -> None:
+    global _session  # noqa: PLW0603
+    logger.info(f"opening http session ({HTTP_CONNECTIONS_PER_HOST} connections per host)")
+    _session = _new_session()
+
+
+def get_session() -> ClientSession:
+    """The app-wide session, reopened on demand if init() never ran or close() already has."""
+    global _session  # noqa: PLW0603
+    if _session is None or _session.closed:
+        _session = _new_session()
+    return _session
+
+
+async def close() -> None:
+    global _session  # noqa: PLW0603
+    if _session is not None and not _session.closed:
+        logger.info("closing http session")
+        await _session.close()
+    _session = None
@@ -0,0 +1,22 @@
+from src.utils import http_manager
+
+
+async def test_session_is_shared_between_callers() -> None:
+    await http_manager.init()
+    try:
+        session = http_manager.get_session()
+        assert session is http_manager.get_session()
+        assert session.connector is not None
+        assert session.connector.limit_per_host == http_manager.HTTP_CONNECTIONS_PER_HOST
+    finally:
+        await http_manager.close()
+
+
+async def test_closed_session_is_reopened_on_next_use() -> None:
+    session = http_manager.get_session()
+    await http_manager.close()
+
+    assert session.closed
+    reopened = http_manager.get_session()
+    assert not reopened.closed
+    await http_manager.close()
@@ -0,0 +1,68 @@
+"""
+In-process timing counters, summarised to the log. Pyroscope shows where CPU goes; these show how long things wait.
+"""
+
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from time import perf_counter
+
+
+@dataclass
+class Timing:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def __str__(self) -> str:
+        mean = self.total / self.count if self.count else 0.0
+        return f"n={self.count} mean={mean * 1000:.1f}ms max={self.max * 1000:.1f}ms"
+
+
+_timings: dict[str, Timing] = {}
+# current value and peak since the last reset, for levels such as queue depth
+_gauges: dict[str, tuple[float, float]] = {}
+
+
+def record(name: str, seconds: float) -> None:
+    _timings.setdefault(name, Timing()).add(seconds)
+
+
+def get(name: str) -> Timing:
+    return _timings.get(name, Timing())
+
+
+def gauge(name: str, value: float) -> None:
+    _, peak = _gauges.get(name, (value, value))
+    _gauges[name] = (value, max(peak, value))
+
+
+def get_gauge(name: str) -> tuple[float, float]:
+    """(current, peak since the last reset)."""
+    return _gauges.get(name, (0.0, 0.0))
+
+
+def summary(reset: bool = False) -> str:
+    """One log line for every timing recorded since the last reset, and every gauge's level and peak."""
+    parts = [f"{name}: {timing}" for name, timing in sorted(_timings.items())]
+    parts += [f"{name}: now={value:g} peak={peak:g}" for name, (value, peak) in sorted(_gauges.items())]
+    if reset:
+        _timings.clear()
+        for name, (value, _) in _gauges.items():
+            _gauges[name] = (value, value)
+    return "; ".join(parts) or "no timings recorded"
+
+
+@contextmanager
+def timed(name: str) -> Generator[None]:
+    """Record the wall time of the block under `name`."""
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        record(name, perf_counter() - started)
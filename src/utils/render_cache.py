@@ -0,0 +1,51 @@
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+
+
+class RenderCache[V]:
+    """
+    LRU cache of rendered responses, each tagged with the state version it was rendered from. A lookup under any
+    other version is a miss, so a response is never served from state that has since changed.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, tuple[int, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get(self, key: Hashable, version: int) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] != version:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: Hashable, version: int, value: V) -> None:
+        self._entries[key] = (version, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get_or_render(self, key: Hashable, version: int, render: Callable[[], Awaitable[V]]) -> V:
+        """
+        The response for `key` as of `version`, rendering it on a miss.
+
+        :param key: The command and its arguments
+        :param version: The state version now; read it before rendering, so a change made during the render leaves
+            the entry tagged older and the next lookup renders again
+        :param render: Builds the response
+        :return: The cached or freshly rendered response
+        """
+        if (cached := self.get(key, version)) is not None:
+            return cached
+        value = await render()
+        self.put(key, version, value)
+        return value
@@ -0,0 +1,33 @@
+from unittest.mock import AsyncMock
+
+from src.utils.render_cache import RenderCache
+
+
+async def test_renders_once_per_version() -> None:
+    cache = RenderCache[str](maxsize=8)
+    render = AsyncMock(side_effect=["v1", "v2"])
+
+    assert await cache.get_or_render("list", 1, render) == "v1"
+    assert await cache.get_or_render("list", 1, render) == "v1"
+    assert await cache.get_or_render("list", 2, render) == "v2"
+    assert render.await_count == 2
+
+
+def test_an_entry_from_another_version_is_dropped() -> None:
+    cache = RenderCache[str](maxsize=8)
+    cache.put("list", 1, "old")
+
+    assert cache.get("list", 2) is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    cache = RenderCache[str](maxsize=2)
+    cache.put("a", 1, "a")
+    cache.put("b", 1, "b")
+    cache.get("a", 1)
+    cache.put("c", 1, "c")
+
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) == "a"
+    assert cache.get("c", 1) == "c"
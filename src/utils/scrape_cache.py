@@ -0,0 +1,61 @@
+from asyncio import Task, create_task, shield
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from time import monotonic
+
+
+class ScrapeCache[V]:
+    """
+    Short-lived LRU cache in front of a slow fetch, with single-flight: concurrent misses for the same key
+    share one in-flight fetch instead of each starting their own. Failed fetches (None) are never cached.
+    """
+
+    def __init__(self, ttl: float, maxsize: int, clock: Callable[[], float] = monotonic) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, V]] = OrderedDict()
+        self._in_flight: dict[str, Task[V | None]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def put(self, key: str, value: V) -> None:
+        self._entries[key] = (self._clock(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def peek(self, key: str, max_age: float | None = None) -> V | None:
+        """The cached value if it is no older than `max_age` (any age when None), without fetching."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if max_age is not None and self._clock() - stored_at > max_age:
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[V | None]]) -> V | None:
+        if (cached := self.peek(key, max_age=self.ttl)) is not None:
+            return cached
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = create_task(self._fetch(key, fetch))
+            self._in_flight[key] = task
+        # shielded: one caller giving up (a cycle deadline, a cancelled handler) must not cancel the others' fetch
+        return await shield(task)
+
+    async def _fetch(self, key: str, fetch: Callable[[], Awaitable[V | None]]) -> V | None:
+        try:
+            value = await fetch()
+            if value is not None:
+                self.put(key, value)
+            return value
+        finally:
+            self._in_flight.pop(key, None)
@@ -0,0 +1,71 @@
+from asyncio import Event, gather, sleep, wait_for
+from unittest.mock import AsyncMock
+
+import pytest
+
+from conftest import FakeClock
+from src.utils.scrape_cache import ScrapeCache
+
+
+async def test_concurrent_misses_share_one_fetch() -> None:
+    cache = ScrapeCache[str](ttl=30, maxsize=8)
+    release = Event()
+    calls = 0
+
+    async def fetch() -> str:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "page"
+
+    waiters = gather(*(cache.get_or_fetch("game", fetch) for _ in range(5)))
+    await sleep(0)
+    release.set()
+
+    assert await waiters == ["page"] * 5
+    assert calls == 1
+
+
+async def test_entries_expire_after_the_ttl(clock: FakeClock) -> None:
+    cache = ScrapeCache[str](ttl=30, maxsize=8, clock=clock)
+    fetch = AsyncMock(side_effect=["first", "second"])
+
+    assert await cache.get_or_fetch("game", fetch) == "first"
+    clock.now = 29
+    assert await cache.get_or_fetch("game", fetch) == "first"
+    clock.now = 31
+    assert await cache.get_or_fetch("game", fetch) == "second"
+    assert cache.peek("game") == "second"
+
+
+async def test_failures_are_not_cached() -> None:
+    cache = ScrapeCache[str](ttl=30, maxsize=8)
+    fetch = AsyncMock(side_effect=[None, "page"])
+
+    assert await cache.get_or_fetch("game", fetch) is None
+    assert await cache.get_or_fetch("game", fetch) == "page"
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    cache = ScrapeCache[str](ttl=30, maxsize=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.peek("a")
+    cache.put("c", "3")
+
+    assert cache.peek("b") is None
+    assert cache.peek("a") == "1"
+    assert len(cache) == 2
+
+
+async def test_a_cancelled_caller_does_not_cancel_the_shared_fetch() -> None:
+    cache = ScrapeCache[str](ttl=30, maxsize=8)
+
+    async def fetch() -> str:
+        await sleep(0.05)
+        return "page"
+
+    with pytest.raises(TimeoutError):
+        await wait_for(cache.get_or_fetch("game", fetch), timeout=0.01)
+
+    assert await cache.get_or_fetch("game", fetch) == "page"
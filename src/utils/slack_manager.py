@@ -1,7 +1,225 @@
+"""
+The Slack apps and the outbound queue every Web API call goes through.
+
+Slack rate-limits per method and answers a burst with 429 and a Retry-After header; a retried burst then competes
+with the next one. Calls are instead paced by a token bucket per method, a 429 (raised by the Web API, returned by a
+response_url webhook) pauses that method for as long as Slack asks, and a user waiting on a command or a button is
+served before background notifications queued on the same method. Before init() there are no queues: send() awaits
+the call at once, so a patched client sees it immediately.
+"""
+
+from asyncio import Event, Future, Task, create_task, get_running_loop, sleep
+from collections.abc import Awaitable, Callable, Mapping
+from contextlib import suppress
+from dataclasses import dataclass, field
+from enum import IntEnum
+from heapq import heappop, heappush
+from itertools import count
+from time import monotonic
+from typing import Any
+
+from loguru import logger
 from slack_bolt.async_app import AsyncApp
+from slack_sdk.errors import SlackApiError
 from slack_sdk.web.async_client import AsyncWebClient
+from slack_sdk.webhook import WebhookResponse
 
+from src.utils import metrics
 from src.utils.constants import SLACK_BOT_TOKEN
 
 app = AsyncApp(token=SLACK_BOT_TOKEN)
 client = AsyncWebClient(token=SLACK_BOT_TOKEN)
+
+# (calls per second, burst) per method, from Slack's published tiers. response_url isn't a Web API method but gets its
+# own bucket so replies never wait on a post.
+RATE_LIMITS: dict[str, tuple[float, int]] = {
+    "chat.postMessage": (1.0, 3),
+    "chat.update": (50 / 60, 5),
+    "reactions.add": (50 / 60, 5),
+    "response_url": (2.0, 5),
+}
+DEFAULT_RATE_LIMIT = (20 / 60, 3)  # tier 2, for anything not listed
+# Slack limits these per channel, about one message a second each, so every channel gets a bucket of its own
+PER_CHANNEL_METHODS = frozenset({"chat.postMessage", "chat.update"})
+MAX_RATE_LIMITED_RETRIES = 3
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0  # someone is looking at the screen waiting for this
+    BACKGROUND = 1
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = monotonic) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._paused_until = 0.0
+
+    def reserve(self) -> float:
+        """Take a token and return 0, or return how many seconds until one is available."""
+        now = self._clock()
+        if now < self._paused_until:
+            return self._paused_until - now
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def pause(self, seconds: float) -> None:
+        """Hand out nothing for `seconds`, then start again from an empty bucket rather than a burst."""
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+        self._tokens = 0.0
+        self._updated = self._paused_until
+
+
+@dataclass(order=True)
+class _Request:
+    priority: Priority
+    sequence: int
+    call: Callable[[], Awaitable[Any]] = field(compare=False)
+    future: Future[Any] = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    rate_limited: int = field(default=0, compare=False)
+
+
+class _MethodQueue:
+    def __init__(self, method: str, channel: str | None = None) -> None:
+        # the name the queue's metrics and logs go under
+        self.method = method if channel is None else f"{method}.{channel}"
+        self.bucket = TokenBucket(*RATE_LIMITS.get(method, DEFAULT_RATE_LIMIT))
+        self._heap: list[_Request] = []
+        self._ready = Event()
+        self._pump: Task[None] = create_task(self._run())
+        self._calls: set[Task[None]] = set()
+
+    def put(self, request: _Request) -> None:
+        heappush(self._heap, request)
+        metrics.gauge(f"slack.queue.{self.method}", len(self._heap))
+        self._ready.set()
+
+    async def _run(self) -> None:
+        while True:
+            if not self._heap:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            # re-check the heap after every wait so a request queued meanwhile at higher priority goes first
+            if delay := self.bucket.reserve():
+                await sleep(delay)
+                continue
+            request = heappop(self._heap)
+            metrics.gauge(f"slack.queue.{self.method}", len(self._heap))
+            if request.future.done():  # the caller gave up
+                continue
+            metrics.record(f"slack.wait.{self.method}", monotonic() - request.enqueued_at)
+            # don't hold the pump for the round trip, the bucket already paces the calls
+            task = create_task(self._call(request))
+            self._calls.add(task)
+            task.add_done_callback(self._calls.discard)
+
+    async def _call(self, request: _Request) -> None:
+        try:
+            result = await request.call()
+        except SlackApiError as e:
+            if e.response.status_code != 429 or not self._retry(request, e.response.headers):
+                _settle(request.future, error=e)
+        except Exception as e:
+            _settle(request.future, error=e)
+        else:
+            # bolt's respond posts to a response_url webhook, which answers a 429 instead of raising it
+            if not (
+                isinstance(result, WebhookResponse)
+                and result.status_code == 429
+                and self._retry(request, result.headers)
+            ):
+                _settle(request.future, result=result)
+
+    def _retry(self, request: _Request, headers: Mapping[str, Any]) -> bool:
+        """Pause the method for as long as Slack asked and queue the request again, unless it has used its retries."""
+        if request.rate_limited >= MAX_RATE_LIMITED_RETRIES:
+            return False
+        retry_after = float(headers.get("Retry-After", 1))
+        logger.warning(f"slack rate-limited {self.method}, pausing it for {retry_after:g}s")
+        self.bucket.pause(retry_after)
+        request.rate_limited += 1
+        self.put(request)
+        return True
+
+    async def close(self) -> None:
+        for task in [self._pump, *self._calls]:
+            task.cancel()
+            with suppress(BaseException):
+                await task
+        for request in self._heap:
+            request.future.cancel()
+
+
+def _settle(future: Future[Any], result: object = None, error: BaseException | None = None) -> None:
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+_queues: dict[tuple[str, str | None], _MethodQueue] | None = None
+_sequence = count()
+
+
+async def init() -> None:
+    global _queues  # noqa: PLW0603
+    _queues = {}
+    logger.info("pacing outbound slack calls per method")
+
+
+async def close() -> None:
+    global _queues
+    queues, _queues = _queues, None
+    for queue in (queues or {}).values():
+        await queue.close()
+
+
+async def send[T](
+    method: str,
+    call: Callable[[], Awaitable[T]],
+    priority: Priority = Priority.INTERACTIVE,
+    channel: str | None = None,
+) -> T:
+    """
+    Make a Slack call once its method's rate limit allows.
+
+    :param method: The Web API method name the limit applies to, e.g. "chat.postMessage"
+    :param call: Makes the call; invoked again if Slack answers 429
+    :param priority: Interactive calls are taken before any queued background call on the same method
+    :param channel: The channel the call posts to; methods in PER_CHANNEL_METHODS are paced per channel
+    :return: Whatever the call returns
+    """
+    if _queues is None:
+        return await call()
+    key = (method, channel if method in PER_CHANNEL_METHODS else None)
+    queue = _queues.get(key)
+    if queue is None:
+        queue = _queues[key] = _MethodQueue(*key)
+    future: Future[T] = get_running_loop().create_future()
+    queue.put(_Request(priority, next(_sequence), call, future, monotonic()))
+    return await future
+
+
+def queued[**P, T](
+    method: str,
+    function: Callable[P, Awaitable[T]],
+    priority: Priority = Priority.INTERACTIVE,
+    channel: str | None = None,
+) -> Callable[P, Awaitable[T]]:
+    """Wrap bolt's `say`/`respond` so handlers can keep calling them while they go through the queue."""
+
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        return await send(method, lambda: function(*args, **kwargs), priority, channel)
+
+    return wrapper
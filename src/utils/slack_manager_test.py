@@ -0,0 +1,159 @@
+from asyncio import gather
+from collections.abc import Awaitable, Callable
+from time import monotonic
+from unittest.mock import MagicMock, patch
+
+import pytest
+from slack_sdk.errors import SlackApiError
+from slack_sdk.webhook import WebhookResponse
+
+from conftest import FakeClock
+from src.utils import metrics, slack_manager
+from src.utils.slack_manager import Priority, TokenBucket, send
+
+
+@pytest.fixture
+async def _queue():  # noqa: ANN202
+    await slack_manager.init()
+    yield
+    await slack_manager.close()
+
+
+def _rate_limited(retry_after: str) -> SlackApiError:
+    response = MagicMock(status_code=429, headers={"Retry-After": retry_after})
+    return SlackApiError("ratelimited", response)
+
+
+def test_bucket_allows_a_burst_then_paces(clock: FakeClock) -> None:
+    bucket = TokenBucket(rate=2.0, burst=2, clock=clock)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.5)
+
+    clock.now += 0.5
+    assert bucket.reserve() == 0
+
+
+def test_pause_holds_every_token_until_retry_after_has_passed(clock: FakeClock) -> None:
+    bucket = TokenBucket(rate=10.0, burst=5, clock=clock)
+
+    bucket.pause(30)
+
+    assert bucket.reserve() == pytest.approx(30)
+    clock.now += 30
+    assert bucket.reserve() == pytest.approx(0.1), "resumes from empty rather than with a fresh burst"
+
+
+async def test_calls_pass_straight_through_before_init() -> None:
+    async def call() -> str:
+        return "ok"
+
+    assert await send("chat.postMessage", call) == "ok"
+
+
+@pytest.mark.usefixtures("_queue")
+async def test_interactive_calls_jump_queued_background_ones() -> None:
+    order: list[str] = []
+
+    def call(name: str):  # noqa: ANN202
+        async def run() -> None:
+            order.append(name)
+
+        return run
+
+    with patch.dict(slack_manager.RATE_LIMITS, {"test.paced": (50.0, 1)}):
+        await gather(
+            send("test.paced", call("notify 1"), Priority.BACKGROUND),
+            send("test.paced", call("notify 2"), Priority.BACKGROUND),
+            send("test.paced", call("notify 3"), Priority.BACKGROUND),
+            send("test.paced", call("command"), Priority.INTERACTIVE),
+        )
+
+    assert order == ["command", "notify 1", "notify 2", "notify 3"]
+
+
+@pytest.mark.usefixtures("_queue")
+async def test_rate_limited_call_waits_for_retry_after_then_retries() -> None:
+    attempts: list[float] = []
+
+    async def call() -> str:
+        attempts.append(monotonic())
+        if len(attempts) == 1:
+            raise _rate_limited("0.1")
+        return "posted"
+
+    assert await send("chat.postMessage", call) == "posted"
+
+    assert len(attempts) == 2
+    assert attempts[1] - attempts[0] >= 0.1
+
+
+@pytest.mark.usefixtures("_queue")
+async def test_rate_limited_webhook_reply_waits_for_retry_after_then_retries() -> None:
+    attempts: list[float] = []
+
+    async def respond() -> WebhookResponse:
+        attempts.append(monotonic())
+        status = 429 if len(attempts) == 1 else 200
+        return WebhookResponse(
+            url="https://hooks.slack.com/x", status_code=status, body="", headers={"Retry-After": "0.1"}
+        )
+
+    response = await send("response_url", respond)
+
+    assert response.status_code == 200
+    assert len(attempts) == 2
+    assert attempts[1] - attempts[0] >= 0.1
+
+
+@pytest.mark.usefixtures("_queue")
+async def test_webhook_reply_still_rate_limited_after_the_retries_is_returned() -> None:
+    async def respond() -> WebhookResponse:
+        return WebhookResponse(url="https://hooks.slack.com/x", status_code=429, body="", headers={"Retry-After": "0"})
+
+    with patch.object(slack_manager, "MAX_RATE_LIMITED_RETRIES", 1):
+        response = await send("response_url", respond)
+
+    assert response.status_code == 429
+
+
+@pytest.mark.usefixtures("_queue")
+async def test_posts_are_paced_per_channel() -> None:
+    started = monotonic()
+    posted: dict[str, list[float]] = {"C1": [], "C2": []}
+
+    def post(channel: str) -> Callable[[], Awaitable[None]]:
+        async def call() -> None:
+            posted[channel].append(monotonic() - started)
+
+        return call
+
+    with patch.dict(slack_manager.RATE_LIMITS, {"chat.postMessage": (10.0, 1)}):
+        await gather(*(send("chat.postMessage", post(channel), channel=channel) for channel in ["C1", "C1", "C2"]))
+
+    assert posted["C1"][1] - posted["C1"][0] >= 0.09, "one channel still gets one message at a time"
+    assert posted["C2"][0] < 0.05, "another channel doesn't wait behind it"
+
+
+@pytest.mark.usefixtures("_queue")
+async def test_other_errors_reach_the_caller() -> None:
+    async def call() -> None:
+        raise SlackApiError("channel_not_found", MagicMock(status_code=200, headers={}))
+
+    with pytest.raises(SlackApiError):
+        await send("chat.postMessage", call)
+
+
+@pytest.mark.usefixtures("_queue")
+async def test_queue_depth_and_wait_are_recorded() -> None:
+    async def call() -> None:
+        return None
+
+    metrics.summary(reset=True)
+    with patch.dict(slack_manager.RATE_LIMITS, {"test.metered": (50.0, 1)}):
+        await gather(*(send("test.metered", call) for _ in range(3)))
+
+    assert metrics.get("slack.wait.test.metered").count == 3
+    assert metrics.get_gauge("slack.queue.test.metered") == (0, 3)
+    assert "slack.queue.test.metered: now=0 peak=3" in metrics.summary()